@@ -0,0 +1,75 @@
+"""Service metrics for the API: run, phase, gate, broker, memory and tool-call instrumentation."""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict
+
+from team.engine.metrics import MetricsRegistry
+
+REGISTRY = MetricsRegistry()
+
+RUNS = REGISTRY.counter("deepagent_runs_total", "Completed playbook runs.", ["playbook", "status"])
+RUN_DURATION = REGISTRY.histogram(
+    "deepagent_run_duration_seconds", "Wall time of /run executions.", ["playbook"]
+)
+PHASE_DURATION = REGISTRY.histogram(
+    "deepagent_phase_duration_seconds", "Wall time of each executed phase.", ["playbook", "phase"]
+)
+GATE_RESULTS = REGISTRY.counter("deepagent_gate_results_total", "Gate evaluations by outcome.", ["gate", "result"])
+GATE_LOOPS = REGISTRY.counter("deepagent_gate_loops_total", "Gate-failure loop iterations.", ["playbook", "phase"])
+BROKER_BYTES = REGISTRY.counter("deepagent_broker_io_bytes_total", "StateBroker bytes read/written.", ["op"])
+BROKER_LATENCY = REGISTRY.histogram(
+    "deepagent_broker_io_duration_seconds", "StateBroker read/write latency.", ["op"]
+)
+MEMORY_LATENCY = REGISTRY.histogram(
+    "deepagent_memory_duration_seconds", "Adaptive memory fetch/record latency per phase.", ["op"]
+)
+MEMORY_ERRORS = REGISTRY.counter("deepagent_memory_errors_total", "Adaptive memory backend errors.", ["op"])
+RUNS_IN_FLIGHT = REGISTRY.gauge("deepagent_runs_in_flight", "Runs currently executing.")
+RUN_CACHE = REGISTRY.counter(
+    "deepagent_run_cache_total", "Keyed /run requests by source (executed, cached, coalesced).", ["result"]
+)
+RUN_QUEUE_DEPTH = REGISTRY.gauge("deepagent_run_queue_depth", "Accepted /run requests waiting for a worker thread.")
+TOOL_CALLS = REGISTRY.counter(
+    "deepagent_tool_calls_total", "Tool calls by outcome (executed, cached, deduped, error).", ["tool", "outcome"]
+)
+TOOL_LATENCY = REGISTRY.histogram(
+    "deepagent_tool_call_duration_seconds", "Tool call wall time, including rate-limit and retry waits.", ["tool"]
+)
+
+
+def metrics_dir(repo_root: str) -> str:
+    return os.getenv("METRICS_DIR", os.path.join(repo_root, "team", "state_broker", "metrics"))
+
+
+def observe_broker_io(op: str, nbytes: int, elapsed: float) -> None:
+    BROKER_BYTES.inc(nbytes, op=op)
+    BROKER_LATENCY.observe(elapsed, op=op)
+
+
+def observe_tool_call(event: Dict[str, Any]) -> None:
+    TOOL_CALLS.inc(tool=event["tool"], outcome=event["outcome"])
+    TOOL_LATENCY.observe(event["elapsed_ms"] / 1000.0, tool=event["tool"])
+
+
+def observe_run(playbook: str, result: Dict[str, Any], state: Any, memory: Any, elapsed: float) -> None:
+    status = str(result.get("status", "unknown"))
+    RUNS.inc(playbook=playbook, status=status)
+    RUN_DURATION.observe(elapsed, playbook=playbook)
+    timings = result.get("timings", {}) if isinstance(result.get("timings"), dict) else {}
+    for entry in timings.get("phases", []):
+        PHASE_DURATION.observe(entry.get("total_ms", 0.0) / 1000.0, playbook=playbook, phase=entry.get("phase", ""))
+        steps = entry.get("steps", {})
+        for op in ("fetch", "record"):
+            value = steps.get(f"memory_{op}")
+            if value is not None:
+                MEMORY_LATENCY.observe(value / 1000.0, op=op)
+    for gate, counts in getattr(state, "gate_results", {}).items():
+        for outcome in ("pass", "fail"):
+            if counts.get(outcome):
+                GATE_RESULTS.inc(counts[outcome], gate=gate, result=outcome)
+    for phase, count in getattr(state, "loop_counts", {}).items():
+        GATE_LOOPS.inc(count, playbook=playbook, phase=phase)
+    for op, count in getattr(memory, "error_counts", {}).items():
+        if count:
+            MEMORY_ERRORS.inc(count, op=op)
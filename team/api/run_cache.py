@@ -0,0 +1,181 @@
+"""Idempotent /run execution: coalesces concurrent duplicates and serves completed results from a TTL cache."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from team.engine.deadline import CANCELLED, DEADLINE_EXCEEDED
+from team.engine.state_broker import content_hash
+
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "ttl_s": 600.0,
+    "max_entries": 256,
+    "dedup_requests": False,
+    "persist": True,
+    "prune_interval_s": 300.0,
+}
+
+
+# Stopped runs say nothing about what the request would produce; a retry after one must run again.
+UNCACHED_STATUSES = frozenset({CANCELLED, DEADLINE_EXCEEDED, "error"})
+
+
+class IdempotencyConflict(ValueError):
+    """An idempotency key was reused with a different request payload."""
+
+
+class _InFlight:
+    def __init__(self, payload_hash: str) -> None:
+        self.payload_hash = payload_hash
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class RunCache:
+    """Keyed single-flight execution with a bounded in-memory TTL cache and an optional on-disk copy.
+
+    The first caller for a key runs the playbook; concurrent callers with the same key wait for it and
+    receive the same result. Completed results are kept for `ttl_s` seconds (at most `max_entries` in
+    memory). With `directory`, they are also written there so sibling API workers can replay them.
+    Failures, error results and runs stopped by a cancel or deadline (`UNCACHED_STATUSES`) are never cached;
+    concurrent duplicates still share them. Expired files are deleted when looked up, and the whole directory
+    is swept for them at most every `prune_interval_s` seconds after a result is persisted.
+    """
+
+    def __init__(self, directory: Optional[str] = None, options: Optional[Dict[str, Any]] = None) -> None:
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        self.directory = directory if self.options["persist"] else None
+        self._entries: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+
+    @staticmethod
+    def payload_hash(payload: Dict[str, Any]) -> str:
+        return content_hash(payload)
+
+    def key_for(self, idempotency_key: Optional[str], payload_hash: str) -> Optional[str]:
+        if idempotency_key:
+            return "key-" + content_hash(idempotency_key)[:32]
+        if self.options["dedup_requests"]:
+            return "req-" + payload_hash[:32]
+        return None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(str(self.directory), f"{key}.json")
+
+    def _lookup(self, key: str, now: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now - entry[0] <= float(self.options["ttl_s"]):
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+            del self._entries[key]
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as handle:
+                doc = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if now - float(doc.get("stored_at", 0.0)) > float(self.options["ttl_s"]):
+            self._discard(self._path(key))
+            return None
+        self._remember(key, float(doc["stored_at"]), str(doc["payload_hash"]), doc["result"])
+        return str(doc["payload_hash"]), doc["result"]
+
+    def _remember(self, key: str, stored_at: float, payload_hash: str, result: Dict[str, Any]) -> None:
+        self._entries[key] = (stored_at, payload_hash, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > int(self.options["max_entries"]):
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # already removed by a sibling worker
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete persisted results (and stray temp files) older than `ttl_s`; returns how many were removed."""
+        if self.directory is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - float(self.options["ttl_s"])
+        removed = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return 0
+        for entry in entries:
+            try:
+                # Files are written once per result, so the mtime is the store time.
+                expired = entry.is_file() and entry.stat().st_mtime < cutoff
+            except OSError:
+                continue
+            if expired:
+                self._discard(entry.path)
+                removed += 1
+        return removed
+
+    def _maybe_prune(self, now: float) -> None:
+        with self._lock:
+            if now - self._pruned_at < float(self.options["prune_interval_s"]):
+                return
+            self._pruned_at = now
+        self.prune(now)
+
+    def _persist(self, key: str, stored_at: float, payload_hash: str, result: Dict[str, Any]) -> None:
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump({"stored_at": stored_at, "payload_hash": payload_hash, "result": result}, handle, default=str)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            return
+        self._maybe_prune(stored_at)
+
+    def run(self, key: str, payload_hash: str, execute: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+        """Return `(result, source)` where source is `executed`, `cached` or `coalesced`."""
+        with self._lock:
+            cached = self._lookup(key, time.time())
+            if cached is not None:
+                if cached[0] != payload_hash:
+                    raise IdempotencyConflict("Idempotency-Key was already used with a different request")
+                return cached[1], "cached"
+            flight = self._inflight.get(key)
+            owner = flight is None
+            if flight is None:
+                flight = _InFlight(payload_hash)
+                self._inflight[key] = flight
+            elif flight.payload_hash != payload_hash:
+                raise IdempotencyConflict("Idempotency-Key is in use by a different in-flight request")
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result or {}, "coalesced"
+        try:
+            flight.result = execute()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            cacheable = flight.result is not None and flight.result.get("status") not in UNCACHED_STATUSES
+            stored_at = time.time()
+            with self._lock:
+                if cacheable:
+                    self._remember(key, stored_at, payload_hash, flight.result)
+                self._inflight.pop(key, None)
+            flight.done.set()
+        if cacheable:
+            self._persist(key, stored_at, payload_hash, flight.result)
+        return flight.result, "executed"
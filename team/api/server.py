@@ -2,18 +2,48 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 
-from team.orchestrator.orchestrator import Orchestrator
+from team.api.metrics import (
+    REGISTRY,
+    RUN_CACHE,
+    RUN_QUEUE_DEPTH,
+    RUNS_IN_FLIGHT,
+    metrics_dir,
+    observe_broker_io,
+    observe_run,
+    observe_tool_call,
+)
+from team.api.run_cache import IdempotencyConflict, RunCache
+from team.engine.deadline import CancelMarkers, build_cancel_token, cancel_run, register_run, unregister_run
+from team.engine.event_log import page_trace
+from team.engine.meta_eval_log import parse_time
+from team.engine.run_queue import RunQueue
+from team.engine.state_broker import open_meta_eval_log
+from team.engine.system_profile import load_system_profile
+from team.engine.tool_executor import add_tool_observer
+from team.engine.simulate import DEFAULT_SAMPLES
 
 
 class RunRequest(BaseModel):
     playbook: str = Field(default="build")
     runtime: str = Field(default="langgraph")
     request: Dict[str, Any] = Field(default_factory=dict)
+    profile: bool = Field(default=False)
+    simulate: bool = Field(default=False)
+    samples: int = Field(default=DEFAULT_SAMPLES, ge=1, le=10000)
+    run_id: Optional[str] = Field(default=None, min_length=1, max_length=128, pattern=r"^[A-Za-z0-9_.-]+$")
+    deadline_s: Optional[float] = Field(default=None, gt=0)
+    phase_deadline_s: Optional[float] = Field(default=None, gt=0)
+    trace_offset: int = Field(default=0, ge=0)
+    trace_limit: Optional[int] = Field(default=None, ge=1)
 
 
 def _repo_root() -> str:
@@ -21,6 +51,70 @@ def _repo_root() -> str:
 
 
 app = FastAPI(title="deepagent-graph", version="0.1.0")
+add_tool_observer(observe_tool_call)
+
+_RUN_CACHES: Dict[str, Tuple[RunCache, int]] = {}
+_RUN_CACHES_LOCK = threading.Lock()
+
+
+def _run_cache() -> Tuple[RunCache, int]:
+    """The repo's run cache and its `event_log.max_response_events` (0: no cap) for paging cached traces."""
+    repo_root = _repo_root()
+    with _RUN_CACHES_LOCK:
+        entry = _RUN_CACHES.get(repo_root)
+        if entry is None:
+            profile = load_system_profile(repo_root)
+            options = profile.get("run_cache") if isinstance(profile.get("run_cache"), dict) else None
+            events = profile.get("event_log") if isinstance(profile.get("event_log"), dict) else {}
+            cache = RunCache(os.path.join(repo_root, "team", "state_broker", "run_cache"), options)
+            entry = _RUN_CACHES[repo_root] = (cache, int(events.get("max_response_events", 0) or 0))
+    return entry
+
+
+_RUN_QUEUES: Dict[str, Optional[RunQueue]] = {}
+_RUN_QUEUES_LOCK = threading.Lock()
+
+
+class RunPending(Exception):
+    """A queued run did not finish within `distributed.wait_timeout_s`."""
+
+    def __init__(self, run_id: str) -> None:
+        super().__init__(run_id)
+        self.run_id = run_id
+
+
+def _run_queue() -> Optional[RunQueue]:
+    """The distributed run queue when `distributed.enabled`, else None (runs execute in this process)."""
+    repo_root = _repo_root()
+    with _RUN_QUEUES_LOCK:
+        if repo_root not in _RUN_QUEUES:
+            profile = load_system_profile(repo_root)
+            options = profile.get("distributed") if isinstance(profile.get("distributed"), dict) else {}
+            queue = RunQueue.from_options(options) if bool(options.get("enabled", False)) else None
+            if queue is not None and int(options.get("local_workers", 0) or 0) > 0:
+                from team.orchestrator.queue_worker import start_workers
+
+                start_workers(queue, repo_root, int(options["local_workers"]))
+            _RUN_QUEUES[repo_root] = queue
+    return _RUN_QUEUES[repo_root]
+
+
+def _dequeue(http_request: Request) -> None:
+    if getattr(http_request.state, "queued", False):
+        http_request.state.queued = False
+        RUN_QUEUE_DEPTH.dec()
+
+
+@app.middleware("http")
+async def track_run_queue(http_request: Request, call_next: Any) -> Any:
+    if http_request.method != "POST" or http_request.url.path != "/run":
+        return await call_next(http_request)
+    http_request.state.queued = True
+    RUN_QUEUE_DEPTH.inc()
+    try:
+        return await call_next(http_request)
+    finally:
+        _dequeue(http_request)
 
 
 @app.get("/health")
@@ -28,10 +122,157 @@ def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    directory = metrics_dir(_repo_root())
+    return PlainTextResponse(REGISTRY.render(directory), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/meta-eval")
+def meta_eval(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    playbook: Optional[str] = None,
+    status: Optional[str] = None,
+) -> Dict[str, Any]:
+    try:
+        start, end = parse_time(since), parse_time(until)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    profile = load_system_profile(_repo_root())
+    broker_cfg = profile.get("state_broker") if isinstance(profile.get("state_broker"), dict) else {}
+    log = open_meta_eval_log(os.path.join(_repo_root(), "team", "state_broker"), broker_cfg)
+    return log.aggregate(since=start, until=end, playbook=playbook, status=status)
+
+
+def _orchestrator(profile_run: bool = False) -> Any:
+    # Imported on first run so /health and /metrics probes stay fast on a cold container.
+    from team.orchestrator.orchestrator import Orchestrator
+
+    return Orchestrator(_repo_root(), profile_run=profile_run)
+
+
+def _execute(payload: RunRequest) -> Dict[str, Any]:
+    RUNS_IN_FLIGHT.inc()
+    directory = metrics_dir(_repo_root())
+    REGISTRY.write_snapshot(directory)
+    started = time.perf_counter()
+    status = "error"
+    run_id = payload.run_id or uuid.uuid4().hex
+    try:
+        queue = _run_queue()
+        if queue is not None:
+            queue.submit({**payload.model_dump(), "run_id": run_id}, run_id=run_id)
+            result = queue.wait(run_id)
+            if result is None:
+                status = "queued"
+                raise RunPending(run_id)
+            status = str(result.get("status", "unknown"))
+            # Phase timings travel with the result; gate and memory counters stay on the worker node.
+            observe_run(payload.playbook, result, None, None, time.perf_counter() - started)
+            return result
+        orchestrator = _orchestrator(profile_run=payload.profile)
+        orchestrator.broker.io_observer = observe_broker_io
+        request = dict(payload.request)
+        request["runtime_target"] = payload.runtime
+        markers = _cancel_markers()
+        cancel = build_cancel_token(
+            orchestrator.deadline_cfg,
+            payload.deadline_s,
+            payload.phase_deadline_s,
+            probe=lambda: markers.requested(run_id, cancel.started_wall),
+        )
+        register_run(run_id, cancel)
+        try:
+            result = orchestrator.run(
+                payload.playbook,
+                request,
+                cancel=cancel,
+                trace_offset=payload.trace_offset,
+                trace_limit=payload.trace_limit,
+            )
+        finally:
+            unregister_run(run_id)
+            markers.clear(run_id)
+        result["run_id"] = run_id
+        status = str(result.get("status", "unknown"))
+        observe_run(payload.playbook, result, orchestrator.state, orchestrator.memory, time.perf_counter() - started)
+        return result
+    finally:
+        if status == "error":
+            observe_run(payload.playbook, {"status": status}, None, None, time.perf_counter() - started)
+        RUNS_IN_FLIGHT.dec()
+        REGISTRY.write_snapshot(directory)
+
+
+def _cancel_markers() -> CancelMarkers:
+    # Cancel requests reach runs held by sibling uvicorn workers through marker files.
+    return CancelMarkers(os.path.join(_repo_root(), "team", "state_broker", "cancel"))
+
+
+def _pending(run_id: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=202, content={"run_id": run_id, "status": "queued"}, headers={"Location": f"/runs/{run_id}"}
+    )
+
+
+@app.get("/runs/{run_id}")
+def run_result(run_id: str) -> Any:
+    """Result of a queued run: 200 once published, 202 while pending; 404 for unknown ids or in-process runs."""
+    queue = _run_queue()
+    if queue is None:
+        raise HTTPException(status_code=404, detail="distributed runs are disabled")
+    result = queue.result(run_id)
+    if result is not None:
+        return result
+    if not queue.submitted(run_id):
+        raise HTTPException(status_code=404, detail="unknown run id")
+    return _pending(run_id)
+
+
+@app.post("/runs/{run_id}/cancel", status_code=202)
+def cancel(run_id: str) -> Dict[str, Any]:
+    """Ask a run to stop at its next check point; it then finishes with status `cancelled`."""
+    if not cancel_run(run_id):
+        _cancel_markers().request(run_id)
+    queue = _run_queue()
+    if queue is not None:
+        queue.request_cancel(run_id)
+    return {"run_id": run_id, "status": "cancelling"}
+
+
 @app.post("/run")
-def run(payload: RunRequest) -> Dict[str, Any]:
-    orchestrator = Orchestrator(_repo_root())
-    request = dict(payload.request)
-    request["runtime_target"] = payload.runtime
-    result = orchestrator.run(payload.playbook, request)
-    return result
+def run(
+    payload: RunRequest,
+    http_request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(default=None),
+) -> Any:
+    _dequeue(http_request)
+    if payload.simulate:
+        # Dry runs execute no phases, so they stay out of the run metrics.
+        request = dict(payload.request)
+        request["runtime_target"] = payload.runtime
+        return _orchestrator().simulate(payload.playbook, request, samples=payload.samples)
+    cache, max_events = _run_cache()
+    # The caller's run id names this attempt and the trace window is a view of the result; neither is part of
+    # what makes two requests the same run.
+    payload_hash = cache.payload_hash(payload.model_dump(exclude={"run_id", "trace_offset", "trace_limit"}))
+    key = cache.key_for(idempotency_key, payload_hash)
+    if key is None:
+        try:
+            return _execute(payload)
+        except RunPending as pending:
+            return _pending(pending.run_id)
+    # Keyed runs keep their whole trace in the cache, so every replay can ask for a different page of it.
+    full_trace = payload.model_copy(update={"trace_offset": 0, "trace_limit": 0})
+    try:
+        result, source = cache.run(key, payload_hash, lambda: _execute(full_trace))
+    except IdempotencyConflict as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except RunPending as pending:
+        return _pending(pending.run_id)
+    RUN_CACHE.inc(result=source)
+    if source != "executed":
+        response.headers["Idempotent-Replayed"] = "true"
+    return page_trace(result, payload.trace_offset, payload.trace_limit or max_events or None)
@@ -0,0 +1 @@
+"""Benchmark suite for orchestrator, broker, memory and compiler hot paths."""
@@ -0,0 +1,171 @@
+"""Benchmark cases for orchestrator, broker, skill, compiler and memory hot paths."""
+from __future__ import annotations
+
+import copy
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict
+
+from team.engine.config import STANDARD_BUILD_BUDGETS
+from team.engine.gates import quality_gate
+from team.engine.memory import InMemoryAdapter
+from team.engine.meta_eval_log import MetaEvalLog
+from team.engine.run_analytics import ColumnarRunStore
+from team.engine.skills import apply_skill_hooks
+from team.engine.state_broker import StateBroker
+from team.orchestrator.orchestrator import Orchestrator, OrchestratorState
+from team.subgraphs.role_subgraphs import _default_system_spec, _validate_compilation_inputs
+
+from .generators import (
+    gate_loop_playbook,
+    large_system_spec,
+    matching_prompt_pack,
+    matching_tool_contract,
+    populate_broker,
+    populate_memory,
+    populate_run_history,
+    synthetic_repo,
+    synthetic_skills,
+)
+
+
+@dataclass
+class BenchConfig:
+    repo_root: str
+    versions: int = 2000
+    components: int = 400
+    skills: int = 300
+    loop_stages: int = 8
+    memory_entries: int = 5000
+    history_runs: int = 100000
+    iterations: int = 200
+    run_iterations: int = 10
+    max_seconds: float = 10.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("repo_root", None)
+        return data
+
+
+Case = Callable[[BenchConfig, str], Callable[[], Any]]
+
+
+def _unbounded_budgets() -> Dict[str, Any]:
+    budgets = copy.deepcopy(STANDARD_BUILD_BUDGETS)
+    for scope in [budgets["global"], *budgets["per_role"].values()]:
+        for key in scope:
+            scope[key] = 0
+    return budgets
+
+
+class _FailingEvalOrchestrator(Orchestrator):
+    """Forces every eval gate to fail so gate loops expand to their `max_iterations` cap.
+
+    Stall detection is off: the identical failures would otherwise stop each loop after one repeat.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stall_detection = False
+
+    def _dispatch(self, phase: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        result = super()._dispatch(phase, request)
+        if phase.startswith("eval"):
+            result["gate_outputs"]["quality_gate"] = quality_gate(
+                {"pass": False, "score": 0.2, "failure_signals": {"metric_failures": [{"category": "coverage"}]}}
+            )
+        return result
+
+
+def broker_write(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    broker = StateBroker(os.path.join(workdir, "state_broker"))
+    populate_broker(broker, "SystemSpec", config.versions)
+    spec = _default_system_spec("langgraph")
+    return lambda: broker.write("SystemSpec", spec, author="architect")
+
+
+def broker_read_full(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    broker = StateBroker(os.path.join(workdir, "state_broker"))
+    populate_broker(broker, "SystemSpec", config.versions)
+    return lambda: broker.read_full("SystemSpec")
+
+
+def broker_latest_version(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    broker = StateBroker(os.path.join(workdir, "state_broker"))
+    populate_broker(broker, "SystemSpec", config.versions)
+    populate_broker(broker, "PromptPack", config.versions // 2)
+    return lambda: broker._latest_version("SystemSpec")
+
+
+def skills_apply_hooks(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    skills = synthetic_skills(config.skills)
+    context = {"playbook": "build", "phase": "eval_0", "runtime_target": "langgraph", "role": "orchestrator"}
+
+    def op() -> Any:
+        return apply_skill_hooks(skills, "pre_phase", context, {"user_constraints": {}}, {})
+
+    return op
+
+
+def compiler_validate_inputs(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    spec = large_system_spec(config.components)
+    pack = matching_prompt_pack(config.components)
+    contract = matching_tool_contract(config.components)
+    return lambda: _validate_compilation_inputs(spec, pack, contract)
+
+
+def memory_fetch(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    adapter = InMemoryAdapter()
+    populate_memory(adapter, config.memory_entries)
+    return lambda: adapter.fetch(
+        role="compiler", phase="compile", playbook="build", runtime_target="hybrid", query="{}", top_k=5
+    )
+
+
+def analytics_aggregate(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    log = MetaEvalLog(os.path.join(workdir, "meta_eval_log.jsonl"), {"buffer_entries": 10000, "max_bytes": 1 << 30})
+    populate_run_history(log, config.history_runs)
+    ColumnarRunStore(os.path.join(workdir, "analytics")).compact(log)
+
+    def op() -> Any:
+        # A fresh store per call so each iteration includes loading the column files.
+        return ColumnarRunStore(os.path.join(workdir, "analytics")).aggregate()
+
+    return op
+
+
+def _orchestrator_case(orchestrator_cls: type, playbook: str, config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    playbooks = {"bench_gate_loop": gate_loop_playbook(config.loop_stages)}
+    repo_root = synthetic_repo(os.path.join(workdir, "repo"), config.repo_root, playbooks)
+    orchestrator = orchestrator_cls(repo_root)
+
+    def op() -> Any:
+        orchestrator.state = OrchestratorState(budgets=_unbounded_budgets())
+        return orchestrator.run(playbook, {"runtime_target": "langgraph"})
+
+    return op
+
+
+def orchestrator_run_build(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    return _orchestrator_case(Orchestrator, "build", config, workdir)
+
+
+def orchestrator_run_gate_loop(config: BenchConfig, workdir: str) -> Callable[[], Any]:
+    return _orchestrator_case(_FailingEvalOrchestrator, "bench_gate_loop", config, workdir)
+
+
+CASES: Dict[str, Case] = {
+    "broker.write": broker_write,
+    "broker.read_full": broker_read_full,
+    "broker.latest_version": broker_latest_version,
+    "skills.apply_hooks": skills_apply_hooks,
+    "compiler.validate_inputs": compiler_validate_inputs,
+    "memory.fetch": memory_fetch,
+    "analytics.aggregate": analytics_aggregate,
+    "orchestrator.run_build": orchestrator_run_build,
+    "orchestrator.run_gate_loop": orchestrator_run_gate_loop,
+}
+
+# Full playbook runs are orders of magnitude slower than the micro cases.
+SLOW_CASES = {"orchestrator.run_build", "orchestrator.run_gate_loop", "analytics.aggregate"}
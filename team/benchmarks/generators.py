@@ -0,0 +1,210 @@
+"""Synthetic inputs for benchmarks: artifact histories, large specs, skills and playbooks."""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from typing import Any, Dict, List
+
+from team.engine.memory import InMemoryAdapter
+from team.engine.meta_eval_log import MetaEvalLog
+from team.engine.state_broker import StateBroker
+
+ROLES = ["architect", "prompt_policy", "tooling", "eval", "optimizer", "ops", "compiler"]
+
+
+def populate_broker(broker: StateBroker, artifact_type: str, versions: int) -> None:
+    """Write `versions` artifact files directly so large histories are cheap to build."""
+    for version in range(1, versions + 1):
+        payload = {"version": version, "runtime_target": "langgraph", "payload": {"index": version}}
+        with open(broker._artifact_path(artifact_type, version), "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        with open(broker._summary_path(artifact_type, version), "w", encoding="utf-8") as handle:
+            json.dump(broker._summarize(artifact_type, payload), handle)
+
+
+def large_system_spec(components: int, tools_per_component: int = 2) -> Dict[str, Any]:
+    items: List[Dict[str, Any]] = []
+    for idx in range(components):
+        items.append(
+            {
+                "id": f"component_{idx}",
+                "inputs": [{"from_component": f"component_{idx - 1}"}] if idx else [],
+                "tool_usage": [f"tool_{(idx + offset) % components}" for offset in range(tools_per_component)],
+                "state_reads": [f"key_{idx - 1}"] if idx else [],
+                "state_writes": [f"key_{idx}"],
+                "budget_defaults": {"max_steps": 5, "max_tokens": 2000, "max_tool_calls": 4},
+                "requires_prompt": idx % 3 == 0,
+            }
+        )
+    return {
+        "version": 1,
+        "runtime_target": "langgraph",
+        "topology_type": "DAG",
+        "core": {
+            "state_schema": {f"key_{idx}": {"type": "string"} for idx in range(components)},
+            "components": items,
+            "contracts": {},
+            "safety_reliability": {},
+            "failure_modes": [],
+        },
+        "langgraph_ext": {},
+        "deepagent_ext": {},
+        "hybrid_ext": {},
+    }
+
+
+def matching_prompt_pack(components: int) -> Dict[str, Any]:
+    return {
+        "version": 1,
+        "system_prompts": {},
+        "role_prompts": {f"component_{idx}": "prompt" for idx in range(0, components, 3)},
+        "tool_patterns": {},
+        "guardrails": [],
+        "few_shots": [],
+    }
+
+
+def matching_tool_contract(components: int) -> Dict[str, Any]:
+    return {
+        "version": 1,
+        "tools": [{"name": f"tool_{idx}"} for idx in range(components)],
+        "retries": {},
+        "caching": {},
+        "idempotency": {},
+        "rate_limits": {},
+    }
+
+
+def synthetic_skills(count: int, playbook: str = "build") -> List[Dict[str, Any]]:
+    """Hook skills spread across events and phases; roughly a quarter match any given context."""
+    skills: List[Dict[str, Any]] = []
+    events = ["pre_run", "pre_phase", "post_phase"]
+    for idx in range(count):
+        skills.append(
+            {
+                "name": f"synthetic_skill_{idx}",
+                "enabled": True,
+                "roles": ["orchestrator"],
+                "hooks": [
+                    {
+                        "event": events[idx % len(events)],
+                        "playbooks": [playbook] if idx % 2 == 0 else ["optimize"],
+                        "phases": [f"eval_{idx % 4}"] if idx % 5 == 0 else [],
+                        "actions": {
+                            "user_constraints_patch": {f"constraint_{idx % 7}": idx},
+                            "routing_note": f"synthetic note {idx}",
+                        },
+                    }
+                ],
+            }
+        )
+    return skills
+
+
+def gate_loop_playbook(stages: int, max_iterations: int = 3) -> Dict[str, Any]:
+    """Playbook with `stages` eval/ops/compile triples, each allowed to loop on gate failure."""
+    phases: List[str] = ["gather_constraints", "architect", "prompt_policy", "tooling"]
+    gate_requirements: List[Dict[str, Any]] = []
+    allowed_loops: List[Dict[str, Any]] = []
+    for idx in range(stages):
+        eval_phase, ops_phase, compile_phase = f"eval_{idx}", f"ops_{idx}", f"compile_{idx}"
+        phases.extend([eval_phase, ops_phase, compile_phase])
+        gate_requirements.extend(
+            [
+                {"phase": eval_phase, "gates": ["quality_gate"]},
+                {"phase": ops_phase, "gates": ["production_gate"]},
+                {"phase": compile_phase, "gates": ["compilation_gate"]},
+            ]
+        )
+        allowed_loops.extend(
+            [
+                {
+                    "from_phase": eval_phase,
+                    "to_phase": "classify_failure",
+                    "max_iterations": max_iterations,
+                    "trigger_condition": "quality_gate_fail",
+                },
+                {
+                    "from_phase": compile_phase,
+                    "to_phase": "classify_failure",
+                    "max_iterations": max_iterations,
+                    "trigger_condition": "compilation_fail",
+                },
+            ]
+        )
+    phases.append("finalize")
+    return {
+        "name": "bench_gate_loop",
+        "gather_constraints": True,
+        "entry_preconditions": ["request"],
+        "gate_requirements": gate_requirements,
+        "phases": phases,
+        "allowed_loops": allowed_loops,
+        "termination_conditions": {
+            "success": "all_required_gates_pass",
+            "failure": "budget_exhausted_and_unusable",
+            "on_budget_exhaustion": "gate_human_or_partial",
+        },
+        "human_gate_placement": "optional",
+    }
+
+
+def synthetic_repo(root: str, source_repo: str, playbooks: Dict[str, Dict[str, Any]]) -> str:
+    """Lay out a minimal repo root (schemas, profile, skills, playbooks) that an Orchestrator can load."""
+    try:
+        import yaml  # type: ignore
+    except Exception as exc:
+        raise RuntimeError("PyYAML is required to build synthetic benchmark repos.") from exc
+    team_dir = os.path.join(root, "team")
+    shutil.copytree(os.path.join(source_repo, "team", "schemas"), os.path.join(team_dir, "schemas"), dirs_exist_ok=True)
+    shutil.copytree(os.path.join(source_repo, "team", "skills"), os.path.join(team_dir, "skills"), dirs_exist_ok=True)
+    os.makedirs(os.path.join(team_dir, "config"), exist_ok=True)
+    shutil.copyfile(
+        os.path.join(source_repo, "team", "config", "system_profile.yaml"),
+        os.path.join(team_dir, "config", "system_profile.yaml"),
+    )
+    playbook_dir = os.path.join(team_dir, "playbooks")
+    os.makedirs(playbook_dir, exist_ok=True)
+    for name in os.listdir(os.path.join(source_repo, "team", "playbooks")):
+        if not name.endswith(".yaml"):
+            continue
+        shutil.copyfile(os.path.join(source_repo, "team", "playbooks", name), os.path.join(playbook_dir, name))
+    for name, doc in playbooks.items():
+        with open(os.path.join(playbook_dir, f"{name}.yaml"), "w", encoding="utf-8") as handle:
+            yaml.safe_dump(doc, handle, sort_keys=False)
+    return root
+
+
+def populate_memory(adapter: InMemoryAdapter, entries: int) -> None:
+    for idx in range(entries):
+        adapter.record(
+            role=ROLES[idx % len(ROLES)],
+            phase=f"phase_{idx % 11}",
+            playbook="build",
+            runtime_target=["langgraph", "deepagent", "hybrid"][idx % 3],
+            outcome={"summary": f"phase=phase_{idx % 11} pass=True score=0.9 #{idx}", "pass": True, "score": 0.9},
+        )
+
+
+def populate_run_history(log: MetaEvalLog, runs: int) -> None:
+    """Deterministic meta-eval entries spread over three playbooks and three runtimes."""
+    playbooks = ["build", "optimize", "debug"]
+    runtimes = ["langgraph", "deepagent", "hybrid"]
+    for idx in range(runs):
+        loops = idx % 4
+        log.append(
+            {
+                "ts": 1_700_000_000 + idx,
+                "playbook": playbooks[idx % 3],
+                "runtime_target": runtimes[(idx // 3) % 3],
+                "status": "blocked" if idx % 29 == 0 else "done",
+                "phases_run": 9 + 2 * loops,
+                "steps_used": 9 + 2 * loops + idx % 5,
+                "role_steps": {role: 1 + (idx + pos) % 3 for pos, role in enumerate(ROLES)},
+                "loop_counts": {"eval_smoke": loops} if loops else {},
+                "loop_cap_hits": {"eval_smoke": 1} if loops == 3 else {},
+                "budget_exhausted": idx % 29 == 0,
+            }
+        )
+    log.flush()
@@ -0,0 +1,160 @@
+"""Timing harness, latency statistics and baseline comparison for benchmarks."""
+from __future__ import annotations
+
+import json
+import platform
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINE_FORMAT_VERSION = 1
+DEFAULT_THRESHOLD_PCT = 25.0
+# p99 of fewer samples is one or two order statistics and swings by 100%+ between identical runs.
+MIN_TAIL_SAMPLES = 200
+
+
+@dataclass
+class BenchResult:
+    name: str
+    iterations: int
+    total_s: float
+    ops_per_sec: float
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "iterations": self.iterations,
+            "total_s": round(self.total_s, 6),
+            "ops_per_sec": round(self.ops_per_sec, 3),
+            "mean_ms": round(self.mean_ms, 6),
+            "p50_ms": round(self.p50_ms, 6),
+            "p90_ms": round(self.p90_ms, 6),
+            "p99_ms": round(self.p99_ms, 6),
+            "max_ms": round(self.max_ms, 6),
+        }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * (pct / 100.0)
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(name: str, samples_ms: List[float]) -> BenchResult:
+    ordered = sorted(samples_ms)
+    total_s = sum(ordered) / 1000.0
+    count = len(ordered)
+    return BenchResult(
+        name=name,
+        iterations=count,
+        total_s=total_s,
+        ops_per_sec=(count / total_s) if total_s > 0 else 0.0,
+        mean_ms=(sum(ordered) / count) if count else 0.0,
+        p50_ms=percentile(ordered, 50),
+        p90_ms=percentile(ordered, 90),
+        p99_ms=percentile(ordered, 99),
+        max_ms=ordered[-1] if ordered else 0.0,
+    )
+
+
+def measure(
+    name: str,
+    op: Callable[[], Any],
+    *,
+    iterations: int,
+    warmup: int = 3,
+    max_seconds: Optional[float] = None,
+) -> BenchResult:
+    """Call `op` `iterations` times (or until `max_seconds` elapses) and summarize per-call latency."""
+    for _ in range(warmup):
+        op()
+    samples: List[float] = []
+    clock = time.perf_counter
+    deadline = clock() + max_seconds if max_seconds else None
+    for _ in range(iterations):
+        started = clock()
+        op()
+        finished = clock()
+        samples.append((finished - started) * 1000.0)
+        if deadline is not None and finished >= deadline:
+            break
+    return summarize(name, samples)
+
+
+def build_baseline(
+    results: List[BenchResult], config: Dict[str, Any], threshold_pct: float = DEFAULT_THRESHOLD_PCT
+) -> Dict[str, Any]:
+    return {
+        "version": BASELINE_FORMAT_VERSION,
+        "created": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "default_threshold_pct": threshold_pct,
+        "cases": {result.name: result.as_dict() for result in results},
+    }
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    if not isinstance(baseline, dict) or baseline.get("version") != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark baseline format")
+    return baseline
+
+
+def compare_to_baseline(results: List[BenchResult], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flag cases whose p50/mean latency grew, or whose throughput dropped, past the case threshold.
+
+    p99 is compared too once both runs have at least `MIN_TAIL_SAMPLES` iterations (a case's
+    `min_tail_samples` overrides it).
+    """
+    default_threshold = float(baseline.get("default_threshold_pct", DEFAULT_THRESHOLD_PCT))
+    cases = baseline.get("cases", {})
+    regressions: List[Dict[str, Any]] = []
+    for result in results:
+        reference = cases.get(result.name)
+        if not isinstance(reference, dict):
+            continue
+        threshold = float(reference.get("threshold_pct", default_threshold))
+        factor = 1.0 + threshold / 100.0
+        current = result.as_dict()
+        metrics = ["p50_ms", "mean_ms"]
+        min_tail = int(reference.get("min_tail_samples", MIN_TAIL_SAMPLES))
+        if min(result.iterations, int(reference.get("iterations", 0))) >= min_tail:
+            metrics.append("p99_ms")
+        for metric in metrics:
+            base_value = float(reference.get(metric, 0.0))
+            if base_value > 0 and current[metric] > base_value * factor:
+                regressions.append(
+                    {
+                        "case": result.name,
+                        "metric": metric,
+                        "baseline": base_value,
+                        "current": current[metric],
+                        "change_pct": round((current[metric] / base_value - 1.0) * 100.0, 2),
+                        "threshold_pct": threshold,
+                    }
+                )
+        base_ops = float(reference.get("ops_per_sec", 0.0))
+        if base_ops > 0 and current["ops_per_sec"] * factor < base_ops:
+            regressions.append(
+                {
+                    "case": result.name,
+                    "metric": "ops_per_sec",
+                    "baseline": base_ops,
+                    "current": current["ops_per_sec"],
+                    "change_pct": round((current["ops_per_sec"] / base_ops - 1.0) * 100.0, 2),
+                    "threshold_pct": threshold,
+                }
+            )
+    return regressions
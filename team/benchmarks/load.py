@@ -0,0 +1,483 @@
+"""Load generator for the API: open- and closed-loop request models over a weighted playbook/runtime mix."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .harness import DEFAULT_THRESHOLD_PCT, BenchResult, build_baseline, compare_to_baseline, percentile
+
+ALL = "all"
+DEFAULT_ERROR_RATE_TOLERANCE = 0.01
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+@dataclass
+class MixEntry:
+    playbook: str = "build"
+    runtime: str = "langgraph"
+    weight: float = 1.0
+    request: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"{self.playbook}/{self.runtime}"
+
+    def body(self) -> bytes:
+        return json.dumps({"playbook": self.playbook, "runtime": self.runtime, "request": self.request}).encode()
+
+
+def parse_mix(specs: List[str]) -> List[MixEntry]:
+    """Parse `playbook[/runtime][=weight]` entries, e.g. `build/langgraph=3 debug/hybrid=1`."""
+    entries: List[MixEntry] = []
+    for spec in specs:
+        target, _, weight = spec.partition("=")
+        playbook, _, runtime = target.partition("/")
+        if not playbook.strip():
+            raise ValueError(f"mix entry {spec!r}: playbook is required")
+        try:
+            value = float(weight) if weight else 1.0
+        except ValueError as exc:
+            raise ValueError(f"mix entry {spec!r}: weight must be a number") from exc
+        entries.append(MixEntry(playbook.strip(), runtime.strip() or "langgraph", value))
+    return _checked(entries)
+
+
+def load_mix(path: str) -> List[MixEntry]:
+    """Read a JSON list of `{"playbook", "runtime", "weight", "request"}` objects."""
+    with open(path, "r", encoding="utf-8") as handle:
+        raw = json.load(handle)
+    if not isinstance(raw, list):
+        raise ValueError(f"{path}: expected a JSON list of mix entries")
+    entries = []
+    for item in raw:
+        if not isinstance(item, dict) or not item.get("playbook"):
+            raise ValueError(f"{path}: every mix entry needs a playbook")
+        entries.append(
+            MixEntry(
+                str(item["playbook"]),
+                str(item.get("runtime") or "langgraph"),
+                float(item.get("weight", 1.0)),
+                dict(item.get("request") or {}),
+            )
+        )
+    return _checked(entries)
+
+
+def _checked(entries: List[MixEntry]) -> List[MixEntry]:
+    if not entries:
+        raise ValueError("the request mix is empty")
+    if any(entry.weight < 0 for entry in entries) or not sum(entry.weight for entry in entries) > 0:
+        raise ValueError("mix weights must be non-negative and not all zero")
+    return entries
+
+
+@dataclass
+class LoadConfig:
+    model: str = "closed"  # closed: `concurrency` clients back to back; open: arrivals at `rps`
+    concurrency: int = 4
+    rps: float = 5.0
+    arrivals: str = "poisson"  # poisson | constant
+    duration_s: float = 30.0
+    requests: int = 0  # stop after this many requests (0: run for `duration_s`)
+    warmup_s: float = 0.0
+    think_s: float = 0.0
+    max_in_flight: int = 64
+    timeout_s: float = 600.0
+    seed: int = 0
+    path: str = "/run"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def validate(self) -> None:
+        if self.model not in ("open", "closed"):
+            raise ValueError(f"unknown load model {self.model!r} (expected open or closed)")
+        if self.arrivals not in ("poisson", "constant"):
+            raise ValueError(f"unknown arrival process {self.arrivals!r} (expected poisson or constant)")
+        if self.model == "open" and self.rps <= 0:
+            raise ValueError("the open model needs rps > 0")
+        if self.concurrency < 1 or self.max_in_flight < 1:
+            raise ValueError("concurrency and max_in_flight must be at least 1")
+        if self.duration_s <= 0 and self.requests <= 0:
+            raise ValueError("set duration_s or requests")
+
+
+class HttpTransport:
+    """Keep-alive HTTP client with one connection per load thread."""
+
+    def __init__(self, url: str, timeout_s: float = 600.0) -> None:
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"unsupported target URL {url!r}")
+        self.url = url
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.timeout_s = timeout_s
+        self._local = threading.local()
+
+    def _connection(self) -> Any:
+        import http.client
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = self._local.connection = cls(self.host, self.port, timeout=self.timeout_s)
+        return connection
+
+    def request(self, method: str, path: str, body: bytes = b"") -> Response:
+        connection = self._connection()
+        try:
+            connection.request(
+                method, self.base_path + path, body=body or None, headers={"Content-Type": "application/json"}
+            )
+            response = connection.getresponse()
+            data = response.read()
+        except Exception:
+            connection.close()
+            self._local.connection = None
+            raise
+        return response.status, {key.lower(): value for key, value in response.getheaders()}, data
+
+    def close(self) -> None:
+        pass
+
+
+class AsgiTransport:
+    """Calls an ASGI app directly on a private event loop: the full app and middleware stack, no server or sockets.
+
+    Lifespan events are not sent; the API does its setup lazily on first use.
+    """
+
+    def __init__(self, app: Any, timeout_s: float = 600.0) -> None:
+        self.app = app
+        self.timeout_s = timeout_s
+        self.url = "asgi://in-process"
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="load-asgi", daemon=True)
+        self._thread.start()
+
+    async def _call(self, method: str, path: str, body: bytes) -> Response:
+        route, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": route,
+            "raw_path": route.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", b"loadtest"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+        }
+        finished = asyncio.Event()
+        started: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        delivered = False
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Report a disconnect only once the response is out, as a well-behaved client would.
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                started.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    finished.set()
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # The app re-raises after sending its 500; a server would log it and the client sees the 500.
+            if "status" not in started:
+                raise
+        finished.set()
+        headers = {key.decode().lower(): value.decode() for key, value in started.get("headers", [])}
+        return int(started.get("status", 500)), headers, b"".join(chunks)
+
+    def request(self, method: str, path: str, body: bytes = b"") -> Response:
+        future = asyncio.run_coroutine_threadsafe(self._call(method, path, body), self.loop)
+        return future.result(self.timeout_s)
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5.0)
+
+
+def in_process_transport(repo_root: str, timeout_s: float = 600.0) -> AsgiTransport:
+    """Transport to `team.api.server.app` in this process, serving `repo_root`."""
+    os.environ["REPO_ROOT"] = repo_root
+    from team.api.server import app
+
+    return AsgiTransport(app, timeout_s)
+
+
+def directory_usage(path: str) -> Dict[str, int]:
+    total = files = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+            files += 1
+    return {"bytes": total, "files": files}
+
+
+@dataclass
+class Sample:
+    name: str
+    scheduled: float  # offset from the start of the run, in seconds
+    latency_ms: float
+    http_status: int = 0
+    run_status: str = ""
+    error: str = ""
+    replayed: bool = False
+
+
+def _issue(transport: Any, entry: MixEntry, path: str, scheduled: float, origin: float) -> Sample:
+    # Latency counts from the scheduled start, so a backed-up open-loop client does not hide queueing delay.
+    try:
+        status, headers, data = transport.request("POST", path, entry.body())
+    except Exception as exc:
+        latency_ms = (time.perf_counter() - scheduled) * 1000.0
+        return Sample(entry.name, scheduled - origin, latency_ms, error=type(exc).__name__)
+    latency_ms = (time.perf_counter() - scheduled) * 1000.0
+    run_status = ""
+    try:
+        payload = json.loads(data) if data else {}
+        if isinstance(payload, dict) and status < 400:
+            run_status = str(payload.get("status", ""))
+    except ValueError:
+        pass
+    return Sample(
+        entry.name,
+        scheduled - origin,
+        latency_ms,
+        http_status=status,
+        run_status=run_status,
+        error=f"http_{status}" if status >= 400 else "",
+        replayed=headers.get("idempotent-replayed") == "true",
+    )
+
+
+class _Budget:
+    """Shared stop condition: the end of the run, or the request count once it is used up."""
+
+    def __init__(self, config: LoadConfig, origin: float) -> None:
+        total = config.warmup_s + config.duration_s if config.duration_s > 0 else None
+        self.stop_at = origin + total if total is not None else None
+        self.remaining = config.requests if config.requests > 0 else None
+        self._lock = threading.Lock()
+
+    def take(self, now: float) -> bool:
+        if self.stop_at is not None and now >= self.stop_at:
+            return False
+        with self._lock:
+            if self.remaining is None:
+                return True
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def _pick(entries: List[MixEntry], rng: random.Random) -> MixEntry:
+    return rng.choices(entries, weights=[entry.weight for entry in entries])[0]
+
+
+def _closed_loop(transport: Any, mix: List[MixEntry], config: LoadConfig, origin: float) -> Tuple[List[Sample], int]:
+    budget = _Budget(config, origin)
+    samples: List[Sample] = []
+    lock = threading.Lock()
+
+    def client(index: int) -> None:
+        rng = random.Random(config.seed + index)
+        while budget.take(time.perf_counter()):
+            sample = _issue(transport, _pick(mix, rng), config.path, time.perf_counter(), origin)
+            with lock:
+                samples.append(sample)
+            if config.think_s > 0:
+                time.sleep(rng.expovariate(1.0 / config.think_s))
+
+    threads = [
+        threading.Thread(target=client, args=(index,), name=f"load-client-{index}", daemon=True)
+        for index in range(config.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, 0
+
+
+def _open_loop(transport: Any, mix: List[MixEntry], config: LoadConfig, origin: float) -> Tuple[List[Sample], int]:
+    budget = _Budget(config, origin)
+    rng = random.Random(config.seed)
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(config.max_in_flight)
+    dropped = 0
+
+    def send(entry: MixEntry, scheduled: float) -> None:
+        try:
+            sample = _issue(transport, entry, config.path, scheduled, origin)
+            with lock:
+                samples.append(sample)
+        finally:
+            in_flight.release()
+
+    next_at = origin
+    with ThreadPoolExecutor(max_workers=config.max_in_flight, thread_name_prefix="load-open") as pool:
+        while budget.take(next_at):
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            entry = _pick(mix, rng)
+            # Arrivals do not wait for earlier responses; past `max_in_flight` they are dropped and counted.
+            if in_flight.acquire(blocking=False):
+                pool.submit(send, entry, next_at)
+            else:
+                dropped += 1
+            next_at += rng.expovariate(config.rps) if config.arrivals == "poisson" else 1.0 / config.rps
+    return samples, dropped
+
+
+def _stats(name: str, samples: List[Sample], window_s: float) -> Tuple[BenchResult, Dict[str, Any]]:
+    ok = sorted(sample.latency_ms for sample in samples if not sample.error)
+    errors = sum(1 for sample in samples if sample.error)
+    result = BenchResult(
+        name=name,
+        iterations=len(ok),
+        total_s=window_s,
+        ops_per_sec=len(ok) / window_s if window_s > 0 else 0.0,
+        mean_ms=sum(ok) / len(ok) if ok else 0.0,
+        p50_ms=percentile(ok, 50),
+        p90_ms=percentile(ok, 90),
+        p99_ms=percentile(ok, 99),
+        max_ms=ok[-1] if ok else 0.0,
+    )
+    return result, {"errors": errors, "error_rate": round(errors / len(samples), 6) if samples else 0.0}
+
+
+def run_load(
+    transport: Any,
+    mix: List[MixEntry],
+    config: LoadConfig,
+    broker_dir: Optional[str] = None,
+    threshold_pct: float = DEFAULT_THRESHOLD_PCT,
+) -> Dict[str, Any]:
+    """Drive `transport` with `mix` under `config` and return a report in the benchmark baseline format.
+
+    `cases` holds one entry per mix name plus `all` (successful requests only; `ops_per_sec` is completed
+    requests per second of the measured window); `load` adds status, error and broker disk counters.
+    Requests scheduled during `warmup_s` run but are not measured.
+    """
+    config.validate()
+    before = directory_usage(broker_dir) if broker_dir else None
+    origin = time.perf_counter()
+    runner = _open_loop if config.model == "open" else _closed_loop
+    samples, dropped = runner(transport, mix, config, origin)
+    window_s = max(time.perf_counter() - origin - config.warmup_s, 1e-9)
+    measured = [sample for sample in samples if sample.scheduled >= config.warmup_s]
+
+    results: List[BenchResult] = []
+    extras: Dict[str, Dict[str, Any]] = {}
+    names = sorted({entry.name for entry in mix})
+    groups = [(ALL, measured)] + [(name, [sample for sample in measured if sample.name == name]) for name in names]
+    for name, group in groups:
+        result, extra = _stats(name, group, window_s)
+        results.append(result)
+        extras[name] = extra
+
+    report = build_baseline(
+        results,
+        {**config.as_dict(), "target": getattr(transport, "url", ""), "mix": [asdict(entry) for entry in mix]},
+        threshold_pct=threshold_pct,
+    )
+    for name, extra in extras.items():
+        report["cases"][name].update(extra)
+    load: Dict[str, Any] = {
+        "window_s": round(window_s, 3),
+        "requests": len(measured),
+        "completed": sum(1 for sample in measured if not sample.error),
+        "errors": extras[ALL]["errors"],
+        "error_rate": extras[ALL]["error_rate"],
+        "dropped": dropped,
+        "warmup_requests": len(samples) - len(measured),
+        "replayed": sum(1 for sample in measured if sample.replayed),
+        "http_status": dict(Counter(str(sample.http_status) for sample in measured if sample.http_status)),
+        "run_status": dict(Counter(sample.run_status for sample in measured if sample.run_status)),
+        "error_types": dict(Counter(sample.error for sample in measured if sample.error)),
+    }
+    if broker_dir and before is not None:
+        after = directory_usage(broker_dir)
+        runs = len(samples) or 1
+        load["broker_disk"] = {
+            "path": broker_dir,
+            "bytes_before": before["bytes"],
+            "bytes_after": after["bytes"],
+            "files_before": before["files"],
+            "files_after": after["files"],
+            "growth_bytes": after["bytes"] - before["bytes"],
+            "growth_bytes_per_request": round((after["bytes"] - before["bytes"]) / runs, 1),
+        }
+    report["load"] = load
+    return report
+
+
+def compare_load_reports(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Latency and throughput regressions as in `compare_to_baseline`, plus error-rate increases.
+
+    A case's error rate regresses when it exceeds the baseline's by more than its `error_rate_tolerance`
+    (absolute, default 0.01).
+    """
+    fields = set(BenchResult.__dataclass_fields__) - {"name"}
+    results = [
+        BenchResult(name=name, **{key: value for key, value in case.items() if key in fields})
+        for name, case in report.get("cases", {}).items()
+    ]
+    regressions = compare_to_baseline(results, baseline)
+    for name, case in report.get("cases", {}).items():
+        reference = baseline.get("cases", {}).get(name)
+        if not isinstance(reference, dict) or "error_rate" not in reference:
+            continue
+        tolerance = float(reference.get("error_rate_tolerance", DEFAULT_ERROR_RATE_TOLERANCE))
+        base_rate, rate = float(reference["error_rate"]), float(case.get("error_rate", 0.0))
+        if rate > base_rate + tolerance:
+            regressions.append(
+                {
+                    "case": name,
+                    "metric": "error_rate",
+                    "baseline": base_rate,
+                    "current": rate,
+                    "change_pct": round((rate - base_rate) * 100.0, 2),
+                    "threshold_pct": tolerance * 100.0,
+                }
+            )
+    return regressions
@@ -0,0 +1,151 @@
+"""Budget ledger for steps, tokens, tool calls and spawns, with history-based phase cost prediction."""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from .meta_eval_log import file_lock
+
+METRICS = ("steps", "tokens", "tool_calls", "spawns")
+LIMIT_KEYS = {metric: f"max_{metric}" for metric in METRICS}
+COST_MODEL_VERSION = 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate: the larger of ~4 characters per token and ~0.75 words per token."""
+    if not text:
+        return 0
+    by_chars = (len(text) + 3) // 4
+    by_words = (len(text.split()) * 4 + 2) // 3
+    return max(by_chars, by_words)
+
+
+def estimate_payload_tokens(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return estimate_tokens(value)
+    return estimate_tokens(json.dumps(value, separators=(",", ":"), sort_keys=True, default=str))
+
+
+def _empty_usage() -> Dict[str, int]:
+    return {metric: 0 for metric in METRICS}
+
+
+class BudgetLedger:
+    """Running usage against `budgets` (the same dict skills may adjust mid-run); a limit of 0 means unbounded."""
+
+    def __init__(self, budgets: Dict[str, Any]) -> None:
+        self.budgets = budgets
+        self.total = _empty_usage()
+        self.per_role: Dict[str, Dict[str, int]] = {}
+        self.phase_costs: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+
+    def _limit(self, scope: Dict[str, Any], metric: str) -> int:
+        try:
+            return int(scope.get(LIMIT_KEYS[metric], 0) or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def _scopes(self, role: str) -> List[Any]:
+        global_limits = self.budgets.get("global", {})
+        role_limits = self.budgets.get("per_role", {}).get(role, {})
+        return [
+            ("global", global_limits if isinstance(global_limits, dict) else {}, self.total),
+            (role, role_limits if isinstance(role_limits, dict) else {}, self.per_role.get(role, _empty_usage())),
+        ]
+
+    def open_phase(self, phase: str, role: str) -> None:
+        self._current = {"phase": phase, "role": role, **_empty_usage()}
+        self.phase_costs.append(self._current)
+
+    def charge(self, role: str, **usage: int) -> Optional[str]:
+        """Record usage and return the first exceeded limit (e.g. `eval.max_tokens`), if any."""
+        role_usage = self.per_role.setdefault(role, _empty_usage())
+        for metric, amount in usage.items():
+            if metric not in METRICS or not amount:
+                continue
+            self.total[metric] += int(amount)
+            role_usage[metric] += int(amount)
+            if self._current is not None:
+                self._current[metric] += int(amount)
+        return self.exceeded(role)
+
+    def exceeded(self, role: str) -> Optional[str]:
+        for name, limits, used in self._scopes(role):
+            for metric in METRICS:
+                limit = self._limit(limits, metric)
+                if limit and used[metric] > limit:
+                    return f"{name}.{LIMIT_KEYS[metric]}"
+        return None
+
+    def would_overrun(self, role: str, predicted: Dict[str, float]) -> Optional[str]:
+        """Return the limit that `predicted` additional usage would push past, if any."""
+        for name, limits, used in self._scopes(role):
+            for metric in METRICS:
+                limit = self._limit(limits, metric)
+                if limit and used[metric] + float(predicted.get(metric, 0) or 0) > limit:
+                    return f"{name}.{LIMIT_KEYS[metric]}"
+        return None
+
+    def remaining(self, role: str) -> Dict[str, Optional[int]]:
+        result: Dict[str, Optional[int]] = {}
+        for metric in METRICS:
+            values = [
+                self._limit(limits, metric) - used[metric]
+                for _, limits, used in self._scopes(role)
+                if self._limit(limits, metric)
+            ]
+            result[metric] = min(values) if values else None
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        return {"total": dict(self.total), "per_role": {role: dict(used) for role, used in self.per_role.items()}}
+
+
+class PhaseCostModel:
+    """Average cost per phase name, accumulated across runs in a small JSON file next to the run history."""
+
+    def __init__(self, path: str, min_samples: int = 3) -> None:
+        self.path = path
+        self.min_samples = min_samples
+        self.phases: Dict[str, Dict[str, float]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                doc = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(doc, dict) or doc.get("version") != COST_MODEL_VERSION:
+            return {}
+        phases = doc.get("phases", {})
+        return phases if isinstance(phases, dict) else {}
+
+    def predict(self, phase: str) -> Optional[Dict[str, float]]:
+        stats = self.phases.get(phase)
+        if not stats or stats.get("samples", 0) < self.min_samples:
+            return None
+        samples = float(stats["samples"])
+        return {metric: stats.get(metric, 0.0) / samples for metric in METRICS}
+
+    def update(self, phase_costs: List[Dict[str, Any]]) -> None:
+        """Fold one run's phase executions into the model (merged with concurrent writers under a lock)."""
+        if not phase_costs:
+            return
+        with file_lock(f"{self.path}.lock"):
+            phases = self._load()
+            for cost in phase_costs:
+                stats = phases.setdefault(str(cost["phase"]), {"samples": 0, **{metric: 0.0 for metric in METRICS}})
+                stats["samples"] += 1
+                for metric in METRICS:
+                    stats[metric] = stats.get(metric, 0.0) + float(cost.get(metric, 0) or 0)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump({"version": COST_MODEL_VERSION, "phases": phases}, handle, indent=2)
+            os.replace(tmp_path, self.path)
+        self.phases = phases
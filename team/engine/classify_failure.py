@@ -1,76 +1,188 @@
-"""Failure classification rules based on structured signals."""
+"""Failure classification from a versioned, table-driven taxonomy of structured-signal rules."""
 from __future__ import annotations
 
-from typing import Any, Dict, List
-
-from .config import FAILURE_TAXONOMY_VERSION
-
-
-def _has_tool_error(failure_signals: Dict[str, Any], types: List[str]) -> bool:
-    for item in failure_signals.get("tool_errors", []) or []:
-        if item.get("error_type") in types:
-            return True
-    return False
-
-
-def _has_routing_anomaly(failure_signals: Dict[str, Any]) -> bool:
-    return bool(failure_signals.get("routing_anomalies", []))
-
-
-def _has_state_anomaly(failure_signals: Dict[str, Any]) -> bool:
-    return bool(failure_signals.get("state_anomalies", []))
-
-
-def _has_compilation_error(failure_signals: Dict[str, Any], types: List[str]) -> bool:
-    for item in failure_signals.get("compilation_errors", []) or []:
-        if item.get("error_type") in types:
-            return True
-    return False
-
-
-def _has_metric_category(failure_signals: Dict[str, Any], categories: List[str]) -> bool:
-    for item in failure_signals.get("metric_failures", []) or []:
-        if item.get("category") in categories:
-            return True
-    return False
-
-
-def classify_failure(failure_signals: Dict[str, Any]) -> Dict[str, Any]:
-    matched: List[Dict[str, Any]] = []
-
-    if _has_tool_error(failure_signals, ["schema_mismatch", "auth_failure", "timeout", "rate_limit"]):
-        matched.append({"priority": 1, "route": "tooling"})
-        route = "tooling"
-    elif _has_routing_anomaly(failure_signals):
-        matched.append({"priority": 2, "route": "architect"})
-        route = "architect"
-    elif _has_state_anomaly(failure_signals):
-        matched.append({"priority": 3, "route": "architect"})
-        route = "architect"
-    elif _has_compilation_error(failure_signals, ["schema_inconsistency", "unbounded_recursion"]):
-        matched.append({"priority": 4, "route": "architect"})
-        route = "architect"
-    elif _has_compilation_error(failure_signals, ["missing_contract"]):
-        matched.append({"priority": 5, "route": "tooling"})
-        route = "tooling"
-    elif _has_metric_category(failure_signals, ["coverage", "rubric"]):
-        matched.append({"priority": 6, "route": "eval"})
-        route = "eval"
-    elif _has_metric_category(failure_signals, ["reasoning", "instruction_following"]):
-        matched.append({"priority": 7, "route": "prompt_policy"})
-        route = "prompt_policy"
-    elif _has_metric_category(failure_signals, ["latency", "cost"]):
-        matched.append({"priority": 8, "route": "ops"})
-        route = "ops"
-    elif _has_tool_error(failure_signals, ["logic_error"]):
-        matched.append({"priority": 9, "route": "prompt_policy"})
-        route = "prompt_policy"
-    else:
-        matched.append({"priority": 10, "route": "architect"})
-        route = "architect"
-
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from .schema_validation import SchemaRegistry
+
+DEFAULT_TAXONOMY_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "config", "failure_taxonomy.yaml")
+)
+_SCHEMA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "schemas"))
+
+_TAXONOMIES: Dict[str, "FailureTaxonomy"] = {}
+_TAXONOMIES_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Rule:
+    priority: int
+    route: str
+    signal: str
+    field: str = ""
+    values: FrozenSet[str] = frozenset()
+
+
+class FailureTaxonomy:
+    """Priority-ordered rules over failure signals.
+
+    Rules are compiled into per-signal lookup tables: whether a non-empty signal list matches at all, and
+    `(field, {value: rule})` pairs for value rules. Classification makes a single pass over the signal
+    items and keeps the best-ranked hit instead of rescanning the signals once per rule.
+    """
+
+    def __init__(self, version: int, rules: Iterable[Rule], default_route: str, default_priority: int) -> None:
+        self.version = version
+        self.rules: Tuple[Rule, ...] = tuple(sorted(rules, key=lambda rule: rule.priority))
+        self.default_route = default_route
+        self.default_priority = default_priority
+        presence: Dict[str, int] = {}
+        values: Dict[str, Dict[str, Dict[str, int]]] = {}
+        # Rank is the position in priority order, so ties keep the order of the taxonomy file.
+        for rank, rule in enumerate(self.rules):
+            if not rule.field:
+                presence.setdefault(rule.signal, rank)
+                continue
+            table = values.setdefault(rule.signal, {}).setdefault(rule.field, {})
+            for value in rule.values:
+                table.setdefault(value, rank)
+        self._tables: Tuple[Tuple[str, Optional[int], Tuple[Tuple[str, Dict[str, int]], ...]], ...] = tuple(
+            (signal, presence.get(signal), tuple(sorted(values.get(signal, {}).items())))
+            for signal in sorted(set(presence) | set(values))
+        )
+        self._results = [
+            ({"priority": rule.priority, "route": rule.route}, rule.route) for rule in self.rules
+        ] + [({"priority": default_priority, "route": default_route}, default_route)]
+
+    @classmethod
+    def from_dict(cls, doc: Any, source: str = "<taxonomy>") -> "FailureTaxonomy":
+        if not isinstance(doc, dict):
+            raise ValueError(f"{source}: taxonomy must be a mapping")
+        result = SchemaRegistry(_SCHEMA_DIR, {"taxonomy": "failure_taxonomy.schema.json"}).validate("taxonomy", doc)
+        if not result["valid"]:
+            raise ValueError(f"{source}: " + "; ".join(result["errors"][:3]))
+        rules = []
+        for item in doc.get("rules", []):
+            if bool(item.get("field")) != bool(item.get("values")):
+                raise ValueError(f"{source}: rule {item.get('priority')} needs both `field` and `values` or neither")
+            rules.append(
+                Rule(
+                    priority=int(item["priority"]),
+                    route=str(item["route"]),
+                    signal=str(item["signal"]),
+                    field=str(item.get("field", "")),
+                    values=frozenset(str(value) for value in item.get("values", [])),
+                )
+            )
+        default = doc.get("default", {})
+        return cls(int(doc["version"]), rules, str(default.get("route", "architect")), int(default.get("priority", 0)))
+
+    @classmethod
+    def load(cls, path: str) -> "FailureTaxonomy":
+        try:
+            import yaml  # type: ignore
+        except Exception as exc:
+            raise RuntimeError("PyYAML is required to load the failure taxonomy.") from exc
+        with open(path, "r", encoding="utf-8") as handle:
+            doc = yaml.safe_load(handle)
+        return cls.from_dict(doc, source=path)
+
+    def routes(self) -> Tuple[str, ...]:
+        """Every route this taxonomy can return, in priority order."""
+        seen: List[str] = []
+        for route in [rule.route for rule in self.rules] + [self.default_route]:
+            if route not in seen:
+                seen.append(route)
+        return tuple(seen)
+
+    def match_rank(self, failure_signals: Dict[str, Any]) -> int:
+        """Rank of the first matching rule in priority order, or `len(self.rules)` for the default."""
+        best = len(self.rules)
+        for signal, presence_rank, fields in self._tables:
+            items = failure_signals.get(signal)
+            if not items:
+                continue
+            if presence_rank is not None and presence_rank < best:
+                best = presence_rank
+            if not fields:
+                continue
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                for field, table in fields:
+                    value = item.get(field)
+                    if isinstance(value, str):
+                        rank = table.get(value)
+                        if rank is not None and rank < best:
+                            best = rank
+        return best
+
+    def classify(self, failure_signals: Dict[str, Any]) -> Dict[str, Any]:
+        matched, route = self._results[self.match_rank(failure_signals or {})]
+        return {"route": route, "matched_rules": [dict(matched)], "taxonomy_version": self.version}
+
+    def route(self, failure_signals: Dict[str, Any]) -> str:
+        return self._results[self.match_rank(failure_signals or {})][1]
+
+    def classify_batch(self, signal_sets: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Yield only the route per signal set, skipping result construction; for streaming large histories."""
+        route = self.route
+        for failure_signals in signal_sets:
+            yield route(failure_signals)
+
+
+def reclassify(entries: Iterable[Dict[str, Any]], taxonomy: FailureTaxonomy) -> Dict[str, Any]:
+    """Re-run `taxonomy` over the failures recorded in meta-eval entries and count route changes."""
+    route_for = taxonomy.route
+    routes: Dict[str, int] = {}
+    transitions: Dict[str, int] = {}
+    versions: Dict[str, int] = {}
+    changed = 0
+    count = 0
+    for entry in entries:
+        for record in entry.get("failures") or []:
+            if not isinstance(record, dict):
+                continue
+            route = route_for(record.get("signals") or {})
+            count += 1
+            routes[route] = routes.get(route, 0) + 1
+            version = str(record.get("taxonomy_version", ""))
+            versions[version] = versions.get(version, 0) + 1
+            previous = str(record.get("route", ""))
+            if previous != route:
+                changed += 1
+                key = f"{previous}->{route}"
+                transitions[key] = transitions.get(key, 0) + 1
     return {
-        "route": route,
-        "matched_rules": matched,
-        "taxonomy_version": FAILURE_TAXONOMY_VERSION,
+        "taxonomy_version": taxonomy.version,
+        "records": count,
+        "recorded_versions": versions,
+        "routes": routes,
+        "changed": changed,
+        "transitions": dict(sorted(transitions.items(), key=lambda item: -item[1])),
     }
+
+
+def load_taxonomy(path: Optional[str] = None) -> FailureTaxonomy:
+    """Return the process-wide taxonomy for `path` (default `team/config/failure_taxonomy.yaml`)."""
+    key = os.path.abspath(path or DEFAULT_TAXONOMY_PATH)
+    taxonomy = _TAXONOMIES.get(key)
+    if taxonomy is not None:
+        return taxonomy
+    with _TAXONOMIES_LOCK:
+        taxonomy = _TAXONOMIES.get(key)
+        if taxonomy is None:
+            taxonomy = FailureTaxonomy.load(key)
+            _TAXONOMIES[key] = taxonomy
+    return taxonomy
+
+
+def failure_routes() -> Tuple[str, ...]:
+    return load_taxonomy().routes()
+
+
+def classify_failure(failure_signals: Dict[str, Any], taxonomy: Optional[FailureTaxonomy] = None) -> Dict[str, Any]:
+    return (taxonomy or load_taxonomy()).classify(failure_signals)
@@ -1,7 +1,7 @@
 """Shared configuration for the team scaffold."""
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List
 
 
 ARTIFACT_OWNERS: Dict[str, str] = {
@@ -20,6 +20,42 @@ ARTIFACT_OWNERS: Dict[str, str] = {
     "MetaEvalLog": "orchestrator",
 }
 
+ARTIFACT_SCHEMAS: Dict[str, str] = {
+    "SystemSpec": "system_spec.schema.json",
+    "PromptPack": "prompt_pack.schema.json",
+    "ToolContract": "tool_contract.schema.json",
+    "EvalSpec": "eval_spec.schema.json",
+    "ExperimentSpec": "experiment_spec.schema.json",
+    "ExperimentReport": "experiment_report.schema.json",
+    "TelemetrySpec": "telemetry_spec.schema.json",
+    "SLOReport": "slo_report.schema.json",
+    "PromotionDecision": "promotion_decision.schema.json",
+    "ConstraintPack": "constraint_pack.schema.json",
+    "CompiledSpec": "compiled_spec.schema.json",
+    "CompilationReport": "compilation_report.schema.json",
+}
+
+# Artifacts each role's subgraph consumes; used to key phase memoization on input content.
+ROLE_INPUT_ARTIFACTS: Dict[str, List[str]] = {
+    "architect": ["ConstraintPack"],
+    "prompt_policy": ["ConstraintPack", "SystemSpec"],
+    "tooling": ["SystemSpec"],
+    "eval": ["SystemSpec", "PromptPack", "ToolContract"],
+    "ops": ["SystemSpec", "ToolContract"],
+    "compiler": ["SystemSpec", "PromptPack", "ToolContract"],
+}
+
+# Phase each failure route re-runs before the failing phase is retried.
+ROUTE_PHASES: Dict[str, str] = {
+    "architect": "architect",
+    "prompt_policy": "prompt_policy",
+    "tooling": "tooling",
+    "eval": "eval_smoke",
+    "optimizer": "optimizer",
+    "ops": "ops_instrument",
+    "compiler": "compile",
+}
+
 STANDARD_BUILD_BUDGETS = {
     "global": {
         "max_steps": 100,
@@ -38,5 +74,3 @@ STANDARD_BUILD_BUDGETS = {
         "orchestrator": {"max_steps": 12, "max_tokens": 50000, "max_tool_calls": 10, "max_spawns": 0},
     },
 }
-
-FAILURE_TAXONOMY_VERSION = 1
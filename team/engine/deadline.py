@@ -0,0 +1,236 @@
+"""Wall-clock run and phase deadlines with cooperative cancellation, plus the registry cancel requests go through."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+CANCELLED = "cancelled"
+DEADLINE_EXCEEDED = "deadline_exceeded"
+
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "run_s": 0,
+    "phase_s": 0,
+    "probe_interval_s": 0.25,
+}
+
+
+class RunCancelled(Exception):
+    """Raised at a check point once a run is cancelled or past a deadline; `reason` becomes the run status."""
+
+    def __init__(self, reason: str, where: str = "") -> None:
+        super().__init__(f"{reason} at {where}" if where else reason)
+        self.reason = reason
+        self.where = where
+
+
+class CancelToken:
+    """Cancellation state for one run, checked cooperatively at phase, hook, broker and memory boundaries.
+
+    `deadline_s` bounds the whole run and `phase_deadline_s` each phase (None or 0 is unbounded). `probe`, if
+    given, reports cancel requests made elsewhere (another API worker, the run queue); it is polled at most
+    every `probe_interval_s` from check points.
+    """
+
+    def __init__(
+        self,
+        deadline_s: Optional[float] = None,
+        phase_deadline_s: Optional[float] = None,
+        probe: Optional[Callable[[], bool]] = None,
+        probe_interval_s: float = DEFAULT_OPTIONS["probe_interval_s"],
+    ) -> None:
+        self.started = time.monotonic()
+        self.started_wall = time.time()
+        self.run_deadline = self.started + float(deadline_s) if deadline_s else None
+        self.phase_deadline_s = float(phase_deadline_s) if phase_deadline_s else None
+        self.phase = ""
+        self.reason = ""
+        self._phase_deadline: Optional[float] = None
+        self._event = threading.Event()
+        self._probe = probe
+        self._probe_interval = float(probe_interval_s)
+        self._probed_at = 0.0
+
+    @property
+    def event(self) -> threading.Event:
+        """Set once the run is cancelled or expired; lets blocking helpers wake early."""
+        return self._event
+
+    def cancel(self, reason: str = CANCELLED) -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def begin_phase(self, phase: str) -> None:
+        self.phase = phase
+        self._phase_deadline = time.monotonic() + self.phase_deadline_s if self.phase_deadline_s else None
+
+    def end_phase(self) -> None:
+        self.phase = ""
+        self._phase_deadline = None
+
+    def deadline(self) -> Optional[float]:
+        deadlines = [value for value in (self.run_deadline, self._phase_deadline) if value is not None]
+        return min(deadlines) if deadlines else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the nearest deadline (never negative), or None when unbounded."""
+        deadline = self.deadline()
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def expired(self) -> str:
+        """The stop reason, or "" while the run may continue."""
+        if self._event.is_set():
+            return self.reason
+        now = time.monotonic()
+        deadline = self.deadline()
+        if deadline is not None and now >= deadline:
+            self.cancel(DEADLINE_EXCEEDED)
+        elif self._probe is not None and now - self._probed_at >= self._probe_interval:
+            self._probed_at = now
+            try:
+                requested = bool(self._probe())
+            except Exception:
+                requested = False
+            if requested:
+                self.cancel(CANCELLED)
+        return self.reason if self._event.is_set() else ""
+
+    def check(self, step: str = "") -> None:
+        """Raise `RunCancelled` (located as `<phase>:<step>`) if the run must stop."""
+        reason = self.expired()
+        if reason:
+            raise RunCancelled(reason, ":".join(part for part in (self.phase, step) if part))
+
+    def call(self, step: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking call (e.g. a memory backend) on a helper thread, abandoning it if the run stops first.
+
+        An abandoned call keeps running on its daemon thread, but no longer holds the run or its worker.
+        """
+        self.check(step)
+        box: Dict[str, Any] = {}
+        done = threading.Event()
+
+        def target() -> None:
+            try:
+                box["value"] = fn(*args, **kwargs)
+            except BaseException as exc:  # re-raised on the calling thread
+                box["error"] = exc
+            finally:
+                done.set()
+
+        threading.Thread(target=target, name=f"cancellable-{step}", daemon=True).start()
+        while not done.wait(self._wait_interval()):
+            self.check(step)
+        if "error" in box:
+            raise box["error"]
+        return box.get("value")
+
+    def wait(self, step: str, future: Any) -> Any:
+        """Wait for a `concurrent.futures.Future` (e.g. an async memory call), cancelling it if the run stops."""
+        while True:
+            try:
+                self.check(step)
+            except RunCancelled:
+                future.cancel()
+                raise
+            try:
+                return future.result(timeout=self._wait_interval())
+            except TimeoutError:
+                continue
+
+    def _wait_interval(self) -> float:
+        remaining = self.remaining()
+        interval = self._probe_interval if self._probe is not None else 0.05
+        return interval if remaining is None else max(0.001, min(interval, remaining))
+
+
+def _limit(configured: Any, requested: Any) -> Optional[float]:
+    # The profile value is a ceiling: a request may tighten it but not lift it.
+    values = [float(value) for value in (configured, requested) if value]
+    return min(values) if values else None
+
+
+def build_cancel_token(
+    cfg: Optional[Dict[str, Any]] = None,
+    deadline_s: Optional[float] = None,
+    phase_deadline_s: Optional[float] = None,
+    probe: Optional[Callable[[], bool]] = None,
+) -> CancelToken:
+    """Token for the profile's `deadlines` section combined with per-request deadlines."""
+    opts = {**DEFAULT_OPTIONS, **(cfg or {})}
+    return CancelToken(
+        _limit(opts.get("run_s"), deadline_s),
+        _limit(opts.get("phase_s"), phase_deadline_s),
+        probe=probe,
+        probe_interval_s=float(opts.get("probe_interval_s", DEFAULT_OPTIONS["probe_interval_s"])),
+    )
+
+
+_ACTIVE: Dict[str, CancelToken] = {}
+_ACTIVE_LOCK = threading.Lock()
+
+
+def register_run(run_id: str, token: CancelToken) -> None:
+    with _ACTIVE_LOCK:
+        _ACTIVE[run_id] = token
+
+
+def unregister_run(run_id: str) -> None:
+    with _ACTIVE_LOCK:
+        _ACTIVE.pop(run_id, None)
+
+
+def cancel_run(run_id: str, reason: str = CANCELLED) -> bool:
+    """Cancel a run executing in this process; False when it is not running here."""
+    with _ACTIVE_LOCK:
+        token = _ACTIVE.get(run_id)
+    if token is None:
+        return False
+    token.cancel(reason)
+    return True
+
+
+class CancelMarkers:
+    """Cancel requests shared by every process on a host through marker files (one per run id).
+
+    A marker only cancels runs that started before it was written, so a stale marker never cancels a later
+    run that reuses the id.
+    """
+
+    def __init__(self, directory: str, max_age_s: float = 3600.0) -> None:
+        self.directory = directory
+        self.max_age_s = max_age_s
+
+    def _path(self, run_id: str) -> str:
+        safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in run_id)
+        return os.path.join(self.directory, f"{safe}.cancel")
+
+    def request(self, run_id: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(run_id), "w", encoding="utf-8") as handle:
+            handle.write(f"{time.time():.3f}\n")
+        self.prune()
+
+    def requested(self, run_id: str, since: float) -> bool:
+        try:
+            return os.path.getmtime(self._path(run_id)) >= since
+        except OSError:
+            return False
+
+    def clear(self, run_id: str) -> None:
+        try:
+            os.remove(self._path(run_id))
+        except OSError:
+            pass
+
+    def prune(self) -> None:
+        cutoff = time.time() - self.max_age_s
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
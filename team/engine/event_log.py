@@ -0,0 +1,186 @@
+"""Compact run event log behind the orchestrator's `routing_trace` and `history`, spilling to disk when large."""
+from __future__ import annotations
+
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "spill_after": 10000,
+    "spill_dir": "",
+    "max_response_events": 0,
+}
+
+Event = Tuple[str, str, str, float]
+
+# One spilled event: phase, decision and outcome codes, then the offset in ms.
+_ROW = struct.Struct("<IIId")
+_READ_CHUNK = 1024
+
+
+def trace_entry(event: Event) -> Dict[str, Any]:
+    phase, decision, outcome, t_ms = event
+    return {"phase": phase, "decision": decision, "reason": outcome, "t_ms": t_ms}
+
+
+def history_entry(event: Event) -> Dict[str, str]:
+    phase, decision, outcome, _ = event
+    return {"phase": phase, "decision": decision, "outcome": outcome}
+
+
+def page_trace(result: Dict[str, Any], offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Copy of a run output holding its full trace, cut to `limit` events from `offset` like `EventLog.window`."""
+    routing_trace = result.get("routing_trace")
+    history = result.get("history")
+    if not isinstance(routing_trace, list) or not isinstance(history, list):
+        return result
+    total = len(routing_trace)
+    stop = total if limit is None else offset + max(0, limit)
+    paged = dict(result)
+    paged["routing_trace"] = routing_trace[offset:stop]
+    paged["history"] = history[offset:stop]
+    paged.pop("trace", None)
+    if len(paged["routing_trace"]) < total:
+        paged["trace"] = {"total": total, "offset": offset, "returned": len(paged["routing_trace"])}
+    return paged
+
+
+class EventLog:
+    """Append-only run events held as parallel columns of interned string codes plus a time offset.
+
+    Every distinct phase, decision or outcome string is stored once in `codes`, so an event costs 20 bytes.
+    Once `spill_after` events are buffered (0 never spills) they move to an anonymous temp file of fixed-size
+    rows in `spill_dir` (default: the system temp dir), which keeps long runs bounded in memory while any
+    event stays one seek away.
+    """
+
+    def __init__(self, spill_after: int = DEFAULT_OPTIONS["spill_after"], spill_dir: str = "") -> None:
+        self.spill_after = max(0, int(spill_after))
+        self.spill_dir = spill_dir
+        self.codes: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._phase = array("I")
+        self._decision = array("I")
+        self._outcome = array("I")
+        self._t_ms = array("d")
+        self._spill: Any = None
+        self._spilled = 0
+        self._lock = threading.Lock()
+
+    def _code(self, value: str) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.codes)
+            self.codes.append(value)
+        return code
+
+    def append(self, phase: str, decision: str, outcome: str, t_ms: float) -> None:
+        with self._lock:
+            self._phase.append(self._code(phase))
+            self._decision.append(self._code(decision))
+            self._outcome.append(self._code(outcome))
+            self._t_ms.append(t_ms)
+            if self.spill_after and len(self._phase) >= self.spill_after:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._spill is None:
+            if self.spill_dir:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            self._spill = tempfile.TemporaryFile(prefix="events-", dir=self.spill_dir or None)
+        self._spill.seek(0, os.SEEK_END)
+        rows = zip(self._phase, self._decision, self._outcome, self._t_ms)
+        self._spill.write(b"".join(_ROW.pack(*row) for row in rows))
+        self._spilled += len(self._phase)
+        for column in (self._phase, self._decision, self._outcome, self._t_ms):
+            del column[:]
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._phase)
+
+    @property
+    def spilled(self) -> int:
+        return self._spilled
+
+    def events(self, start: int = 0, stop: Optional[int] = None) -> List[Event]:
+        """Decoded events `start` to `stop` (exclusive), clamped to the log."""
+        with self._lock:
+            total = len(self)
+            start = max(0, start)
+            stop = total if stop is None else max(start, min(stop, total))
+            rows: List[Tuple[int, int, int, float]] = []
+            if start < self._spilled:
+                end = min(stop, self._spilled)
+                self._spill.seek(start * _ROW.size)
+                rows.extend(_ROW.iter_unpack(self._spill.read((end - start) * _ROW.size)))
+            for idx in range(max(start, self._spilled) - self._spilled, stop - self._spilled):
+                rows.append((self._phase[idx], self._decision[idx], self._outcome[idx], self._t_ms[idx]))
+            codes = self.codes
+        return [(codes[phase], codes[decision], codes[outcome], t_ms) for phase, decision, outcome, t_ms in rows]
+
+    @property
+    def routing_trace(self) -> "EventView":
+        return EventView(self, trace_entry)
+
+    @property
+    def history(self) -> "EventView":
+        return EventView(self, history_entry)
+
+    def window(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """`routing_trace` and `history` for `limit` events from `offset`, plus `trace` paging info when partial."""
+        total = len(self)
+        stop = total if limit is None else offset + max(0, limit)
+        events = self.events(offset, stop)
+        window: Dict[str, Any] = {
+            "routing_trace": [trace_entry(event) for event in events],
+            "history": [history_entry(event) for event in events],
+        }
+        if len(events) < total:
+            window["trace"] = {"total": total, "offset": offset, "returned": len(events)}
+        return window
+
+    def close(self) -> None:
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+
+class EventView(Sequence):
+    """Read-only list view of an `EventLog` that renders each event in one JSON shape on access."""
+
+    def __init__(self, log: EventLog, render: Callable[[Event], Dict[str, Any]]) -> None:
+        self._log = log
+        self._render = render
+
+    def __len__(self) -> int:
+        return len(self._log)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._log))
+            if step != 1:
+                return [self[idx] for idx in range(start, stop, step)]
+            return [self._render(event) for event in self._log.events(start, stop)]
+        total = len(self._log)
+        idx = index + total if index < 0 else index
+        if not 0 <= idx < total:
+            raise IndexError("event index out of range")
+        return self._render(self._log.events(idx, idx + 1)[0])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for start in range(0, len(self._log), _READ_CHUNK):
+            for event in self._log.events(start, start + _READ_CHUNK):
+                yield self._render(event)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, EventView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EventView({len(self)} events)"
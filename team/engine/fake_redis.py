@@ -0,0 +1,304 @@
+"""In-process stand-in for the Redis stream commands used by the run queue (development, single-node and checks)."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+Entry = Tuple[str, Dict[str, str]]
+
+
+class ResponseError(Exception):
+    """Mirrors `redis.exceptions.ResponseError` for the error strings callers inspect (e.g. BUSYGROUP)."""
+
+
+def _parse_id(value: str) -> Tuple[int, int]:
+    if value in ("-", "0"):
+        return (0, 0)
+    if value == "+":
+        return (2**63, 2**63)
+    ms, _, seq = value.partition("-")
+    return (int(ms), int(seq or 0))
+
+
+class _Group:
+    def __init__(self, last_id: str) -> None:
+        self.last_id = last_id
+        # id -> [consumer, delivered_at (monotonic ms), times_delivered]
+        self.pending: "OrderedDict[str, List[Any]]" = OrderedDict()
+
+
+class _Stream:
+    def __init__(self) -> None:
+        self.entries: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self.groups: Dict[str, _Group] = {}
+        self.last_id = "0-0"
+
+
+class FakeRedis:
+    """Thread-safe subset of redis-py's stream API with `decode_responses=True` semantics.
+
+    Covers XADD, XLEN, XRANGE, XREAD, XGROUP CREATE, XREADGROUP, XACK, XCLAIM, XAUTOCLAIM, XPENDING (range
+    form), EXPIRE, DELETE, EXISTS and PING. Blocking reads wait on a condition variable instead of a socket.
+    """
+
+    def __init__(self) -> None:
+        self._streams: Dict[str, _Stream] = {}
+        self._expiry: Dict[str, float] = {}
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.monotonic() * 1000)
+
+    def _stream(self, name: str, create: bool = False) -> Optional[_Stream]:
+        deadline = self._expiry.get(name)
+        if deadline is not None and time.time() >= deadline:
+            self._streams.pop(name, None)
+            self._expiry.pop(name, None)
+        stream = self._streams.get(name)
+        if stream is None and create:
+            stream = self._streams[name] = _Stream()
+        return stream
+
+    def ping(self) -> bool:
+        return True
+
+    def xadd(
+        self, name: str, fields: Dict[str, Any], id: str = "*", maxlen: Optional[int] = None, approximate: bool = True
+    ) -> str:
+        with self._cond:
+            stream = self._stream(name, create=True)
+            assert stream is not None
+            if id == "*":
+                ms = int(time.time() * 1000)
+                last_ms, last_seq = _parse_id(stream.last_id)
+                entry_id = f"{last_ms}-{last_seq + 1}" if ms <= last_ms else f"{ms}-0"
+            else:
+                if _parse_id(id) <= _parse_id(stream.last_id):
+                    raise ResponseError("ERR The ID specified in XADD is equal or smaller than the top item")
+                entry_id = id
+            stream.entries[entry_id] = {str(key): str(value) for key, value in fields.items()}
+            stream.last_id = entry_id
+            if maxlen is not None:
+                while len(stream.entries) > maxlen:
+                    stream.entries.popitem(last=False)
+            self._cond.notify_all()
+            return entry_id
+
+    def xlen(self, name: str) -> int:
+        with self._cond:
+            stream = self._stream(name)
+            return len(stream.entries) if stream else 0
+
+    def xrange(self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None) -> List[Entry]:
+        with self._cond:
+            stream = self._stream(name)
+            if stream is None:
+                return []
+            low, high = _parse_id(min), _parse_id(max)
+            found = [(key, dict(value)) for key, value in stream.entries.items() if low <= _parse_id(key) <= high]
+            return found[:count] if count else found
+
+    def _after(self, stream: _Stream, last_id: str, count: Optional[int]) -> List[Entry]:
+        after = _parse_id(last_id)
+        found = [(key, dict(value)) for key, value in stream.entries.items() if _parse_id(key) > after]
+        return found[:count] if count else found
+
+    def _wait(self, block: Optional[int], read: Any) -> List[List[Any]]:
+        deadline = None if block is None else time.monotonic() + block / 1000.0
+        with self._cond:
+            while True:
+                result = read()
+                if result or block is None:
+                    return result
+                remaining = None if block == 0 else deadline - time.monotonic()  # type: ignore[operator]
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+
+    def xread(
+        self, streams: Dict[str, str], count: Optional[int] = None, block: Optional[int] = None
+    ) -> List[List[Any]]:
+        with self._cond:
+            # `$` means "only entries added after this call", so resolve it once up front.
+            positions = {}
+            for name, last_id in streams.items():
+                stream = self._stream(name)
+                positions[name] = (stream.last_id if stream else "0-0") if last_id == "$" else last_id
+
+        def read() -> List[List[Any]]:
+            result = []
+            for name, last_id in positions.items():
+                stream = self._stream(name)
+                entries = self._after(stream, last_id, count) if stream else []
+                if entries:
+                    result.append([name, entries])
+            return result
+
+        return self._wait(block, read)
+
+    def xgroup_create(self, name: str, groupname: str, id: str = "$", mkstream: bool = False) -> bool:
+        with self._cond:
+            stream = self._stream(name, create=mkstream)
+            if stream is None:
+                raise ResponseError("ERR The XGROUP subcommand requires the key to exist")
+            if groupname in stream.groups:
+                raise ResponseError("BUSYGROUP Consumer Group name already exists")
+            stream.groups[groupname] = _Group(stream.last_id if id == "$" else id)
+            return True
+
+    def _group(self, name: str, groupname: str) -> Tuple[_Stream, _Group]:
+        stream = self._stream(name)
+        if stream is None or groupname not in stream.groups:
+            raise ResponseError(f"NOGROUP No such key '{name}' or consumer group '{groupname}'")
+        return stream, stream.groups[groupname]
+
+    def xreadgroup(
+        self,
+        groupname: str,
+        consumername: str,
+        streams: Dict[str, str],
+        count: Optional[int] = None,
+        block: Optional[int] = None,
+        noack: bool = False,
+    ) -> List[List[Any]]:
+        def read() -> List[List[Any]]:
+            result = []
+            for name, last_id in streams.items():
+                stream, group = self._group(name, groupname)
+                if last_id == ">":
+                    entries = self._after(stream, group.last_id, count)
+                    for entry_id, _ in entries:
+                        group.last_id = entry_id
+                        if not noack:
+                            group.pending[entry_id] = [consumername, self._now_ms(), 1]
+                else:
+                    after = _parse_id(last_id)
+                    entries = [
+                        (entry_id, dict(stream.entries.get(entry_id, {})))
+                        for entry_id, info in group.pending.items()
+                        if info[0] == consumername and _parse_id(entry_id) > after
+                    ][: count or None]
+                if entries or last_id != ">":
+                    result.append([name, entries])
+            return result
+
+        return self._wait(block, read)
+
+    def xack(self, name: str, groupname: str, *ids: str) -> int:
+        with self._cond:
+            _, group = self._group(name, groupname)
+            return sum(1 for entry_id in ids if group.pending.pop(entry_id, None) is not None)
+
+    def _claim(self, stream: _Stream, group: _Group, consumername: str, entry_id: str, justid: bool) -> None:
+        info = group.pending[entry_id]
+        info[0] = consumername
+        info[1] = self._now_ms()
+        if not justid:
+            info[2] += 1
+
+    def xclaim(
+        self,
+        name: str,
+        groupname: str,
+        consumername: str,
+        min_idle_time: int,
+        message_ids: List[str],
+        justid: bool = False,
+    ) -> List[Any]:
+        with self._cond:
+            stream, group = self._group(name, groupname)
+            claimed: List[Any] = []
+            for entry_id in message_ids:
+                info = group.pending.get(entry_id)
+                if info is None or self._now_ms() - info[1] < min_idle_time:
+                    continue
+                self._claim(stream, group, consumername, entry_id, justid)
+                claimed.append(entry_id if justid else (entry_id, dict(stream.entries.get(entry_id, {}))))
+            return claimed
+
+    def xautoclaim(
+        self,
+        name: str,
+        groupname: str,
+        consumername: str,
+        min_idle_time: int,
+        start_id: str = "0-0",
+        count: Optional[int] = None,
+        justid: bool = False,
+    ) -> List[Any]:
+        with self._cond:
+            stream, group = self._group(name, groupname)
+            start = _parse_id(start_id)
+            limit = count or 100
+            claimed: List[Any] = []
+            deleted: List[str] = []
+            next_id = "0-0"
+            for entry_id in list(group.pending):
+                if _parse_id(entry_id) < start:
+                    continue
+                if len(claimed) >= limit:
+                    next_id = entry_id
+                    break
+                if self._now_ms() - group.pending[entry_id][1] < min_idle_time:
+                    continue
+                if entry_id not in stream.entries:
+                    group.pending.pop(entry_id)
+                    deleted.append(entry_id)
+                    continue
+                self._claim(stream, group, consumername, entry_id, justid)
+                claimed.append(entry_id if justid else (entry_id, dict(stream.entries[entry_id])))
+            return [next_id, claimed, deleted]
+
+    def xpending_range(
+        self,
+        name: str,
+        groupname: str,
+        min: str,
+        max: str,
+        count: int,
+        consumername: Optional[str] = None,
+        idle: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        with self._cond:
+            _, group = self._group(name, groupname)
+            low, high = _parse_id(min), _parse_id(max)
+            now = self._now_ms()
+            found = []
+            for entry_id, (consumer, delivered_at, times) in group.pending.items():
+                if not low <= _parse_id(entry_id) <= high:
+                    continue
+                if consumername is not None and consumer != consumername:
+                    continue
+                if idle is not None and now - delivered_at < idle:
+                    continue
+                found.append(
+                    {
+                        "message_id": entry_id,
+                        "consumer": consumer,
+                        "time_since_delivered": now - delivered_at,
+                        "times_delivered": times,
+                    }
+                )
+            return found[:count]
+
+    def expire(self, name: str, seconds: float) -> bool:
+        with self._cond:
+            if self._stream(name) is None:
+                return False
+            self._expiry[name] = time.time() + float(seconds)
+            return True
+
+    def exists(self, *names: str) -> int:
+        with self._cond:
+            return sum(1 for name in names if self._stream(name) is not None)
+
+    def delete(self, *names: str) -> int:
+        with self._cond:
+            removed = 0
+            for name in names:
+                self._expiry.pop(name, None)
+                removed += self._streams.pop(name, None) is not None
+            return removed
@@ -0,0 +1,105 @@
+"""Import-time budgets for cold start, measured with `python -X importtime` in fresh interpreters."""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+# Heavy optional dependencies that must stay out of module import and load on first use instead.
+HEAVY_MODULES = ("yaml", "jsonschema", "mem0", "qdrant_client", "numpy", "psycopg", "redis")
+
+DEFAULT_BUDGETS: Dict[str, Dict[str, Any]] = {
+    "team.orchestrator.orchestrator": {
+        "max_ms": 150.0,
+        "forbidden": list(HEAVY_MODULES) + ["fastapi", "team.subgraphs.role_subgraphs", "team.engine.memo"],
+    },
+    # FastAPI and pydantic dominate here; the budget mainly guards against pulling in the orchestrator.
+    "team.api.server": {
+        "max_ms": 1500.0,
+        "forbidden": list(HEAVY_MODULES) + ["team.orchestrator.orchestrator", "team.subgraphs.role_subgraphs"],
+    },
+}
+
+
+def _parse(stderr: str) -> Dict[str, Dict[str, float]]:
+    modules: Dict[str, Dict[str, float]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # the header line
+        modules[parts[2].strip()] = {"self_ms": self_us / 1000.0, "cumulative_ms": cumulative_us / 1000.0}
+    return modules
+
+
+def measure_import(module: str, repo_root: str, runs: int = 3) -> Dict[str, Any]:
+    """Import `module` in `runs` fresh interpreters and keep the fastest one.
+
+    Bytecode goes to `.cache/pycache` so every run after the first measures a warm start, as in a built
+    container image, without writing `__pycache__` directories into the tree.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPYCACHEPREFIX"] = os.path.join(repo_root, ".cache", "pycache")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_root, env.get("PYTHONPATH", "")]))
+    best: Optional[Dict[str, Dict[str, float]]] = None
+    for _ in range(max(1, runs)):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=repo_root,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode != 0:
+            tail = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            raise RuntimeError(f"import {module} failed: {tail[0]}")
+        modules = _parse(completed.stderr)
+        if module not in modules:
+            raise RuntimeError(f"import {module}: no -X importtime record")
+        if best is None or modules[module]["cumulative_ms"] < best[module]["cumulative_ms"]:
+            best = modules
+    assert best is not None
+    slowest = sorted(best.items(), key=lambda item: -item[1]["self_ms"])[:5]
+    return {
+        "module": module,
+        "cumulative_ms": round(best[module]["cumulative_ms"], 3),
+        "imported": sorted(best),
+        "slowest": [{"module": name, "self_ms": round(timing["self_ms"], 3)} for name, timing in slowest],
+    }
+
+
+def check_import_budgets(
+    repo_root: str, budgets: Optional[Dict[str, Dict[str, Any]]] = None, runs: int = 3, scale: float = 1.0
+) -> List[Dict[str, Any]]:
+    """Measure each budgeted module; `scale` multiplies the time budgets for slower hosts."""
+    results: List[Dict[str, Any]] = []
+    for module, budget in (budgets if budgets is not None else DEFAULT_BUDGETS).items():
+        measured = measure_import(module, repo_root, runs=runs)
+        imported = set(measured["imported"])
+        # A forbidden package counts whether it was imported itself or through a submodule.
+        loaded = sorted(
+            name
+            for name in budget.get("forbidden", [])
+            if name in imported or any(item.startswith(name + ".") for item in imported)
+        )
+        max_ms = float(budget.get("max_ms", 0.0)) * scale
+        over = bool(max_ms) and measured["cumulative_ms"] > max_ms
+        results.append(
+            {
+                "module": module,
+                "cumulative_ms": measured["cumulative_ms"],
+                "max_ms": max_ms,
+                "forbidden_loaded": loaded,
+                "slowest": measured["slowest"],
+                "passed": not over and not loaded,
+            }
+        )
+    return results
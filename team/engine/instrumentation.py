@@ -0,0 +1,135 @@
+"""Per-phase timing and opt-in profiling for orchestrator runs."""
+from __future__ import annotations
+
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000.0, 3)
+
+
+class PhaseTimer:
+    """Collects monotonic timings for run-level steps and for each sub-step of every phase."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.run_steps: Dict[str, float] = {}
+        self.phases: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+        self._phase_started = 0.0
+
+    def offset_ms(self) -> float:
+        return _ms(time.perf_counter() - self.started)
+
+    def begin_phase(self, phase: str, role: str) -> None:
+        self._current = {"phase": phase, "role": role, "start_ms": self.offset_ms(), "steps": {}}
+        self._phase_started = time.perf_counter()
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        target = self._current["steps"] if self._current is not None else self.run_steps
+        target[name] = round(target.get(name, 0.0) + elapsed_ms, 3)
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000.0)
+
+    def end_phase(self, **extra: Any) -> Dict[str, Any]:
+        current = self._current
+        if current is None:
+            return {}
+        current["total_ms"] = _ms(time.perf_counter() - self._phase_started)
+        current.update(extra)
+        self.phases.append(current)
+        self._current = None
+        return current
+
+    def summary(self) -> Dict[str, Any]:
+        by_step: Dict[str, float] = {}
+        for entry in self.phases:
+            for name, value in entry["steps"].items():
+                by_step[name] = round(by_step.get(name, 0.0) + value, 3)
+        return {
+            "total_ms": self.offset_ms(),
+            "run_steps": dict(self.run_steps),
+            "by_step": by_step,
+            "phases": list(self.phases),
+        }
+
+
+# tracemalloc is process-wide: profiled runs take turns so one run's stop cannot end another's tracing.
+_PROFILE_LOCK = threading.Lock()
+
+
+class RunProfiler:
+    """cProfile capture for a whole run plus tracemalloc peak memory per phase.
+
+    Profiled runs in one process are serialized: `start` waits for any other profiled run to `stop`.
+    """
+
+    def __init__(self, output_dir: str, top_n: int = 25) -> None:
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self._profile: Any = None
+        self._started_tracemalloc = False
+        self._locked = False
+
+    def start(self) -> None:
+        import cProfile
+        import tracemalloc
+
+        _PROFILE_LOCK.acquire()
+        self._locked = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def begin_phase(self) -> None:
+        import tracemalloc
+
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def phase_peak_kb(self) -> float:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return 0.0
+        return round(tracemalloc.get_traced_memory()[1] / 1024.0, 1)
+
+    def stop(self, label: str) -> Dict[str, Any]:
+        """Detach cProfile, end tracing started by `start` and write the profile; safe after a failed `start`."""
+        import pstats
+        import tracemalloc
+
+        profile, self._profile = self._profile, None
+        try:
+            if profile is not None:
+                profile.disable()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        finally:
+            if self._locked:
+                self._locked = False
+                _PROFILE_LOCK.release()
+        if profile is None:
+            return {}
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{label}_{int(time.time() * 1000)}.prof")
+        profile.dump_stats(path)
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        lines = [line.rstrip() for line in stream.getvalue().splitlines() if line.strip()]
+        return {"path": path, "top": lines}
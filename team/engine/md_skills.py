@@ -4,10 +4,13 @@ from __future__ import annotations
 import os
 from typing import Any, Dict, List, Tuple
 
-try:
-    import yaml  # type: ignore
-except Exception as exc:
-    raise RuntimeError("PyYAML is required to parse markdown skill frontmatter.") from exc
+
+def _safe_load(stream: Any) -> Any:
+    try:
+        import yaml  # type: ignore
+    except Exception as exc:
+        raise RuntimeError("PyYAML is required to parse markdown skill frontmatter.") from exc
+    return yaml.safe_load(stream)
 
 
 def _as_list(value: Any) -> List[str]:
@@ -26,7 +29,7 @@ def _parse_frontmatter(text: str) -> Tuple[Dict[str, Any], str]:
         return {}, text
     raw = text[4:end]
     body = text[end + 5 :]
-    parsed = yaml.safe_load(raw)
+    parsed = _safe_load(raw)
     if not isinstance(parsed, dict):
         return {}, body
     return parsed, body
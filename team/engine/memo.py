@@ -0,0 +1,93 @@
+"""Phase-level memoization keyed on input artifact content and the phase's prompt context."""
+from __future__ import annotations
+
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .config import ROLE_INPUT_ARTIFACTS
+from .meta_eval_log import file_lock
+from .state_broker import content_hash
+
+MEMO_FORMAT_VERSION = 1
+
+
+class PhaseMemo:
+    """Maps a phase key to the gate outputs and artifact versions it produced.
+
+    With `path` set, entries persist across runs (bounded to `max_entries`, oldest dropped first);
+    otherwise the memo lives only as long as the orchestrator run that owns it.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1000) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self.entries.update(self._load())
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                doc = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(doc, dict) or doc.get("version") != MEMO_FORMAT_VERSION:
+            return {}
+        entries = doc.get("entries", {})
+        return entries if isinstance(entries, dict) else {}
+
+    def phase_key(self, phase: str, role: str, phase_request: Dict[str, Any], broker: Any) -> str:
+        inputs = {}
+        for artifact_type in ROLE_INPUT_ARTIFACTS.get(role, []):
+            inputs[artifact_type] = broker.content_hash(artifact_type) if broker.latest_version(artifact_type) else ""
+        return content_hash({"phase": phase, "role": role, "request": phase_request, "inputs": inputs})
+
+    def lookup(self, key: str, broker: Any) -> Optional[Dict[str, Any]]:
+        """Return the cached entry if every artifact it produced is still the latest, unchanged version."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            for artifact_type, produced in entry["artifacts"].items():
+                if broker.latest_version(artifact_type) != produced["version"]:
+                    entry = None
+                    break
+                if broker.content_hash(artifact_type, produced["version"]) != produced["hash"]:
+                    entry = None
+                    break
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, gate_outputs: Dict[str, Any], artifacts: Dict[str, int], broker: Any) -> None:
+        self.entries[key] = {
+            "gate_outputs": gate_outputs,
+            "artifacts": {
+                artifact_type: {"version": version, "hash": broker.content_hash(artifact_type, version)}
+                for artifact_type, version in artifacts.items()
+            },
+        }
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with file_lock(f"{self.path}.lock"):
+            merged: "OrderedDict[str, Dict[str, Any]]" = OrderedDict(self._load())
+            merged.update(self.entries)
+            while len(merged) > self.max_entries:
+                merged.popitem(last=False)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump({"version": MEMO_FORMAT_VERSION, "entries": merged}, handle)
+            os.replace(tmp_path, self.path)
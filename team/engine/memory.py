@@ -1,8 +1,13 @@
-"""Adaptive memory adapter interfaces and implementations."""
+"""Adaptive memory adapter interfaces (sync and asyncio) and implementations."""
 from __future__ import annotations
 
+import threading
 import time
-from typing import Any, Dict, List, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Protocol
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future
 
 
 class MemoryAdapter(Protocol):
@@ -13,6 +18,18 @@ class MemoryAdapter(Protocol):
         ...
 
 
+class AsyncMemoryAdapter(Protocol):
+    async def afetch(
+        self, *, role: str, phase: str, playbook: str, runtime_target: str, query: str, top_k: int
+    ) -> List[str]:
+        ...
+
+    async def arecord(
+        self, *, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]
+    ) -> None:
+        ...
+
+
 class NoopMemoryAdapter:
     def fetch(self, *, role: str, phase: str, playbook: str, runtime_target: str, query: str, top_k: int) -> List[str]:
         return []
@@ -20,12 +37,31 @@ class NoopMemoryAdapter:
     def record(self, *, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]) -> None:
         return None
 
+    async def afetch(
+        self, *, role: str, phase: str, playbook: str, runtime_target: str, query: str, top_k: int
+    ) -> List[str]:
+        return []
+
+    async def arecord(
+        self, *, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]
+    ) -> None:
+        return None
+
 
 class InMemoryAdapter:
     def __init__(self) -> None:
         self.entries: List[Dict[str, Any]] = []
 
     def fetch(self, *, role: str, phase: str, playbook: str, runtime_target: str, query: str, top_k: int) -> List[str]:
+        return self._select(role, runtime_target, top_k)
+
+    async def afetch(
+        self, *, role: str, phase: str, playbook: str, runtime_target: str, query: str, top_k: int
+    ) -> List[str]:
+        # Pure in-process work: no thread hop, and nothing to await.
+        return self._select(role, runtime_target, top_k)
+
+    def _select(self, role: str, runtime_target: str, top_k: int) -> List[str]:
         candidates: List[str] = []
         for entry in reversed(self.entries):
             if entry.get("role") != role:
@@ -40,6 +76,14 @@ class InMemoryAdapter:
         return candidates
 
     def record(self, *, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]) -> None:
+        self._append(role, phase, playbook, runtime_target, outcome)
+
+    async def arecord(
+        self, *, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]
+    ) -> None:
+        self._append(role, phase, playbook, runtime_target, outcome)
+
+    def _append(self, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]) -> None:
         summary = str(outcome.get("summary", "")).strip()
         if not summary:
             return
@@ -58,49 +102,107 @@ class InMemoryAdapter:
 
 
 class Mem0Adapter:
+    """Mem0-backed memory; the client (and mem0's dependency tree) is created on the first fetch or record.
+
+    `afetch`/`arecord` use mem0's `AsyncMemory`, a separate client created on first async use; mem0 releases
+    without it fall back to the sync client on a helper thread.
+    """
+
     def __init__(self, *, user_id: str, agent_id: str, config: Dict[str, Any] | None = None) -> None:
         self.user_id = user_id
         self.agent_id = agent_id
+        self.config = config
         self._memory: Any = None
         self._enabled = False
+        self._connected = False
+        self._amemory: Any = None
+        self._aconnected = False
+        self._aconnect_lock: Optional["asyncio.Lock"] = None
+        self.error_counts: Dict[str, int] = {"fetch": 0, "record": 0}
+
+    def _connect(self) -> bool:
+        if self._connected:
+            return self._enabled
+        self._connected = True
         try:
             from mem0 import Memory  # type: ignore
         except Exception:
-            return
+            return False
         try:
-            if config:
-                self._memory = Memory.from_config(config)
+            if self.config:
+                self._memory = Memory.from_config(self.config)
             else:
                 self._memory = Memory()
             self._enabled = True
         except Exception:
             self._enabled = False
+        return self._enabled
+
+    async def _aconnect(self) -> bool:
+        if self._aconnected:
+            return self._amemory is not None
+        if self._aconnect_lock is None:
+            import asyncio
+
+            self._aconnect_lock = asyncio.Lock()
+        # Calls that arrive while the client is being created wait for it instead of falling back to sync.
+        async with self._aconnect_lock:
+            if not self._aconnected:
+                self._amemory = await self._create_async_client()
+                self._aconnected = True
+        return self._amemory is not None
+
+    async def _create_async_client(self) -> Any:
+        try:
+            from mem0 import AsyncMemory  # type: ignore
+        except Exception:
+            return None
+        try:
+            created = AsyncMemory.from_config(self.config) if self.config else AsyncMemory()
+            if hasattr(created, "__await__"):
+                created = await created
+            return created
+        except Exception:
+            return None
 
     def fetch(self, *, role: str, phase: str, playbook: str, runtime_target: str, query: str, top_k: int) -> List[str]:
-        if not self._enabled or self._memory is None:
+        if not self._connect() or self._memory is None:
             return []
-        text = f"{query}\nrole={role}\nphase={phase}\nplaybook={playbook}\nruntime={runtime_target}"
         try:
-            results = self._memory.search(text, user_id=self.user_id, limit=top_k)
+            results = self._memory.search(
+                _search_text(query, role, phase, playbook, runtime_target), user_id=self.user_id, limit=top_k
+            )
         except Exception:
+            self.error_counts["fetch"] += 1
             return []
-        snippets: List[str] = []
-        if isinstance(results, list):
-            for item in results:
-                if not isinstance(item, dict):
-                    continue
-                memory_text = item.get("memory") or item.get("text") or item.get("summary")
-                if isinstance(memory_text, str) and memory_text.strip():
-                    snippets.append(memory_text.strip())
-        return snippets[:top_k]
+        return _snippets(results, top_k)
 
-    def record(self, *, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]) -> None:
-        if not self._enabled or self._memory is None:
-            return
-        summary = str(outcome.get("summary", "")).strip()
-        if not summary:
-            return
-        meta = {
+    async def afetch(
+        self, *, role: str, phase: str, playbook: str, runtime_target: str, query: str, top_k: int
+    ) -> List[str]:
+        if not await self._aconnect():
+            return await in_thread(
+                self.fetch,
+                role=role,
+                phase=phase,
+                playbook=playbook,
+                runtime_target=runtime_target,
+                query=query,
+                top_k=top_k,
+            )
+        try:
+            results = await self._amemory.search(
+                _search_text(query, role, phase, playbook, runtime_target), user_id=self.user_id, limit=top_k
+            )
+        except Exception:
+            self.error_counts["fetch"] += 1
+            return []
+        return _snippets(results, top_k)
+
+    def _meta(
+        self, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {
             "agent_id": self.agent_id,
             "role": role,
             "phase": phase,
@@ -109,10 +211,139 @@ class Mem0Adapter:
             "pass": outcome.get("pass"),
             "score": outcome.get("score"),
         }
+
+    def record(self, *, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]) -> None:
+        if not self._connect() or self._memory is None:
+            return
+        summary = str(outcome.get("summary", "")).strip()
+        if not summary:
+            return
+        meta = self._meta(role, phase, playbook, runtime_target, outcome)
         try:
             self._memory.add(summary, user_id=self.user_id, metadata=meta)
         except Exception:
+            self.error_counts["record"] += 1
+            return
+
+    async def arecord(
+        self, *, role: str, phase: str, playbook: str, runtime_target: str, outcome: Dict[str, Any]
+    ) -> None:
+        if not await self._aconnect():
+            await in_thread(
+                self.record, role=role, phase=phase, playbook=playbook, runtime_target=runtime_target, outcome=outcome
+            )
+            return
+        summary = str(outcome.get("summary", "")).strip()
+        if not summary:
             return
+        meta = self._meta(role, phase, playbook, runtime_target, outcome)
+        try:
+            await self._amemory.add(summary, user_id=self.user_id, metadata=meta)
+        except Exception:
+            self.error_counts["record"] += 1
+
+
+def _search_text(query: str, role: str, phase: str, playbook: str, runtime_target: str) -> str:
+    return f"{query}\nrole={role}\nphase={phase}\nplaybook={playbook}\nruntime={runtime_target}"
+
+
+def _snippets(results: Any, top_k: int) -> List[str]:
+    snippets: List[str] = []
+    if isinstance(results, list):
+        for item in results:
+            if not isinstance(item, dict):
+                continue
+            memory_text = item.get("memory") or item.get("text") or item.get("summary")
+            if isinstance(memory_text, str) and memory_text.strip():
+                snippets.append(memory_text.strip())
+    return snippets[:top_k]
+
+
+async def in_thread(fn: Callable[..., Any], **kwargs: Any) -> Any:
+    """Await a blocking call made on a daemon thread, so a hung backend never holds up interpreter exit."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(value: Any, error: Optional[BaseException]) -> None:
+        if future.done():
+            return  # the awaiting task was cancelled
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    def target() -> None:
+        try:
+            value, error = fn(**kwargs), None
+        except BaseException as exc:  # handed to the awaiting task
+            value, error = None, exc
+        loop.call_soon_threadsafe(settle, value, error)
+
+    threading.Thread(target=target, name="memory-call", daemon=True).start()
+    return await future
+
+
+class AsyncMemoryShim:
+    """`afetch`/`arecord` for an adapter that only implements the sync protocol."""
+
+    def __init__(self, adapter: MemoryAdapter) -> None:
+        self.adapter = adapter
+
+    async def afetch(self, **kwargs: Any) -> List[str]:
+        return await in_thread(self.adapter.fetch, **kwargs)
+
+    async def arecord(self, **kwargs: Any) -> None:
+        await in_thread(self.adapter.record, **kwargs)
+
+
+class SyncMemoryShim:
+    """`fetch`/`record` for an async-only adapter, for synchronous callers such as the CLI.
+
+    Calls run on the shared memory loop, so they also work from a thread that is itself running an event loop.
+    """
+
+    def __init__(self, adapter: AsyncMemoryAdapter) -> None:
+        self.adapter = adapter
+
+    def fetch(self, **kwargs: Any) -> List[str]:
+        return submit_memory_call(self.adapter, "fetch", **kwargs).result()
+
+    def record(self, **kwargs: Any) -> None:
+        submit_memory_call(self.adapter, "record", **kwargs).result()
+
+
+def as_async(adapter: Any) -> AsyncMemoryAdapter:
+    return adapter if hasattr(adapter, "afetch") and hasattr(adapter, "arecord") else AsyncMemoryShim(adapter)
+
+
+def as_sync(adapter: Any) -> MemoryAdapter:
+    return adapter if hasattr(adapter, "fetch") and hasattr(adapter, "record") else SyncMemoryShim(adapter)
+
+
+_LOOP: Optional["asyncio.AbstractEventLoop"] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def memory_loop() -> "asyncio.AbstractEventLoop":
+    """Process-wide event loop on a daemon thread that runs async memory calls for synchronous callers."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            import asyncio
+
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, name="memory-loop", daemon=True).start()
+    return _LOOP
+
+
+def submit_memory_call(adapter: Any, method: str, **kwargs: Any) -> "Future[Any]":
+    """Start `fetch` or `record` on the memory loop without waiting; the returned future can be cancelled."""
+    import asyncio
+
+    call = getattr(as_async(adapter), f"a{method}")
+    return asyncio.run_coroutine_threadsafe(call(**kwargs), memory_loop())
 
 
 def build_memory_adapter(profile: Dict[str, Any]) -> MemoryAdapter:
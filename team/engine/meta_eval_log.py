@@ -0,0 +1,500 @@
+"""Buffered, rotating meta-eval log with a segment index for time/playbook/status queries."""
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - non-POSIX platforms fall back to O_APPEND only
+    fcntl = None  # type: ignore
+
+INDEX_FORMAT_VERSION = 1
+
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "buffer_entries": 32,
+    "flush_interval_s": 2.0,
+    "max_bytes": 16 * 1024 * 1024,
+    "max_age_s": 24 * 3600,
+}
+
+
+_RELATIVE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Accept epoch seconds, an ISO-8601 timestamp, or a relative age such as `30m`, `24h`, `7d`."""
+    if value is None or str(value).strip() == "":
+        return None
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    unit = _RELATIVE_UNITS.get(text[-1:].lower())
+    if unit is not None:
+        try:
+            amount = float(text[:-1])
+        except ValueError:
+            amount = None
+        if amount is not None:
+            return (time.time() if now is None else now) - amount * unit
+    from datetime import datetime
+
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError as exc:
+        raise ValueError(f"Unrecognised time value: {value}") from exc
+
+
+def start_flush_timer(interval_s: float, flush: Callable[[], Any]) -> threading.Timer:
+    """Daemon timer that flushes a started buffer after `interval_s`, so idle processes do not sit on entries."""
+    timer = threading.Timer(interval_s, flush)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+@contextmanager
+def file_lock(lock_path: str) -> Iterator[None]:
+    """Exclusive advisory lock shared by every process using `lock_path` (no-op without fcntl)."""
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, "a", encoding="utf-8") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _empty_segment() -> Dict[str, Any]:
+    return {"start_ts": None, "end_ts": None, "count": 0, "groups": {}}
+
+
+def _bump(counts: Dict[str, int], key: Any, amount: int = 1) -> None:
+    name = str(key)
+    counts[name] = counts.get(name, 0) + amount
+
+
+def _group_key(playbook: str, status: str) -> str:
+    return f"{playbook}|{status}"
+
+
+def _entry_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "ts": float(entry.get("ts", 0) or 0),
+        "playbook": str(entry.get("playbook", "unknown")),
+        "status": str(entry.get("status", "unknown")),
+    }
+
+
+def _add_to_segment(segment: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    fields = _entry_fields(entry)
+    ts = fields["ts"]
+    segment["start_ts"] = ts if segment["start_ts"] is None else min(segment["start_ts"], ts)
+    segment["end_ts"] = ts if segment["end_ts"] is None else max(segment["end_ts"], ts)
+    segment["count"] += 1
+    group = segment["groups"].setdefault(
+        _group_key(fields["playbook"], fields["status"]),
+        {
+            "playbook": fields["playbook"],
+            "status": fields["status"],
+            "count": 0,
+            "steps_used": {},
+            "loop_counts": {},
+            "artifacts_written": {},
+        },
+    )
+    _accumulate(group, entry)
+
+
+def _accumulate(group: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    group["count"] += 1
+    _bump(group["steps_used"], int(entry.get("steps_used", 0) or 0))
+    loop_counts = entry.get("loop_counts", {})
+    if isinstance(loop_counts, dict):
+        for phase, iterations in loop_counts.items():
+            _bump(group["loop_counts"].setdefault(str(phase), {}), int(iterations or 0))
+    artifacts = entry.get("artifacts_written", [])
+    if isinstance(artifacts, list):
+        for name in artifacts:
+            _bump(group["artifacts_written"], name)
+
+
+def _merge_group(into: Dict[str, Any], group: Dict[str, Any]) -> None:
+    into["count"] += group["count"]
+    for value, count in group["steps_used"].items():
+        _bump(into["steps_used"], value, count)
+    for phase, dist in group["loop_counts"].items():
+        target = into["loop_counts"].setdefault(phase, {})
+        for value, count in dist.items():
+            _bump(target, value, count)
+    for name, count in group["artifacts_written"].items():
+        _bump(into["artifacts_written"], name, count)
+
+
+def _percentiles(value_counts: Dict[str, int], points: List[float]) -> Dict[str, float]:
+    items = sorted((float(value), count) for value, count in value_counts.items())
+    total = sum(count for _, count in items)
+    if not total:
+        return {}
+    result: Dict[str, float] = {}
+    for point in points:
+        rank = max(1, int(round(point / 100.0 * total + 0.5 - 1e-9)))
+        seen = 0
+        for value, count in items:
+            seen += count
+            if seen >= rank:
+                result[f"p{int(point)}"] = value
+                break
+    result["mean"] = round(sum(value * count for value, count in items) / total, 3)
+    result["max"] = items[-1][0]
+    return result
+
+
+class MetaEvalLog:
+    """Append-only JSONL log that batches writes, rotates into gzip segments and keeps a summary index.
+
+    Appends are buffered in-process and written with a single O_APPEND write under an advisory
+    lock, so concurrent processes never interleave partial lines or race a rotation. A buffer is
+    written once it holds `buffer_entries` entries or, via a timer, `flush_interval_s` after it started.
+    """
+
+    def __init__(self, path: str, options: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.directory = os.path.dirname(path) or "."
+        self.base = os.path.basename(path)
+        self.index_path = f"{os.path.splitext(path)[0]}.index.json"
+        self.lock_path = f"{path}.lock"
+        self.options = dict(DEFAULT_OPTIONS)
+        self.options.update(options or {})
+        self._buffer: List[Tuple[Dict[str, Any], str]] = []
+        self._buffer_since = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def _file_lock(self) -> Any:
+        return file_lock(self.lock_path)
+
+    def append(self, entry: Dict[str, Any]) -> str:
+        entry = dict(entry)
+        entry.setdefault("ts", round(time.time(), 3))
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            if not self._buffer:
+                self._buffer_since = time.monotonic()
+            self._buffer.append((entry, line))
+            due = len(self._buffer) >= int(self.options["buffer_entries"]) or (
+                time.monotonic() - self._buffer_since >= float(self.options["flush_interval_s"])
+            )
+            if not due and self._flush_timer is None:
+                self._flush_timer = start_flush_timer(float(self.options["flush_interval_s"]), self._timed_flush)
+        if due:
+            self.flush()
+        return line
+
+    def _timed_flush(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+        try:
+            self.flush()
+        except OSError:
+            pass  # like a flush from `append`, a failed write drops that batch
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+        if not pending:
+            return 0
+        data = "".join(line for _, line in pending).encode("utf-8")
+        with self._file_lock():
+            index = self._load_index()
+            if self._should_rotate(index, len(data)):
+                self._rotate(index)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            index["active"].setdefault("opened_at", round(time.time(), 3))
+            for entry, _ in pending:
+                _add_to_segment(index["active"], entry)
+            self._save_index(index)
+        return len(pending)
+
+    def rotate(self) -> Optional[str]:
+        self.flush()
+        with self._file_lock():
+            index = self._load_index()
+            rotated = self._rotate(index)
+            self._save_index(index)
+        return rotated
+
+    def read_from(self, cursor: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return entries appended since `cursor` plus the cursor to resume from next time.
+
+        The cursor records which rotated segments were consumed and a byte offset into the active
+        file, so incremental consumers (e.g. analytics compaction) never re-read old history.
+        """
+        self.flush()
+        cursor = dict(cursor or {})
+        done = set(cursor.get("segments", []))
+        has_active = "active_opened_at" in cursor
+        offset = int(cursor.get("active_offset", 0))
+        entries: List[Dict[str, Any]] = []
+        with self._file_lock():
+            index = self._load_index()
+            active = index["active"]
+            if "opened_at" not in active:
+                active["opened_at"] = round(time.time(), 3)
+                self._save_index(index)
+            for segment in index["segments"]:
+                if segment["file"] in done:
+                    continue
+                skip = offset if has_active and segment.get("opened_at") == cursor["active_opened_at"] else 0
+                entries.extend(self._read_file(os.path.join(self.directory, segment["file"]), skip))
+                done.add(segment["file"])
+            skip = offset if has_active and active["opened_at"] == cursor["active_opened_at"] else 0
+            end = skip
+            if os.path.isfile(self.path):
+                with open(self.path, "rb") as handle:
+                    handle.seek(skip)
+                    data = handle.read()
+                complete = data.rfind(b"\n") + 1
+                end = skip + complete
+                for raw in data[:complete].splitlines():
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict):
+                        entries.append(entry)
+        return entries, {"segments": sorted(done), "active_opened_at": active["opened_at"], "active_offset": end}
+
+    def _load_index(self) -> Dict[str, Any]:
+        if os.path.isfile(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as handle:
+                    index = json.load(handle)
+                if isinstance(index, dict) and index.get("version") == INDEX_FORMAT_VERSION:
+                    return index
+            except (OSError, ValueError):
+                pass
+        return self._rebuild_index()
+
+    def _rebuild_index(self) -> Dict[str, Any]:
+        """Recover the index from segments on disk (also adopts logs written before indexing existed)."""
+        index: Dict[str, Any] = {"version": INDEX_FORMAT_VERSION, "active": _empty_segment(), "segments": []}
+        prefix = f"{os.path.splitext(self.base)[0]}."
+        for name in sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []:
+            if name.startswith(prefix) and name.endswith(".jsonl.gz"):
+                segment = _empty_segment()
+                for entry in self._read_file(os.path.join(self.directory, name)):
+                    _add_to_segment(segment, entry)
+                segment["file"] = name
+                index["segments"].append(segment)
+        for entry in self._read_file(self.path):
+            _add_to_segment(index["active"], entry)
+        return index
+
+    def _save_index(self, index: Dict[str, Any]) -> None:
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(index, handle)
+        os.replace(tmp_path, self.index_path)
+
+    def _should_rotate(self, index: Dict[str, Any], incoming: int) -> bool:
+        active = index["active"]
+        if not active["count"] or not os.path.isfile(self.path):
+            return False
+        if os.path.getsize(self.path) + incoming > int(self.options["max_bytes"]):
+            return True
+        opened = active.get("opened_at") or time.time()
+        return time.time() - float(opened) >= float(self.options["max_age_s"])
+
+    def _rotate(self, index: Dict[str, Any]) -> Optional[str]:
+        active = index["active"]
+        if not active["count"] or not os.path.isfile(self.path):
+            return None
+        stem = os.path.splitext(self.base)[0]
+        name = f"{stem}.{int(active['start_ts'] or 0)}-{int(active['end_ts'] or 0)}.jsonl.gz"
+        suffix = 1
+        while os.path.exists(os.path.join(self.directory, name)):
+            name = f"{stem}.{int(active['start_ts'] or 0)}-{int(active['end_ts'] or 0)}-{suffix}.jsonl.gz"
+            suffix += 1
+        target = os.path.join(self.directory, name)
+        with open(self.path, "rb") as source, gzip.open(target, "wb") as sink:
+            shutil.copyfileobj(source, sink)
+        os.remove(self.path)
+        active["file"] = name
+        index["segments"].append(active)
+        index["active"] = _empty_segment()
+        return target
+
+    @staticmethod
+    def _read_file(path: str, skip: int = 0) -> Iterator[Dict[str, Any]]:
+        if not os.path.isfile(path):
+            return
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as handle:
+            if skip:
+                handle.seek(skip)
+            for raw in handle:
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+    def _candidates(
+        self, index: Dict[str, Any], since: Optional[float], until: Optional[float], playbook: Optional[str], status: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        segments = list(index["segments"])
+        active = dict(index["active"])
+        active["file"] = self.base
+        segments.append(active)
+        selected = []
+        for segment in segments:
+            if not segment["count"]:
+                continue
+            if since is not None and (segment["end_ts"] or 0) < since:
+                continue
+            if until is not None and (segment["start_ts"] or 0) > until:
+                continue
+            groups = segment["groups"].values()
+            if playbook is not None and not any(group["playbook"] == playbook for group in groups):
+                continue
+            if status is not None and not any(group["status"] == status for group in groups):
+                continue
+            selected.append(segment)
+        return selected
+
+    @staticmethod
+    def _matches(
+        entry: Dict[str, Any], since: Optional[float], until: Optional[float], playbook: Optional[str], status: Optional[str]
+    ) -> bool:
+        fields = _entry_fields(entry)
+        if since is not None and fields["ts"] < since:
+            return False
+        if until is not None and fields["ts"] > until:
+            return False
+        if playbook is not None and fields["playbook"] != playbook:
+            return False
+        if status is not None and fields["status"] != status:
+            return False
+        return True
+
+    def entries(
+        self,
+        *,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        playbook: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield raw entries, reading only segments whose index entry can match the filters."""
+        self.flush()
+        with self._file_lock():
+            index = self._load_index()
+        for segment in self._candidates(index, since, until, playbook, status):
+            for entry in self._read_file(os.path.join(self.directory, segment["file"])):
+                if self._matches(entry, since, until, playbook, status):
+                    yield entry
+
+    def aggregate(
+        self,
+        *,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        playbook: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Aggregate steps_used percentiles, loop-count distributions and artifact counts.
+
+        Segments fully inside the time range are answered from the index without being read.
+        """
+        self.flush()
+        with self._file_lock():
+            index = self._load_index()
+        total: Dict[str, Any] = {"count": 0, "steps_used": {}, "loop_counts": {}, "artifacts_written": {}}
+        by_status: Dict[str, int] = {}
+        by_playbook: Dict[str, int] = {}
+        from_index = 0
+        scanned = 0
+        for segment in self._candidates(index, since, until, playbook, status):
+            covered = (since is None or (segment["start_ts"] or 0) >= since) and (
+                until is None or (segment["end_ts"] or 0) <= until
+            )
+            if covered:
+                from_index += 1
+                for group in segment["groups"].values():
+                    if playbook is not None and group["playbook"] != playbook:
+                        continue
+                    if status is not None and group["status"] != status:
+                        continue
+                    _merge_group(total, group)
+                    _bump(by_status, group["status"], group["count"])
+                    _bump(by_playbook, group["playbook"], group["count"])
+                continue
+            scanned += 1
+            for entry in self._read_file(os.path.join(self.directory, segment["file"])):
+                if not self._matches(entry, since, until, playbook, status):
+                    continue
+                _accumulate(total, entry)
+                fields = _entry_fields(entry)
+                _bump(by_status, fields["status"])
+                _bump(by_playbook, fields["playbook"])
+        loop_distribution = {
+            phase: dict(sorted(dist.items(), key=lambda item: int(item[0])))
+            for phase, dist in sorted(total["loop_counts"].items())
+        }
+        return {
+            "runs": total["count"],
+            "by_status": by_status,
+            "by_playbook": by_playbook,
+            "steps_used": _percentiles(total["steps_used"], [50, 90, 99]),
+            "loop_counts": loop_distribution,
+            "artifacts_written": dict(sorted(total["artifacts_written"].items())),
+            "segments_from_index": from_index,
+            "segments_scanned": scanned,
+        }
+
+
+_LOGS: Dict[str, MetaEvalLog] = {}
+_LOGS_LOCK = threading.Lock()
+
+
+def get_meta_eval_log(path: str, options: Optional[Dict[str, Any]] = None) -> MetaEvalLog:
+    """Return the process-wide log for `path` so buffered entries survive per-request brokers."""
+    key = os.path.abspath(path)
+    with _LOGS_LOCK:
+        log = _LOGS.get(key)
+        if log is None:
+            log = MetaEvalLog(key, options)
+            _LOGS[key] = log
+        elif options:
+            log.options.update(options)
+    return log
+
+
+@atexit.register
+def _flush_all() -> None:
+    for log in list(_LOGS.values()):
+        try:
+            log.flush()
+        except OSError:
+            continue
@@ -0,0 +1,280 @@
+"""Low-overhead Prometheus-style metrics with per-thread shards and multi-process aggregation."""
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+LabelKey = Tuple[str, ...]
+
+
+class _Metric:
+    """Values live in one dict per thread; only the owning thread writes, so updates take no lock."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[LabelKey, Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict[LabelKey, Any]:
+        shard = getattr(self._local, "values", None)
+        if shard is None:
+            shard = {}
+            self._local.values = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _merge(self, into: Dict[LabelKey, Any], key: LabelKey, value: Any) -> None:
+        into[key] = into.get(key, 0.0) + value
+
+    def samples(self) -> Dict[LabelKey, Any]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged: Dict[LabelKey, Any] = {}
+        for shard in shards:
+            for key, value in shard.copy().items():
+                self._merge(merged, key, value)
+        return merged
+
+    def describe(self) -> Dict[str, Any]:
+        return {"type": self.kind, "help": self.help, "labelnames": list(self.labelnames)}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Sum-of-shards gauge: supports inc/dec from any thread, which covers in-flight and queue counts."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        row = shard.get(key)
+        if row is None:
+            # Per-bucket (non-cumulative) counts, then +Inf, sum, count.
+            row = [0.0] * (len(self.buckets) + 3)
+            shard[key] = row
+        row[bisect.bisect_left(self.buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def _merge(self, into: Dict[LabelKey, Any], key: LabelKey, value: Any) -> None:
+        row = into.get(key)
+        if row is None:
+            into[key] = list(value)
+            return
+        for idx, item in enumerate(value):
+            row[idx] += item
+
+    def describe(self) -> Dict[str, Any]:
+        data = super().describe()
+        data["buckets"] = list(self.buckets)
+        return data
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def snapshot(self) -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {}
+        with self._lock:
+            registered = list(self._metrics.values())
+        for metric in registered:
+            entry = metric.describe()
+            entry["samples"] = [[list(key), value] for key, value in metric.samples().items()]
+            metrics[metric.name] = entry
+        return {"pid": os.getpid(), "metrics": metrics}
+
+    def write_snapshot(self, directory: str) -> str:
+        """Persist this process's values so sibling workers can serve an aggregated view."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"metrics_{os.getpid()}.json")
+        # Runs on concurrent request threads snapshot at once; each writes its own temp file.
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.snapshot(), handle)
+        os.replace(tmp_path, path)
+        return path
+
+    def collect(self, directory: Optional[str] = None) -> Dict[str, Any]:
+        """Merge live values with snapshots written by other worker processes in `directory`."""
+        merged = self.snapshot()["metrics"]
+        if not directory or not os.path.isdir(directory):
+            return merged
+        own = f"metrics_{os.getpid()}.json"
+        for name in sorted(os.listdir(directory)):
+            if not name.startswith("metrics_") or not name.endswith(".json") or name == own:
+                continue
+            try:
+                with open(os.path.join(directory, name), "r", encoding="utf-8") as handle:
+                    doc = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            alive = _pid_alive(int(doc.get("pid", 0)))
+            for metric_name, entry in doc.get("metrics", {}).items():
+                if entry.get("type") == "gauge" and not alive:
+                    continue
+                _merge_entry(merged, metric_name, entry)
+        return merged
+
+    def render(self, directory: Optional[str] = None) -> str:
+        return render_text(self.collect(directory))
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _merge_entry(merged: Dict[str, Any], name: str, entry: Dict[str, Any]) -> None:
+    target = merged.get(name)
+    if target is None:
+        merged[name] = {key: value for key, value in entry.items()}
+        merged[name]["samples"] = [[list(labels), value] for labels, value in entry.get("samples", [])]
+        return
+    index = {tuple(labels): sample for labels, sample in ((s[0], s) for s in target["samples"])}
+    for labels, value in entry.get("samples", []):
+        sample = index.get(tuple(labels))
+        if sample is None:
+            target["samples"].append([list(labels), value])
+        elif isinstance(value, list):
+            sample[1] = [a + b for a, b in zip(sample[1], value)]
+        else:
+            sample[1] = sample[1] + value
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_text(metrics: Dict[str, Any]) -> str:
+    """Prometheus text exposition format 0.0.4."""
+    lines: List[str] = []
+    for name in sorted(metrics.keys()):
+        entry = metrics[name]
+        kind = entry.get("type", "untyped")
+        labelnames = entry.get("labelnames", [])
+        lines.append(f"# HELP {name} {entry.get('help', '')}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(entry.get("samples", []), key=lambda item: item[0]):
+            if kind == "histogram":
+                bounds = list(entry.get("buckets", [])) + [math.inf]
+                cumulative = 0.0
+                for bound, count in zip(bounds, value[: len(bounds)]):
+                    cumulative += count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{name}_bucket{_labels(labelnames, labels, le)} {_number(cumulative)}")
+                lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(value[-2])}")
+                lines.append(f"{name}_count{_labels(labelnames, labels)} {_number(value[-1])}")
+            else:
+                lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,285 @@
+"""Playbook plan compiler: immutable execution plans, an on-disk plan cache and worst-case step bounds."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .classify_failure import DEFAULT_TAXONOMY_PATH, failure_routes
+from .config import ROUTE_PHASES
+from .schema_validation import SchemaRegistry
+
+PLAN_FORMAT_VERSION = 1
+CACHE_DIRNAME = ".cache"
+
+_PLANS: Dict[str, "ExecutionPlan"] = {}
+_PLANS_LOCK = threading.Lock()
+_CODE_DIGEST: Optional[str] = None
+
+
+def phase_role(phase: str) -> str:
+    if phase.startswith("eval"):
+        return "eval"
+    if phase.startswith("ops"):
+        return "ops"
+    if phase.startswith("optimizer"):
+        return "optimizer"
+    if phase.startswith("compile"):
+        return "compiler"
+    if phase in ("architect", "prompt_policy", "tooling"):
+        return phase
+    return "orchestrator"
+
+
+def gate_trigger(gate_name: str) -> str:
+    if gate_name == "quality_gate":
+        return "quality_gate_fail"
+    if gate_name == "production_gate":
+        return "production_gate_fail"
+    if gate_name == "compilation_gate":
+        return "compilation_fail"
+    return "gate_fail"
+
+
+def route_to_phase(route: str) -> str:
+    return ROUTE_PHASES.get(route, "architect")
+
+
+@dataclass(frozen=True)
+class LoopRule:
+    from_phase: str
+    to_phase: str
+    max_iterations: int
+    trigger_condition: str
+
+
+@dataclass(frozen=True)
+class LoopBound:
+    """Worst-case expansion of one gated phase.
+
+    A failing iteration re-runs the phase in place and queues a reroute phase plus another copy of the
+    phase, so each of the `iterations` costs three steps: two of the phase's role, one of a reroute role.
+    """
+
+    phase: str
+    iterations: int
+    reroute_roles: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    name: str
+    source_hash: str
+    phases: Tuple[str, ...]
+    roles: Tuple[str, ...]
+    gate_requirements: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    allowed_loops: Tuple[LoopRule, ...]
+    loop_bounds: Tuple[LoopBound, ...]
+    worst_case_steps: int
+    worst_case_role_steps: Tuple[Tuple[str, int], ...]
+
+    def gates_for(self, phase: str) -> List[str]:
+        return [gate for req_phase, gates in self.gate_requirements if req_phase == phase for gate in gates]
+
+    def loop_for(self, phase: str, trigger: str) -> Optional[LoopRule]:
+        for rule in self.allowed_loops:
+            if rule.from_phase == phase and rule.trigger_condition == trigger:
+                return rule
+        return None
+
+    def role_steps(self) -> Dict[str, int]:
+        return dict(self.worst_case_role_steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExecutionPlan":
+        return cls(
+            name=data["name"],
+            source_hash=data["source_hash"],
+            phases=tuple(data["phases"]),
+            roles=tuple(data["roles"]),
+            gate_requirements=tuple((phase, tuple(gates)) for phase, gates in data["gate_requirements"]),
+            allowed_loops=tuple(LoopRule(**rule) for rule in data["allowed_loops"]),
+            loop_bounds=tuple(
+                LoopBound(bound["phase"], bound["iterations"], tuple(bound["reroute_roles"]))
+                for bound in data["loop_bounds"]
+            ),
+            worst_case_steps=int(data["worst_case_steps"]),
+            worst_case_role_steps=tuple((role, int(steps)) for role, steps in data["worst_case_role_steps"]),
+        )
+
+
+def _code_digest() -> str:
+    global _CODE_DIGEST
+    if _CODE_DIGEST is None:
+        hasher = hashlib.sha256()
+        with open(os.path.abspath(__file__), "rb") as handle:
+            hasher.update(handle.read())
+        hasher.update(json.dumps(ROUTE_PHASES, sort_keys=True).encode("utf-8"))
+        # Hash the taxonomy file rather than loading it, so a cached plan needs neither PyYAML nor jsonschema.
+        with open(DEFAULT_TAXONOMY_PATH, "rb") as handle:
+            hasher.update(handle.read())
+        _CODE_DIGEST = hasher.hexdigest()
+    return _CODE_DIGEST
+
+
+def _worst_case(
+    phases: Tuple[str, ...], gate_requirements: Tuple[Tuple[str, Tuple[str, ...]], ...], loops: Tuple[LoopRule, ...]
+) -> Tuple[Tuple[LoopBound, ...], int, Dict[str, int]]:
+    role_steps: Dict[str, int] = {}
+    for phase in phases:
+        role = phase_role(phase)
+        role_steps[role] = role_steps.get(role, 0) + 1
+    reroute_roles = tuple(sorted({phase_role(route_to_phase(route)) for route in failure_routes()}))
+    bounds: List[LoopBound] = []
+    seen = set()
+    for phase in phases:
+        if phase in seen:
+            continue
+        seen.add(phase)
+        triggers = {
+            gate_trigger(gate) for req_phase, gates in gate_requirements if req_phase == phase for gate in gates
+        }
+        # Loop counters are per phase, so gates sharing a phase share the largest cap; a loop whose trigger no
+        # gate on the phase can raise never fires.
+        caps = [
+            rule.max_iterations for rule in loops if rule.from_phase == phase and rule.trigger_condition in triggers
+        ]
+        if not caps or max(caps) <= 0:
+            continue
+        bounds.append(LoopBound(phase=phase, iterations=max(caps), reroute_roles=reroute_roles))
+    total = len(phases)
+    reroutes = 0
+    for bound in bounds:
+        total += 3 * bound.iterations
+        reroutes += bound.iterations
+        role = phase_role(bound.phase)
+        role_steps[role] = role_steps.get(role, 0) + 2 * bound.iterations
+    # The reroute target depends on the failure signals, so every reachable route role is charged all of them.
+    for role in reroute_roles if reroutes else ():
+        role_steps[role] = role_steps.get(role, 0) + reroutes
+    return tuple(bounds), total, role_steps
+
+
+def build_plan(name: str, data: Dict[str, Any], source_hash: str = "") -> ExecutionPlan:
+    phases = tuple(str(phase) for phase in data.get("phases", []))
+    gate_requirements = tuple(
+        (str(req.get("phase")), tuple(str(gate) for gate in req.get("gates", [])))
+        for req in data.get("gate_requirements", [])
+    )
+    loops = tuple(
+        LoopRule(
+            from_phase=str(rule.get("from_phase")),
+            to_phase=str(rule.get("to_phase")),
+            max_iterations=int(rule.get("max_iterations", 0)),
+            trigger_condition=str(rule.get("trigger_condition")),
+        )
+        for rule in data.get("allowed_loops", [])
+    )
+    bounds, total, role_steps = _worst_case(phases, gate_requirements, loops)
+    return ExecutionPlan(
+        name=str(data.get("name", name)),
+        source_hash=source_hash,
+        phases=phases,
+        roles=tuple(phase_role(phase) for phase in phases),
+        gate_requirements=gate_requirements,
+        allowed_loops=loops,
+        loop_bounds=bounds,
+        worst_case_steps=total,
+        worst_case_role_steps=tuple(sorted(role_steps.items())),
+    )
+
+
+def _validate(name: str, data: Any, schema_dir: str) -> None:
+    from .validation import validate_playbook_references
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Playbook {name} must be a mapping at the top level")
+    result = SchemaRegistry(schema_dir, {"playbook": "playbook.schema.json"}).validate("playbook", data)
+    errors = list(result["errors"]) + validate_playbook_references(data)
+    if errors:
+        raise ValueError(f"Playbook {name} is invalid: " + "; ".join(errors[:5]))
+
+
+def compile_playbook(playbook_dir: str, name: str, schema_dir: str, use_cache: bool = True) -> ExecutionPlan:
+    """Compile `<playbook_dir>/<name>.yaml`, reusing the cached plan while the playbook and compiler are unchanged."""
+    path = os.path.join(playbook_dir, f"{name}.yaml")
+    with open(path, "rb") as handle:
+        raw = handle.read()
+    hasher = hashlib.sha256(raw)
+    hasher.update(_code_digest().encode("utf-8"))
+    with open(os.path.join(schema_dir, "playbook.schema.json"), "rb") as handle:
+        hasher.update(handle.read())
+    source_hash = hasher.hexdigest()
+    memory_key = os.path.abspath(path)
+    cache_path = os.path.join(playbook_dir, CACHE_DIRNAME, f"{name}.plan.json")
+    if use_cache:
+        plan = _PLANS.get(memory_key)
+        if plan is not None and plan.source_hash == source_hash:
+            return plan
+        plan = _read_cached(cache_path, source_hash)
+        if plan is not None:
+            with _PLANS_LOCK:
+                _PLANS[memory_key] = plan
+            return plan
+    try:
+        import yaml  # type: ignore
+    except Exception as exc:
+        raise RuntimeError("PyYAML is required to load playbooks.") from exc
+    data = yaml.safe_load(raw.decode("utf-8"))
+    _validate(name, data, schema_dir)
+    plan = build_plan(name, data, source_hash)
+    if use_cache:
+        _write_cached(cache_path, plan)
+        with _PLANS_LOCK:
+            _PLANS[memory_key] = plan
+    return plan
+
+
+def _read_cached(cache_path: str, source_hash: str) -> Optional[ExecutionPlan]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as handle:
+            doc = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict) or doc.get("version") != PLAN_FORMAT_VERSION:
+        return None
+    if doc.get("plan", {}).get("source_hash") != source_hash:
+        return None
+    try:
+        return ExecutionPlan.from_dict(doc["plan"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _write_cached(cache_path: str, plan: ExecutionPlan) -> None:
+    # The cache is an optimization; a read-only checkout simply recompiles.
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": PLAN_FORMAT_VERSION, "plan": plan.to_dict()}, handle, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def check_plan_budgets(plan: ExecutionPlan, budgets: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return one finding per step limit (global or per role) that the plan's worst case exceeds; 0 is unbounded."""
+    findings: List[Dict[str, Any]] = []
+    global_limits = budgets.get("global", {}) if isinstance(budgets.get("global"), dict) else {}
+    limit = int(global_limits.get("max_steps", 0) or 0)
+    if limit and plan.worst_case_steps > limit:
+        findings.append({"limit": "global.max_steps", "budget": limit, "worst_case": plan.worst_case_steps})
+    per_role = budgets.get("per_role", {}) if isinstance(budgets.get("per_role"), dict) else {}
+    for role, steps in plan.worst_case_role_steps:
+        role_limits = per_role.get(role, {}) if isinstance(per_role.get(role), dict) else {}
+        limit = int(role_limits.get("max_steps", 0) or 0)
+        if limit and steps > limit:
+            findings.append({"limit": f"{role}.max_steps", "budget": limit, "worst_case": steps})
+    return findings
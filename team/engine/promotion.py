@@ -1,49 +1,64 @@
 """Promotion protocol handling with ownership-enforced artifact updates."""
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Set, Tuple
 
 from .config import ARTIFACT_OWNERS
 
 
+Path = Tuple[str, ...]
+
+
 def _split_path(path: str) -> List[str]:
     return [part for part in path.split(".") if part]
 
 
-def _set_path(payload: Dict[str, Any], path: str, value: Any) -> bool:
+def _owned_child(node: Dict[str, Any], key: str, owned: Set[int]) -> Dict[str, Any]:
+    """Return node[key] as a dict this patch may mutate, copying it (and only it) on first touch."""
+    child = node.get(key)
+    if isinstance(child, dict):
+        if id(child) in owned:
+            return child
+        child = dict(child)
+    else:
+        child = {}
+    node[key] = child
+    owned.add(id(child))
+    return child
+
+
+def _set_path(payload: Dict[str, Any], path: str, value: Any, owned: Set[int]) -> bool:
     parts = _split_path(path)
     if not parts:
         return False
-    node: Dict[str, Any] = payload
+    node = payload
     for part in parts[:-1]:
-        child = node.get(part)
-        if not isinstance(child, dict):
-            child = {}
-            node[part] = child
-        node = child
+        node = _owned_child(node, part, owned)
     node[parts[-1]] = value
     return True
 
 
-def _delete_path(payload: Dict[str, Any], path: str) -> bool:
+def _delete_path(payload: Dict[str, Any], path: str, owned: Set[int]) -> bool:
     parts = _split_path(path)
     if not parts:
         return False
-    node: Dict[str, Any] = payload
+    probe: Any = payload
     for part in parts[:-1]:
-        child = node.get(part)
-        if not isinstance(child, dict):
+        probe = probe.get(part)
+        if not isinstance(probe, dict):
             return False
-        node = child
-    if parts[-1] not in node:
+    if parts[-1] not in probe:
         return False
+    node = payload
+    for part in parts[:-1]:
+        node = _owned_child(node, part, owned)
     del node[parts[-1]]
     return True
 
 
 def _merge_dict(base: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
-    merged = deepcopy(base)
+    """Recursive merge that copies only the dicts it changes; untouched subtrees stay shared with `base`."""
+    merged = dict(base)
     for key, value in patch.items():
         if isinstance(value, dict) and isinstance(merged.get(key), dict):
             merged[key] = _merge_dict(merged[key], value)
@@ -53,7 +68,9 @@ def _merge_dict(base: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _apply_changes(current: Dict[str, Any], changes: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], int, int]:
-    updated = deepcopy(current)
+    """Apply changes by path copying: `current` is never mutated and shares every untouched subtree."""
+    updated = dict(current)
+    owned: Set[int] = {id(updated)}
     applied = 0
     ignored = 0
     for change in changes:
@@ -63,83 +80,146 @@ def _apply_changes(current: Dict[str, Any], changes: List[Dict[str, Any]]) -> Tu
         op = str(change.get("op", "set"))
         path = str(change.get("path", "")).strip()
         if op == "set":
-            if _set_path(updated, path, change.get("value")):
+            if _set_path(updated, path, change.get("value"), owned):
                 applied += 1
             else:
                 ignored += 1
             continue
         if op == "delete":
-            if _delete_path(updated, path):
+            if _delete_path(updated, path, owned):
                 applied += 1
             else:
                 ignored += 1
             continue
         if op == "merge":
             value = change.get("value")
-            if not path or not isinstance(value, dict):
+            parts = _split_path(path)
+            if not parts or not isinstance(value, dict):
                 ignored += 1
                 continue
-            target = updated
-            for part in _split_path(path):
-                child = target.get(part)
-                if not isinstance(child, dict):
-                    child = {}
-                    target[part] = child
-                target = child
-            merged = _merge_dict(target, value)
-            target.clear()
-            target.update(merged)
+            parent = updated
+            for part in parts[:-1]:
+                parent = _owned_child(parent, part, owned)
+            existing = parent.get(parts[-1])
+            merged = _merge_dict(existing if isinstance(existing, dict) else {}, value)
+            parent[parts[-1]] = merged
+            owned.add(id(merged))
             applied += 1
             continue
         ignored += 1
     return updated, applied, ignored
 
 
-def apply_promotion(promotion: Dict[str, Any], broker: Any) -> Dict[str, Any]:
-    target = promotion.get("target_artifact")
-    owner = ARTIFACT_OWNERS.get(target, "unknown")
-    if owner == "unknown":
-        return {
-            "target_artifact": target,
-            "owner": owner,
-            "decision": "rejected",
-            "notes": "Unknown target artifact; cannot route promotion.",
-            "new_version": None,
-        }
-    latest_version = broker.latest_version(target)
-    if latest_version == 0:
-        return {
-            "target_artifact": target,
-            "owner": owner,
-            "decision": "rejected",
-            "notes": "Target artifact does not exist yet.",
-            "new_version": None,
-        }
-    changes = promotion.get("proposed_changes", [])
-    if not isinstance(changes, list) or not changes:
-        return {
-            "target_artifact": target,
-            "owner": owner,
-            "decision": "rejected",
-            "notes": "No proposed_changes supplied.",
-            "new_version": None,
-        }
-    current = broker.read_full(target, latest_version)
-    updated, applied, ignored = _apply_changes(current, changes)
-    if applied == 0:
-        return {
-            "target_artifact": target,
-            "owner": owner,
-            "decision": "rejected",
-            "notes": "No valid changes could be applied.",
-            "new_version": None,
-        }
-    new_version = broker.write(target, updated, author=owner)
-    decision = "accepted" if ignored == 0 else "modified"
+def _change_paths(changes: List[Any]) -> List[Path]:
+    paths = []
+    for change in changes:
+        if isinstance(change, dict):
+            parts = tuple(_split_path(str(change.get("path", "")).strip()))
+            if parts:
+                paths.append(parts)
+    return paths
+
+
+class _PathClaims:
+    """Paths already changed in a batch; a new path conflicts if either is a prefix of the other."""
+
+    def __init__(self) -> None:
+        self.paths: Set[Path] = set()
+        self.prefixes: Set[Path] = set()
+
+    def conflicts(self, path: Path) -> bool:
+        if path in self.prefixes:
+            return True
+        return any(path[:size] in self.paths for size in range(1, len(path) + 1))
+
+    def claim(self, path: Path) -> None:
+        self.paths.add(path)
+        for size in range(1, len(path) + 1):
+            self.prefixes.add(path[:size])
+
+
+def _rejected(promotion: Dict[str, Any], owner: str, notes: str, decision: str = "rejected") -> Dict[str, Any]:
     return {
-        "target_artifact": target,
+        "id": promotion.get("id"),
+        "target_artifact": promotion.get("target_artifact"),
         "owner": owner,
         "decision": decision,
-        "notes": f"Applied {applied} change(s); ignored {ignored}.",
-        "new_version": new_version,
+        "notes": notes,
+        "new_version": None,
     }
+
+
+def apply_promotions(promotions: List[Dict[str, Any]], broker: Any) -> Dict[str, Any]:
+    """Apply a queue of PromotionDecisions with one read and one write per target artifact.
+
+    Decisions are applied in queue order. A decision whose change paths overlap (equal or
+    prefix) a path changed by an earlier accepted decision for the same target is rejected as a
+    conflict as a whole, so every accepted decision is applied exactly as proposed.
+    """
+    results: List[Dict[str, Any]] = [{} for _ in promotions]
+    latest: Dict[str, int] = {}
+    by_target: Dict[str, List[int]] = {}
+    for idx, promotion in enumerate(promotions):
+        target = promotion.get("target_artifact")
+        owner = ARTIFACT_OWNERS.get(target, "unknown")
+        if owner == "unknown":
+            results[idx] = _rejected(promotion, owner, "Unknown target artifact; cannot route promotion.")
+            continue
+        if target not in latest:
+            latest[target] = broker.latest_version(target)
+        if latest[target] == 0:
+            results[idx] = _rejected(promotion, owner, "Target artifact does not exist yet.")
+            continue
+        changes = promotion.get("proposed_changes", [])
+        if not isinstance(changes, list) or not changes:
+            results[idx] = _rejected(promotion, owner, "No proposed_changes supplied.")
+            continue
+        by_target.setdefault(target, []).append(idx)
+
+    writes: Dict[str, int] = {}
+    for target, indices in by_target.items():
+        owner = ARTIFACT_OWNERS[target]
+        working = broker.read_full(target, latest[target])
+        claims = _PathClaims()
+        accepted: List[int] = []
+        for idx in indices:
+            changes = promotions[idx]["proposed_changes"]
+            paths = _change_paths(changes)
+            overlapping = [".".join(path) for path in paths if claims.conflicts(path)]
+            if overlapping:
+                results[idx] = _rejected(
+                    promotions[idx],
+                    owner,
+                    f"Conflicts with an earlier decision in this batch on: {', '.join(sorted(set(overlapping)))}.",
+                    decision="conflict",
+                )
+                continue
+            updated, applied, ignored = _apply_changes(working, changes)
+            if applied == 0:
+                results[idx] = _rejected(promotions[idx], owner, "No valid changes could be applied.")
+                continue
+            working = updated
+            for path in paths:
+                claims.claim(path)
+            accepted.append(idx)
+            results[idx] = {
+                "id": promotions[idx].get("id"),
+                "target_artifact": target,
+                "owner": owner,
+                "decision": "accepted" if ignored == 0 else "modified",
+                "notes": f"Applied {applied} change(s); ignored {ignored}.",
+                "new_version": None,
+            }
+        if not accepted:
+            continue
+        new_version = broker.write(target, working, author=owner)
+        writes[target] = new_version
+        for idx in accepted:
+            results[idx]["new_version"] = new_version
+    return {"results": results, "writes": writes}
+
+
+def apply_promotion(promotion: Dict[str, Any], broker: Any) -> Dict[str, Any]:
+    routed = apply_promotions([promotion], broker)["results"][0]
+    routed.pop("id", None)
+    return routed
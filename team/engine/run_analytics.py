@@ -0,0 +1,361 @@
+"""Columnar compaction of meta-eval run history and vectorized budget/loop aggregations."""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import math
+import os
+import re
+import time
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .meta_eval_log import MetaEvalLog, file_lock
+
+# 2: partition directories and column files carry a hash of the original names (see `_file_name`).
+STORE_FORMAT_VERSION = 2
+ROLE_PREFIX = "role."
+LOOP_PREFIX = "loop."
+CAP_PREFIX = "cap."
+FLOAT_COLUMNS = {"ts"}
+GROUP_FIELDS = ("playbook", "runtime_target")
+PERCENTILES = (50, 90, 99)
+
+
+def _numpy() -> Any:
+    try:
+        import numpy  # type: ignore
+    except Exception:
+        return None
+    return numpy
+
+
+def _typecode(column: str) -> str:
+    return "d" if column in FLOAT_COLUMNS else "q"
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value) or "_"
+
+
+def _file_name(*parts: str) -> str:
+    """A readable file name for `parts`; the hash suffix keeps names distinct when sanitizing or joining collide."""
+    digest = hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()[:12]
+    return f"{_safe_name('__'.join(parts))}-{digest}"
+
+
+def _int_map(value: Any) -> Dict[str, int]:
+    if not isinstance(value, dict):
+        return {}
+    result = {}
+    for key, item in value.items():
+        try:
+            result[str(key)] = int(item or 0)
+        except (TypeError, ValueError):
+            continue
+    return result
+
+
+def entry_row(entry: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten one meta-eval entry into column values; nested role/loop dicts become prefixed columns."""
+    caps = _int_map(entry.get("loop_cap_hits"))
+    exhausted = entry.get("budget_exhausted")
+    if exhausted is None:
+        # Entries written before the flag existed: budget exhaustion is the only path to `blocked`.
+        exhausted = entry.get("status") == "blocked"
+    row: Dict[str, float] = {
+        "ts": float(entry.get("ts", 0) or 0),
+        "steps_used": int(entry.get("steps_used", 0) or 0),
+        "phases_run": int(entry.get("phases_run", 0) or 0),
+        "budget_exhausted": int(bool(exhausted)),
+        "loop_cap_hits": sum(caps.values()),
+    }
+    for role, steps in _int_map(entry.get("role_steps")).items():
+        row[ROLE_PREFIX + role] = steps
+    for phase, count in _int_map(entry.get("loop_counts")).items():
+        row[LOOP_PREFIX + phase] = count
+    for phase, count in caps.items():
+        row[CAP_PREFIX + phase] = count
+    return row
+
+
+def _rank_stats(value_counts: Dict[float, int], total: int, value_sum: float) -> Dict[str, float]:
+    """Nearest-rank percentiles from a value -> count map."""
+    if not total:
+        return {}
+    result: Dict[str, float] = {}
+    ordered = sorted(value_counts.items())
+    targets = [(f"p{point}", max(1, math.ceil(point / 100.0 * total))) for point in PERCENTILES]
+    seen = 0
+    pending = list(targets)
+    for value, count in ordered:
+        seen += count
+        while pending and seen >= pending[0][1]:
+            result[pending.pop(0)[0]] = float(value)
+    result["mean"] = round(value_sum / total, 3)
+    result["max"] = float(ordered[-1][0])
+    return result
+
+
+class _StdlibOps:
+    """Column operations on `array.array`; counting runs in C via `Counter` and `array.count`."""
+
+    @staticmethod
+    def load(path: str, typecode: str, rows: int) -> Any:
+        values = array(typecode)
+        if rows:
+            with open(path, "rb") as handle:
+                values.fromfile(handle, rows)
+        return values
+
+    @staticmethod
+    def concat(parts: List[Any]) -> Any:
+        if len(parts) == 1:
+            return parts[0]
+        merged = array(parts[0].typecode)
+        for part in parts:
+            merged.extend(part)
+        return merged
+
+    @staticmethod
+    def select(values: Any, mask: Any) -> Any:
+        return array(values.typecode, itertools.compress(values, mask))
+
+    @staticmethod
+    def time_mask(ts: Any, since: Optional[float], until: Optional[float]) -> Any:
+        low = -math.inf if since is None else since
+        high = math.inf if until is None else until
+        return [low <= value <= high for value in ts]
+
+    @staticmethod
+    def stats(values: Any) -> Dict[str, float]:
+        return _rank_stats(Counter(values), len(values), sum(values))
+
+    @staticmethod
+    def nonzero(values: Any) -> int:
+        return len(values) - values.count(0)
+
+
+class _NumpyOps:
+    def __init__(self, np: Any) -> None:
+        self.np = np
+
+    def load(self, path: str, typecode: str, rows: int) -> Any:
+        dtype = self.np.float64 if typecode == "d" else self.np.int64
+        if not rows:
+            return self.np.zeros(0, dtype=dtype)
+        return self.np.fromfile(path, dtype=dtype, count=rows)
+
+    def concat(self, parts: List[Any]) -> Any:
+        return parts[0] if len(parts) == 1 else self.np.concatenate(parts)
+
+    @staticmethod
+    def select(values: Any, mask: Any) -> Any:
+        return values[mask]
+
+    def time_mask(self, ts: Any, since: Optional[float], until: Optional[float]) -> Any:
+        mask = self.np.ones(len(ts), dtype=bool)
+        if since is not None:
+            mask &= ts >= since
+        if until is not None:
+            mask &= ts <= until
+        return mask
+
+    def stats(self, values: Any) -> Dict[str, float]:
+        total = len(values)
+        if not total:
+            return {}
+        ordered = self.np.sort(values)
+        result = {
+            f"p{point}": float(ordered[max(1, math.ceil(point / 100.0 * total)) - 1]) for point in PERCENTILES
+        }
+        result["mean"] = round(float(ordered.sum()) / total, 3)
+        result["max"] = float(ordered[-1])
+        return result
+
+    def nonzero(self, values: Any) -> int:
+        return int(self.np.count_nonzero(values))
+
+
+class ColumnarRunStore:
+    """Run history stored as one binary column file per metric, partitioned by playbook and runtime.
+
+    `compact` appends only entries logged since the previous compaction (tracked with the meta-eval
+    log cursor). Aggregations load each column once as a typed array and work on whole columns.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.lock_path = os.path.join(directory, ".lock")
+        np = _numpy()
+        self.ops: Any = _NumpyOps(np) if np is not None else _StdlibOps()
+        self._columns: Dict[Tuple[str, str, int], Any] = {}
+
+    def _empty_manifest(self) -> Dict[str, Any]:
+        return {"version": STORE_FORMAT_VERSION, "cursor": {}, "partitions": {}}
+
+    def load_manifest(self) -> Dict[str, Any]:
+        if not os.path.isfile(self.manifest_path):
+            return self._empty_manifest()
+        with open(self.manifest_path, "r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if manifest.get("version") != STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Analytics store format {manifest.get('version')} is not supported; rebuild it with --rebuild."
+            )
+        return manifest
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _column_path(self, partition_id: str, column: str) -> str:
+        return os.path.join(self.directory, partition_id, f"{_file_name(column)}.bin")
+
+    def compact(self, log: MetaEvalLog) -> Dict[str, Any]:
+        started = time.perf_counter()
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(self.lock_path):
+            manifest = self.load_manifest()
+            entries, cursor = log.read_from(manifest.get("cursor"))
+            batches: Dict[Tuple[str, str], List[Dict[str, float]]] = {}
+            for entry in entries:
+                key = (str(entry.get("playbook", "unknown")), str(entry.get("runtime_target", "") or "unknown"))
+                batches.setdefault(key, []).append(entry_row(entry))
+            for (playbook, runtime_target), rows in batches.items():
+                partition_id = _file_name(playbook, runtime_target)
+                partition = manifest["partitions"].setdefault(
+                    partition_id,
+                    {"playbook": playbook, "runtime_target": runtime_target, "rows": 0, "columns": {}},
+                )
+                self._append(partition_id, partition, rows)
+            manifest["cursor"] = cursor
+            self._save_manifest(manifest)
+        self._columns.clear()
+        return {
+            "rows_added": len(entries),
+            "partitions_touched": len(batches),
+            "total_rows": sum(part["rows"] for part in manifest["partitions"].values()),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        }
+
+    def _append(self, partition_id: str, partition: Dict[str, Any], rows: List[Dict[str, float]]) -> None:
+        os.makedirs(os.path.join(self.directory, partition_id), exist_ok=True)
+        existing = int(partition["rows"])
+        names = set(partition["columns"])
+        for row in rows:
+            names.update(row.keys())
+        for name in sorted(names):
+            typecode = partition["columns"].get(name, _typecode(name))
+            known = name in partition["columns"]
+            values = array(typecode, (row.get(name, 0) for row in rows))
+            with open(self._column_path(partition_id, name), "ab") as handle:
+                # Drop bytes from an interrupted compaction that never reached the manifest.
+                handle.truncate(existing * values.itemsize if known else 0)
+                if not known and existing:
+                    (array(typecode, [0]) * existing).tofile(handle)
+                values.tofile(handle)
+            partition["columns"][name] = typecode
+        partition["rows"] = existing + len(rows)
+
+    def _column(self, partition_id: str, partition: Dict[str, Any], name: str) -> Any:
+        rows = int(partition["rows"])
+        key = (partition_id, name, rows)
+        cached = self._columns.get(key)
+        if cached is not None:
+            return cached
+        typecode = partition["columns"].get(name, _typecode(name))
+        if name in partition["columns"]:
+            values = self.ops.load(self._column_path(partition_id, name), typecode, rows)
+        else:
+            # Column first seen in a sibling partition: this partition contributes zeros.
+            values = _zeros(self.ops, typecode, rows)
+        self._columns[key] = values
+        return values
+
+    def aggregate(
+        self,
+        *,
+        playbook: Optional[str] = None,
+        runtime_target: Optional[str] = None,
+        group_by: Sequence[str] = GROUP_FIELDS,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        unknown = [name for name in group_by if name not in GROUP_FIELDS]
+        if unknown:
+            raise ValueError(f"Cannot group by {', '.join(unknown)}; expected a subset of {', '.join(GROUP_FIELDS)}.")
+        manifest = self.load_manifest()
+        groups: Dict[Tuple[str, ...], List[Tuple[str, Dict[str, Any]]]] = {}
+        for partition_id, partition in sorted(manifest["partitions"].items()):
+            if playbook is not None and partition["playbook"] != playbook:
+                continue
+            if runtime_target is not None and partition["runtime_target"] != runtime_target:
+                continue
+            key = tuple(str(partition[name]) for name in group_by)
+            groups.setdefault(key, []).append((partition_id, partition))
+        results = []
+        total_runs = 0
+        for key, members in sorted(groups.items()):
+            summary = self._summarize(members, since, until)
+            if not summary["runs"]:
+                continue
+            total_runs += summary["runs"]
+            results.append({**dict(zip(group_by, key)), **summary})
+        return {
+            "backend": "numpy" if isinstance(self.ops, _NumpyOps) else "array",
+            "runs": total_runs,
+            "groups": results,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        }
+
+    def _summarize(
+        self, members: List[Tuple[str, Dict[str, Any]]], since: Optional[float], until: Optional[float]
+    ) -> Dict[str, Any]:
+        names = sorted({name for _, partition in members for name in partition["columns"]})
+        mask = None
+        if since is not None or until is not None:
+            ts = self.ops.concat([self._column(pid, part, "ts") for pid, part in members])
+            mask = self.ops.time_mask(ts, since, until)
+
+        def column(name: str) -> Any:
+            values = self.ops.concat([self._column(pid, part, name) for pid, part in members])
+            return values if mask is None else self.ops.select(values, mask)
+
+        steps = column("steps_used")
+        runs = len(steps)
+        if not runs:
+            return {"runs": 0}
+        roles = {
+            name[len(ROLE_PREFIX):]: self.ops.stats(column(name)) for name in names if name.startswith(ROLE_PREFIX)
+        }
+        loops = {}
+        for name in names:
+            if not name.startswith(LOOP_PREFIX):
+                continue
+            phase = name[len(LOOP_PREFIX):]
+            stats = self.ops.stats(column(name))
+            cap_name = CAP_PREFIX + phase
+            stats["cap_hit_rate"] = round(self.ops.nonzero(column(cap_name)) / runs, 4) if cap_name in names else 0.0
+            loops[phase] = stats
+        return {
+            "runs": runs,
+            "budget_exhaustion_rate": round(self.ops.nonzero(column("budget_exhausted")) / runs, 4),
+            "loop_cap_hit_rate": round(self.ops.nonzero(column("loop_cap_hits")) / runs, 4),
+            "steps_used": self.ops.stats(steps),
+            "phases_run": self.ops.stats(column("phases_run")),
+            "roles": roles,
+            "loops": loops,
+        }
+
+
+def _zeros(ops: Any, typecode: str, rows: int) -> Any:
+    if isinstance(ops, _NumpyOps):
+        return ops.np.zeros(rows, dtype=ops.np.float64 if typecode == "d" else ops.np.int64)
+    return array(typecode, [0]) * rows
@@ -0,0 +1,255 @@
+"""Distributed run queue on Redis streams: consumer groups, ack/retry, visibility timeouts, results and run events."""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "enabled": False,
+    "redis_url": "redis://localhost:6379/0",
+    "stream_prefix": "deepagent",
+    "visibility_timeout_s": 300.0,
+    "max_attempts": 3,
+    "result_ttl_s": 3600.0,
+    "wait_timeout_s": 600.0,
+    "events_maxlen": 10000,
+    "local_workers": 0,
+}
+
+_FAKES: Dict[str, Any] = {}
+_FAKES_LOCK = threading.Lock()
+
+
+def connect(url: str) -> Any:
+    """Return a client for `url`; `memory://<name>` gives a process-wide in-process fake shared by name."""
+    if url.startswith("memory://"):
+        from .fake_redis import FakeRedis
+
+        with _FAKES_LOCK:
+            client = _FAKES.get(url)
+            if client is None:
+                client = _FAKES[url] = FakeRedis()
+        return client
+    try:
+        import redis  # type: ignore
+    except Exception as exc:
+        raise RuntimeError("The redis package is required for distributed runs (pip install redis).") from exc
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+def _entries(reply: Any) -> List[Tuple[str, Dict[str, str]]]:
+    """Flatten an XREAD/XREADGROUP reply (list of [stream, entries]) into its entries."""
+    found: List[Tuple[str, Dict[str, str]]] = []
+    for _, entries in reply or []:
+        found.extend((str(entry_id), dict(fields)) for entry_id, fields in entries or [])
+    return found
+
+
+class RunQueue:
+    """Producer and consumer side of the run stream.
+
+    Runs are appended to `<prefix>:runs` and consumed by the `<prefix>-workers` group. A delivered run stays
+    pending until acked; if its consumer dies, another consumer reclaims it after `visibility_timeout_s`.
+    Each run's result goes to its own `<prefix>:result:<run_id>` stream (expiring after `result_ttl_s`, as
+    does the run's `<prefix>:run:<run_id>` submission marker), lifecycle events to `<prefix>:events`, and runs that exhaust `max_attempts` to `<prefix>:dead`. A cancel
+    request is a `<prefix>:cancel:<run_id>` key, which the executing worker polls.
+    """
+
+    def __init__(self, client: Any, options: Optional[Dict[str, Any]] = None) -> None:
+        self.client = client
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        prefix = str(self.options["stream_prefix"])
+        self.stream = f"{prefix}:runs"
+        self.group = f"{prefix}-workers"
+        self.events = f"{prefix}:events"
+        self.dead = f"{prefix}:dead"
+        self._prefix = prefix
+        self._group_ready = False
+
+    @classmethod
+    def from_options(cls, options: Optional[Dict[str, Any]] = None) -> "RunQueue":
+        merged = {**DEFAULT_OPTIONS, **(options or {})}
+        return cls(connect(str(merged["redis_url"])), merged)
+
+    def result_key(self, run_id: str) -> str:
+        return f"{self._prefix}:result:{run_id}"
+
+    def run_key(self, run_id: str) -> str:
+        return f"{self._prefix}:run:{run_id}"
+
+    def cancel_key(self, run_id: str) -> str:
+        return f"{self._prefix}:cancel:{run_id}"
+
+    def ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            # Start at 0, not $, so runs enqueued before the first worker started are still delivered.
+            self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    def publish_event(self, run_id: str, event: str, **fields: Any) -> None:
+        payload = {"run_id": run_id, "event": event, "ts": f"{time.time():.3f}"}
+        payload.update({key: str(value) for key, value in fields.items()})
+        self.client.xadd(self.events, payload, maxlen=int(self.options["events_maxlen"]), approximate=True)
+
+    def submit(self, payload: Dict[str, Any], run_id: Optional[str] = None) -> str:
+        self.ensure_group()
+        run_id = run_id or uuid.uuid4().hex
+        self.client.xadd(self.run_key(run_id), {"run_id": run_id, "ts": f"{time.time():.3f}"})
+        self.client.xadd(self.stream, {"run_id": run_id, "payload": json.dumps(payload, default=str)})
+        self.publish_event(run_id, "enqueued")
+        return run_id
+
+    def publish_result(self, run_id: str, result: Dict[str, Any]) -> None:
+        key = self.result_key(run_id)
+        self.client.xadd(key, {"run_id": run_id, "result": json.dumps(result, default=str)})
+        self.client.expire(key, int(float(self.options["result_ttl_s"])))
+        self.client.expire(self.run_key(run_id), int(float(self.options["result_ttl_s"])))
+
+    def result(self, run_id: str) -> Optional[Dict[str, Any]]:
+        entries = self.client.xrange(self.result_key(run_id), count=1)
+        return json.loads(entries[0][1]["result"]) if entries else None
+
+    def submitted(self, run_id: str) -> bool:
+        """Whether `run_id` was enqueued here and is still pending or within its result TTL."""
+        return bool(self.client.exists(self.run_key(run_id)))
+
+    def wait(self, run_id: str, timeout_s: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until the run's result is published or `timeout_s` (default `wait_timeout_s`) passes."""
+        timeout = float(self.options["wait_timeout_s"] if timeout_s is None else timeout_s)
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                return self.result(run_id)
+            # Read from the start of the result stream so a result published before we block is not missed.
+            entries = _entries(
+                self.client.xread({self.result_key(run_id): "0-0"}, count=1, block=min(remaining_ms, 5000))
+            )
+            if entries:
+                return json.loads(entries[0][1]["result"])
+
+    def request_cancel(self, run_id: str) -> None:
+        key = self.cancel_key(run_id)
+        self.client.xadd(key, {"run_id": run_id, "ts": f"{time.time():.3f}"})
+        self.client.expire(key, int(float(self.options["result_ttl_s"])))
+        self.publish_event(run_id, "cancel_requested")
+
+    def cancel_requested(self, run_id: str) -> bool:
+        return bool(self.client.exists(self.cancel_key(run_id)))
+
+    def deliveries(self, message_id: str) -> int:
+        pending = self.client.xpending_range(self.stream, self.group, message_id, message_id, 1)
+        return int(pending[0]["times_delivered"]) if pending else 1
+
+    def ack(self, message_id: str) -> None:
+        self.client.xack(self.stream, self.group, message_id)
+
+    def dead_letter(self, message_id: str, fields: Dict[str, str], reason: str) -> None:
+        self.client.xadd(self.dead, {**fields, "message_id": message_id, "reason": reason})
+
+
+class QueueWorker:
+    """Consumes runs from a `RunQueue`, executing each with `execute(payload, cancel_requested) -> result`.
+
+    `cancel_requested()` reports whether a cancel was requested for the run; the executor polls it.
+
+    A failed execution is left unacked, so it is redelivered once its visibility timeout passes; the attempt
+    that reaches `max_attempts` dead-letters the run and publishes an error result instead. While a run
+    executes, a heartbeat re-claims its message so slow runs are not handed to another consumer.
+    """
+
+    def __init__(
+        self,
+        queue: RunQueue,
+        execute: Callable[[Dict[str, Any], Callable[[], bool]], Dict[str, Any]],
+        consumer: Optional[str] = None,
+    ) -> None:
+        self.queue = queue
+        self.execute = execute
+        # Workers are usually built together in one thread, so the default name must not come from the thread.
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self.processed = 0
+
+    def _visibility_ms(self) -> int:
+        return int(float(self.queue.options["visibility_timeout_s"]) * 1000)
+
+    def _next(self, block_ms: int) -> Optional[Tuple[str, Dict[str, str]]]:
+        queue = self.queue
+        reply = queue.client.xautoclaim(queue.stream, queue.group, self.consumer, self._visibility_ms(), "0-0", count=1)
+        claimed = reply[1] if isinstance(reply, (list, tuple)) and len(reply) > 1 else []
+        for entry_id, fields in claimed:
+            if fields:
+                return str(entry_id), dict(fields)
+        entries = _entries(
+            queue.client.xreadgroup(queue.group, self.consumer, {queue.stream: ">"}, count=1, block=block_ms)
+        )
+        return entries[0] if entries else None
+
+    def _heartbeat(self, message_id: str, stop: threading.Event) -> None:
+        interval = max(0.05, self._visibility_ms() / 3000.0)
+        while not stop.wait(interval):
+            try:
+                self.queue.client.xclaim(
+                    self.queue.stream, self.queue.group, self.consumer, 0, [message_id], justid=True
+                )
+            except Exception:
+                pass  # a missed heartbeat only risks a duplicate delivery, which results make idempotent
+
+    def poll(self, block_ms: int = 1000) -> bool:
+        """Handle at most one run; returns False when nothing was available within `block_ms`."""
+        queue = self.queue
+        queue.ensure_group()
+        message = self._next(block_ms)
+        if message is None:
+            return False
+        message_id, fields = message
+        run_id = fields.get("run_id", message_id)
+        if queue.result(run_id) is not None:
+            # Finished by a consumer that died before acking.
+            queue.ack(message_id)
+            return True
+        if queue.cancel_requested(run_id):
+            queue.publish_result(run_id, {"status": "cancelled", "run_id": run_id, "stopped_at": "queued"})
+            queue.publish_event(run_id, "completed", consumer=self.consumer, status="cancelled")
+            queue.ack(message_id)
+            return True
+        attempt = queue.deliveries(message_id)
+        queue.publish_event(run_id, "started", consumer=self.consumer, attempt=attempt)
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(message_id, stop), daemon=True)
+        heartbeat.start()
+        try:
+            result = self.execute(json.loads(fields.get("payload", "{}")), lambda: queue.cancel_requested(run_id))
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            if attempt >= int(queue.options["max_attempts"]):
+                queue.dead_letter(message_id, fields, error)
+                queue.publish_result(run_id, {"status": "error", "error": error, "attempts": attempt})
+                queue.publish_event(run_id, "dead_lettered", attempt=attempt, error=error)
+                queue.ack(message_id)
+            else:
+                queue.publish_event(run_id, "failed", attempt=attempt, error=error)
+            return True
+        finally:
+            stop.set()
+            heartbeat.join()
+        queue.publish_result(run_id, result)
+        queue.publish_event(run_id, "completed", consumer=self.consumer, status=result.get("status", "unknown"))
+        queue.ack(message_id)
+        self.processed += 1
+        return True
+
+    def run(self, stop: Optional[threading.Event] = None, block_ms: int = 1000) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.poll(block_ms)
@@ -2,7 +2,12 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .config import ARTIFACT_SCHEMAS
 
 
 def load_schema(path: str) -> Dict[str, Any]:
@@ -14,3 +19,117 @@ def validate_required(schema: Dict[str, Any], payload: Dict[str, Any]) -> Dict[s
     required = schema.get("required", [])
     missing = [key for key in required if key not in payload]
     return {"valid": not missing, "missing": missing}
+
+
+def _error_details(error: Any) -> str:
+    path = ".".join(str(part) for part in error.absolute_path) or "<root>"
+    return f"{path}: {error.message}"
+
+
+class SchemaRegistry:
+    """Compiles each artifact schema once and validates payloads against the cached validator.
+
+    jsonschema is imported when the first schema is compiled. Falls back to top-level required-key checks
+    when it is not installed.
+    """
+
+    def __init__(self, schema_dir: str, schema_files: Optional[Dict[str, str]] = None) -> None:
+        self.schema_dir = schema_dir
+        self.schema_files = dict(schema_files if schema_files is not None else ARTIFACT_SCHEMAS)
+        self._validators: Dict[str, Any] = {}
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._validator_cls: Any = None
+        self._validator_resolved = False
+
+    def _validator_class(self) -> Any:
+        if not self._validator_resolved:
+            try:
+                from jsonschema import Draft202012Validator  # type: ignore
+            except Exception:
+                Draft202012Validator = None  # type: ignore
+            self._validator_cls = Draft202012Validator
+            self._validator_resolved = True
+        return self._validator_cls
+
+    @property
+    def full_validation(self) -> bool:
+        return self._validator_class() is not None
+
+    def has_schema(self, artifact_type: str) -> bool:
+        return artifact_type in self.schema_files
+
+    def _compile(self, artifact_type: str) -> Any:
+        validator = self._validators.get(artifact_type)
+        if validator is not None or artifact_type in self._schemas:
+            return validator
+        with self._lock:
+            if artifact_type in self._schemas:
+                return self._validators.get(artifact_type)
+            schema = load_schema(os.path.join(self.schema_dir, self.schema_files[artifact_type]))
+            validator_cls = self._validator_class()
+            if validator_cls is not None:
+                self._validators[artifact_type] = validator_cls(schema)
+            self._schemas[artifact_type] = schema
+        return self._validators.get(artifact_type)
+
+    def compile_all(self) -> List[str]:
+        for artifact_type in self.schema_files:
+            self._compile(artifact_type)
+        return sorted(self._schemas.keys())
+
+    def validate(self, artifact_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if artifact_type not in self.schema_files:
+            return {"valid": True, "errors": []}
+        validator = self._compile(artifact_type)
+        started = time.perf_counter()
+        if validator is not None:
+            if validator.is_valid(payload):
+                errors: List[str] = []
+            else:
+                found = sorted(validator.iter_errors(payload), key=lambda item: list(item.path))
+                errors = [_error_details(error) for error in found]
+        else:
+            missing = validate_required(self._schemas[artifact_type], payload)["missing"]
+            errors = [f"<root>: '{key}' is a required property" for key in missing]
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self._observe(artifact_type, elapsed_ms, bool(errors))
+        return {"valid": not errors, "errors": errors}
+
+    def _observe(self, artifact_type: str, elapsed_ms: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                artifact_type, {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            stats["count"] += 1
+            if failed:
+                stats["failures"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {name: dict(values) for name, values in self._stats.items()}
+        for values in snapshot.values():
+            count = values["count"]
+            values["mean_ms"] = values["total_ms"] / count if count else 0.0
+        return snapshot
+
+
+_REGISTRIES: Dict[str, SchemaRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_schema_registry(schema_dir: str) -> SchemaRegistry:
+    """Return the process-wide registry for a schema directory so validators compile once."""
+    key = os.path.abspath(schema_dir)
+    registry = _REGISTRIES.get(key)
+    if registry is not None:
+        return registry
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(key)
+        if registry is None:
+            registry = SchemaRegistry(key)
+            _REGISTRIES[key] = registry
+    return registry
@@ -0,0 +1,163 @@
+"""Monte Carlo dry runs of a compiled plan, sampling gate outcomes and phase durations from run history."""
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Iterable, List, Optional
+
+from .budget import BudgetLedger, PhaseCostModel
+from .classify_failure import failure_routes
+from .plan import ExecutionPlan, gate_trigger, phase_role, route_to_phase
+
+DEFAULT_SAMPLES = 200
+DEFAULT_HISTORY_RUNS = 500
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(pct: float) -> float:
+        return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+    return {
+        "p50": round(pick(50), 3),
+        "p90": round(pick(90), 3),
+        "p99": round(pick(99), 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class RunHistory:
+    """Per-phase samples extracted from meta-eval entries: durations, gate failure rates and reroute targets."""
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], plan: ExecutionPlan) -> None:
+        gated = {bound.phase for bound in plan.loop_bounds}
+        self.runs = 0
+        self.durations: Dict[str, List[float]] = {}
+        self.overheads: List[float] = []
+        self.executions: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self.reroutes: Dict[str, Dict[str, int]] = {}
+        for entry in entries:
+            timings = entry.get("timings") if isinstance(entry.get("timings"), dict) else {}
+            phases = [item for item in timings.get("phases", []) if isinstance(item, dict) and "phase" in item]
+            if not phases:
+                continue
+            self.runs += 1
+            phase_total = 0.0
+            # The classified route of each loop iteration names its reroute phase directly.
+            routed = [
+                item
+                for item in entry.get("failures") or []
+                if isinstance(item, dict) and item.get("phase") in gated and item.get("route")
+            ]
+            for failure in routed:
+                self._add_reroute(str(failure["phase"]), route_to_phase(str(failure["route"])))
+            last_seen: Dict[str, int] = {}
+            for position, item in enumerate(phases):
+                name = str(item["phase"])
+                duration = float(item.get("total_ms", 0.0) or 0.0)
+                phase_total += duration
+                self.durations.setdefault(name, []).append(duration)
+                self.executions[name] = self.executions.get(name, 0) + 1
+                # Entries without routes: a failing phase reruns in place before its reroute, so the reroute is
+                # the first other phase since the gated phase last ran.
+                if not routed and name in gated and name in last_seen:
+                    between = [str(other["phase"]) for other in phases[last_seen[name] + 1 : position]]
+                    reroute = next((other for other in between if other != name), None)
+                    if reroute is not None:
+                        self._add_reroute(name, reroute)
+                last_seen[name] = position
+            for name, count in (entry.get("loop_counts") or {}).items():
+                self.failures[str(name)] = self.failures.get(str(name), 0) + int(count or 0)
+            self.overheads.append(max(0.0, float(timings.get("total_ms", phase_total) or 0.0) - phase_total))
+
+    def _add_reroute(self, phase: str, target: str) -> None:
+        targets = self.reroutes.setdefault(phase, {})
+        targets[target] = targets.get(target, 0) + 1
+
+    def failure_rate(self, phase: str) -> float:
+        executions = self.executions.get(phase, 0)
+        if not executions:
+            return 0.0
+        return min(1.0, self.failures.get(phase, 0) / float(executions))
+
+    def duration(self, phase: str, rng: random.Random) -> float:
+        samples = self.durations.get(phase)
+        if not samples:
+            role = phase_role(phase)
+            samples = [value for name, values in self.durations.items() if phase_role(name) == role for value in values]
+        return rng.choice(samples) if samples else 0.0
+
+    def reroute(self, phase: str, rng: random.Random) -> str:
+        targets = self.reroutes.get(phase)
+        if not targets:
+            return route_to_phase(rng.choice(failure_routes()))
+        names = sorted(targets)
+        return rng.choices(names, weights=[targets[name] for name in names])[0]
+
+
+def simulate_plan(
+    plan: ExecutionPlan,
+    history: RunHistory,
+    budgets: Dict[str, Any],
+    cost_model: Optional[PhaseCostModel] = None,
+    samples: int = DEFAULT_SAMPLES,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Walk `plan` `samples` times without side effects and summarize wall time, steps, tokens and loops."""
+    rng = random.Random(seed)
+    wall_ms: List[float] = []
+    steps: List[float] = []
+    tokens: List[float] = []
+    loops: Dict[str, List[float]] = {bound.phase: [] for bound in plan.loop_bounds}
+    statuses: Dict[str, int] = {}
+    predictions = {phase: cost_model.predict(phase) if cost_model is not None else None for phase in plan.phases}
+    for _ in range(max(1, samples)):
+        ledger = BudgetLedger(budgets)
+        phases = list(plan.phases)
+        loop_counts: Dict[str, int] = {}
+        elapsed = rng.choice(history.overheads) if history.overheads else 0.0
+        status = "done"
+        idx = 0
+        while idx < len(phases):
+            phase = phases[idx]
+            if phase not in predictions:
+                predictions[phase] = cost_model.predict(phase) if cost_model is not None else None
+            predicted = predictions[phase] or {}
+            elapsed += history.duration(phase, rng)
+            if ledger.charge(phase_role(phase), steps=1, tokens=int(predicted.get("tokens", 0))):
+                status = "blocked"
+                break
+            rules = [plan.loop_for(phase, gate_trigger(gate_name)) for gate_name in plan.gates_for(phase)]
+            rule = next((item for item in rules if item is not None), None)
+            # The history yields one failure rate per phase, so a phase fails (or not) as a whole.
+            if rule is not None and rng.random() < history.failure_rate(phase):
+                count = loop_counts.get(phase, 0) + 1
+                loop_counts[phase] = count
+                if count <= rule.max_iterations:
+                    phases.insert(idx + 1, history.reroute(phase, rng))
+                    phases.insert(idx + 2, phase)
+                    continue
+            idx += 1
+        wall_ms.append(elapsed)
+        steps.append(ledger.total["steps"])
+        tokens.append(ledger.total["tokens"])
+        for phase in loops:
+            loops[phase].append(loop_counts.get(phase, 0))
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        "simulated": True,
+        "playbook": plan.name,
+        "samples": max(1, samples),
+        "history_runs": history.runs,
+        "wall_ms": _distribution(wall_ms),
+        "steps": _distribution(steps),
+        "tokens": _distribution(tokens),
+        "loop_counts": {phase: _distribution(values) for phase, values in loops.items()},
+        "gate_failure_rates": {phase: round(history.failure_rate(phase), 3) for phase in loops},
+        "status": statuses,
+        "worst_case_steps": plan.worst_case_steps,
+    }
@@ -4,10 +4,13 @@ from __future__ import annotations
 import os
 from typing import Any, Dict, List
 
-try:
-    import yaml  # type: ignore
-except Exception as exc:
-    raise RuntimeError("PyYAML is required to load skills.") from exc
+
+def _safe_load(stream: Any) -> Any:
+    try:
+        import yaml  # type: ignore
+    except Exception as exc:
+        raise RuntimeError("PyYAML is required to load skills.") from exc
+    return yaml.safe_load(stream)
 
 
 ALLOWED_EVENTS = {"pre_run", "pre_phase", "post_phase"}
@@ -84,7 +87,7 @@ def load_skills(skills_dir: str) -> List[Dict[str, Any]]:
             continue
         path = os.path.join(skills_dir, name)
         with open(path, "r", encoding="utf-8") as handle:
-            doc = yaml.safe_load(handle)
+            doc = _safe_load(handle)
         if not isinstance(doc, dict):
             continue
         if doc.get("enabled", True) is False:
@@ -102,7 +105,7 @@ def validate_skill_files(skills_dir: str) -> List[str]:
             continue
         path = os.path.join(skills_dir, name)
         with open(path, "r", encoding="utf-8") as handle:
-            doc = yaml.safe_load(handle)
+            doc = _safe_load(handle)
         errors.extend(_validate_skill_doc(doc, path))
     return errors
 
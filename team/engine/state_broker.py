@@ -1,22 +1,99 @@
 """File-backed state broker with versioned artifacts and summaries."""
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import shutil
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from .config import ARTIFACT_OWNERS
+from .deadline import CancelToken
+from .meta_eval_log import MetaEvalLog, get_meta_eval_log
+from .schema_validation import SchemaRegistry
+
+
+def content_hash(value: Any) -> str:
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def namespace_root(storage_dir: str, namespace: str) -> str:
+    """Directory of a broker namespace; ValueError unless it is a proper subdirectory of `storage_dir/namespaces`."""
+    root = os.path.realpath(os.path.join(storage_dir, "namespaces"))
+    segments = namespace.replace("\\", "/").split("/")
+    resolved = os.path.realpath(os.path.join(root, namespace))
+    if any(segment in ("", ".", "..") for segment in segments) or os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"Broker namespace {namespace!r} does not name a directory under {root}")
+    return os.path.join(storage_dir, "namespaces", namespace)
 
 
 class StateBroker:
-    def __init__(self, storage_dir: str) -> None:
+    def __init__(
+        self,
+        storage_dir: str,
+        schema_registry: Optional[SchemaRegistry] = None,
+        meta_eval_options: Optional[Dict[str, Any]] = None,
+        namespace: Optional[str] = None,
+    ) -> None:
         self.storage_dir = storage_dir
-        self.artifact_dir = os.path.join(storage_dir, "artifacts")
-        self.summary_dir = os.path.join(storage_dir, "summaries")
+        self.schema_registry = schema_registry
+        self.namespace = namespace
+        # A namespace isolates artifacts and summaries; the meta-eval log stays shared across namespaces.
+        # It is checked before anything writes there, since `drop_namespace` deletes the whole directory.
+        artifact_root = namespace_root(storage_dir, namespace) if namespace else storage_dir
+        self.artifact_dir = os.path.join(artifact_root, "artifacts")
+        self.summary_dir = os.path.join(artifact_root, "summaries")
         self.meta_eval_log = os.path.join(storage_dir, "meta_eval_log.jsonl")
+        self.io_stats: Dict[str, Dict[str, float]] = {
+            op: {"count": 0, "bytes": 0, "total_ms": 0.0} for op in ("read", "write")
+        }
+        self.io_observer: Optional[Callable[[str, int, float], None]] = None
+        # Set by the orchestrator for the duration of a run, so role subgraphs stop at their next broker call.
+        self.cancel_token: Optional[CancelToken] = None
+        self.meta_eval: MetaEvalLog = self._open_storage(meta_eval_options)
+
+    def _open_storage(self, meta_eval_options: Optional[Dict[str, Any]]) -> MetaEvalLog:
         os.makedirs(self.artifact_dir, exist_ok=True)
         os.makedirs(self.summary_dir, exist_ok=True)
+        return get_meta_eval_log(self.meta_eval_log, meta_eval_options)
+
+    def _observe_io(self, op: str, nbytes: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        stats = self.io_stats[op]
+        stats["count"] += 1
+        stats["bytes"] += nbytes
+        stats["total_ms"] += elapsed * 1000.0
+        if self.io_observer is not None:
+            self.io_observer(op, nbytes, elapsed)
+
+    def _check_cancel(self) -> None:
+        if self.cancel_token is not None:
+            self.cancel_token.check("broker")
+
+    def io_ms(self) -> float:
+        return self.io_stats["read"]["total_ms"] + self.io_stats["write"]["total_ms"]
+
+    def _write_json(self, path: str, value: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        text = json.dumps(value, indent=2)
+        # Write then rename so a concurrent run never reads a partially written artifact.
+        directory, name = os.path.split(path)
+        tmp_path = os.path.join(directory, f".{name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_path, path)
+        self._observe_io("write", len(text), started)
+
+    def _read_json(self, path: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as handle:
+            text = handle.read()
+        value = json.loads(text)
+        self._observe_io("read", len(text), started)
+        return value
 
     def _artifact_path(self, artifact_type: str, version: int) -> str:
         filename = f"{artifact_type}_v{version}.json"
@@ -42,6 +119,11 @@ class StateBroker:
     def latest_version(self, artifact_type: str) -> int:
         return self._latest_version(artifact_type)
 
+    def drop_namespace(self) -> None:
+        """Delete this namespace's artifacts and summaries (not the shared meta-eval log); the broker is done after."""
+        if self.namespace:
+            shutil.rmtree(os.path.dirname(self.artifact_dir), ignore_errors=True)
+
     def _summarize(self, artifact_type: str, value: Dict[str, Any]) -> Dict[str, Any]:
         purpose_map = {
             "SystemSpec": "Architecture source of truth.",
@@ -72,34 +154,55 @@ class StateBroker:
         }
 
     def write(self, artifact_type: str, value: Dict[str, Any], author: str) -> int:
+        self._check_cancel()
         owner = ARTIFACT_OWNERS.get(artifact_type)
         if owner and owner != author:
             raise PermissionError(f"{author} cannot write {artifact_type}; owner is {owner}.")
-        current_version = self._latest_version(artifact_type)
-        new_version = current_version + 1
         value = dict(value)
+        value.pop("version", None)
+        if self.schema_registry is not None:
+            # The broker assigns `version`, so validate the stored shape rather than whatever the caller passed.
+            validation = self.schema_registry.validate(artifact_type, {**value, "version": 0})
+            if not validation["valid"]:
+                details = "; ".join(validation["errors"][:3])
+                raise ValueError(f"{artifact_type} failed schema validation: {details}")
+        return self._persist(artifact_type, value, content_hash(value))
+
+    def _persist(self, artifact_type: str, value: Dict[str, Any], digest: str) -> int:
+        new_version = self._latest_version(artifact_type) + 1
         value["version"] = new_version
-        path = self._artifact_path(artifact_type, new_version)
-        with open(path, "w", encoding="utf-8") as handle:
-            json.dump(value, handle, indent=2)
+        self._write_json(self._artifact_path(artifact_type, new_version), value)
         summary = self._summarize(artifact_type, value)
-        with open(self._summary_path(artifact_type, new_version), "w", encoding="utf-8") as handle:
-            json.dump(summary, handle, indent=2)
+        summary["content_hash"] = digest
+        self._write_json(self._summary_path(artifact_type, new_version), summary)
         return new_version
 
+    def validation_stats(self) -> Dict[str, Dict[str, float]]:
+        if self.schema_registry is None:
+            return {}
+        return self.schema_registry.stats()
+
     def read_full(self, artifact_type: str, version: Optional[int] = None) -> Dict[str, Any]:
+        self._check_cancel()
         if version is None:
             version = self._latest_version(artifact_type)
-        path = self._artifact_path(artifact_type, version)
-        with open(path, "r", encoding="utf-8") as handle:
-            return json.load(handle)
+        return self._read_json(self._artifact_path(artifact_type, version))
 
     def read_summary(self, artifact_type: str, version: Optional[int] = None) -> Dict[str, Any]:
+        self._check_cancel()
         if version is None:
             version = self._latest_version(artifact_type)
-        path = self._summary_path(artifact_type, version)
-        with open(path, "r", encoding="utf-8") as handle:
-            return json.load(handle)
+        return self._read_json(self._summary_path(artifact_type, version))
+
+    def content_hash(self, artifact_type: str, version: Optional[int] = None) -> str:
+        """Hash of the artifact's content excluding `version`, so identical rewrites hash equal."""
+        summary = self.read_summary(artifact_type, version)
+        digest = summary.get("content_hash")
+        if isinstance(digest, str):
+            return digest
+        value = dict(self.read_full(artifact_type, version))
+        value.pop("version", None)
+        return content_hash(value)
 
     def read_for_role(self, artifact_type: str, role: str, version: Optional[int] = None) -> Dict[str, Any]:
         owner = ARTIFACT_OWNERS.get(artifact_type)
@@ -118,5 +221,47 @@ class StateBroker:
         return value
 
     def append_meta_eval(self, entry: Dict[str, Any]) -> None:
-        with open(self.meta_eval_log, "a", encoding="utf-8") as handle:
-            handle.write(json.dumps(entry) + "\n")
+        started = time.perf_counter()
+        line = self.meta_eval.append(entry)
+        self._observe_io("write", len(line), started)
+
+    def query_meta_eval(self, **filters: Any) -> Dict[str, Any]:
+        return self.meta_eval.aggregate(**filters)
+
+
+def build_state_broker(
+    storage_dir: str,
+    broker_cfg: Optional[Dict[str, Any]] = None,
+    schema_registry: Optional[SchemaRegistry] = None,
+    namespace: Optional[str] = None,
+) -> StateBroker:
+    """Broker for the profile's `state_broker` section: `backend: file` (default) or `postgres`."""
+    cfg = broker_cfg or {}
+    meta_eval_options = cfg.get("meta_eval_log") if isinstance(cfg.get("meta_eval_log"), dict) else None
+    backend = str(cfg.get("backend", "file"))
+    if backend == "postgres":
+        from .postgres_state import PostgresStateBroker, postgres_options
+
+        return PostgresStateBroker(
+            storage_dir,
+            postgres_options(cfg),
+            schema_registry=schema_registry,
+            meta_eval_options=meta_eval_options,
+            namespace=namespace,
+        )
+    if backend != "file":
+        raise ValueError(f"Unknown state_broker.backend: {backend}")
+    return StateBroker(
+        storage_dir, schema_registry=schema_registry, meta_eval_options=meta_eval_options, namespace=namespace
+    )
+
+
+def open_meta_eval_log(storage_dir: str, broker_cfg: Optional[Dict[str, Any]] = None) -> Any:
+    """The meta-eval log the configured backend writes to, without opening a broker."""
+    cfg = broker_cfg or {}
+    meta_eval_options = cfg.get("meta_eval_log") if isinstance(cfg.get("meta_eval_log"), dict) else None
+    if str(cfg.get("backend", "file")) == "postgres":
+        from .postgres_state import get_postgres_meta_eval_log, postgres_options
+
+        return get_postgres_meta_eval_log(postgres_options(cfg), meta_eval_options)
+    return get_meta_eval_log(os.path.join(storage_dir, "meta_eval_log.jsonl"), meta_eval_options)
@@ -4,10 +4,12 @@ from __future__ import annotations
 import os
 from typing import Any, Dict
 
-try:
-    import yaml  # type: ignore
-except Exception as exc:
-    raise RuntimeError("PyYAML is required to load system profiles.") from exc
+def _safe_load(stream: Any) -> Any:
+    try:
+        import yaml  # type: ignore
+    except Exception as exc:
+        raise RuntimeError("PyYAML is required to load system profiles.") from exc
+    return yaml.safe_load(stream)
 
 
 def _default_profile() -> Dict[str, Any]:
@@ -24,6 +26,61 @@ def _default_profile() -> Dict[str, Any]:
             "user_id": "default-user",
             "agent_id": "deepagent-graph",
         },
+        "state_broker": {
+            "strict_validation": False,
+            "backend": "file",
+        },
+        "budget_ledger": {
+            "predictive_stop": True,
+            "min_history": 3,
+        },
+        "gate_loops": {
+            "stall_detection": True,
+        },
+        "plan_compiler": {
+            "cache": True,
+            "budget_policy": "warn",
+        },
+        "run_cache": {
+            "ttl_s": 600,
+            "max_entries": 256,
+            "dedup_requests": False,
+            "persist": True,
+        },
+        "workers": {
+            "enabled": False,
+            "registry": "team/workers/workers.yaml",
+            "max_concurrency": 4,
+            "quorum": 0,
+            "timeout_s": 30.0,
+            "per_worker": {"max_tokens": 4000, "max_tool_calls": 5},
+        },
+        "deadlines": {
+            "run_s": 0,
+            "phase_s": 0,
+            "probe_interval_s": 0.25,
+        },
+        "event_log": {
+            "spill_after": 10000,
+            "spill_dir": "",
+            "max_response_events": 0,
+        },
+        "distributed": {
+            "enabled": False,
+            "redis_url": "redis://localhost:6379/0",
+            "stream_prefix": "deepagent",
+            "visibility_timeout_s": 300.0,
+            "max_attempts": 3,
+            "result_ttl_s": 3600.0,
+            "wait_timeout_s": 600.0,
+            "events_maxlen": 10000,
+            "local_workers": 0,
+        },
+        "memoization": {
+            "enabled": False,
+            "persistent": False,
+            "max_entries": 1000,
+        },
         "skills": {
             "directory": "team/skills",
             "enforce_exclusive": True,
@@ -42,7 +99,7 @@ def load_system_profile(repo_root: str) -> Dict[str, Any]:
     if not os.path.isfile(path):
         return _default_profile()
     with open(path, "r", encoding="utf-8") as handle:
-        doc = yaml.safe_load(handle)
+        doc = _safe_load(handle)
     if not isinstance(doc, dict):
         return _default_profile()
     merged = _default_profile()
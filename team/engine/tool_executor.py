@@ -0,0 +1,407 @@
+"""Tool-call executor enforcing the latest ToolContract: result caching, rate limits, retries and call dedup."""
+from __future__ import annotations
+
+import copy
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .deadline import RunCancelled
+from .state_broker import content_hash
+
+# Contract sections read per tool. A scalar in a section is a default for every tool; a mapping keyed by a
+# tool name overrides it for that tool (e.g. `retries: {max_attempts: 2, search: {max_attempts: 5}}`).
+DEFAULT_POLICIES: Dict[str, Dict[str, Any]] = {
+    "caching": {"ttl_s": 0.0, "max_entries": 256},
+    "retries": {"max_attempts": 1, "base_delay_s": 0.1, "max_delay_s": 5.0, "retry_on": []},
+    "idempotency": {"dedupe": True, "key_fields": []},
+    "rate_limits": {"rate_per_s": 0.0, "burst": 1, "max_wait_s": 30.0},
+}
+
+ToolFn = Callable[..., Any]
+
+_CANCEL_POLL_S = 0.25
+# Result handed to dedup followers when the leader's run stopped: they re-execute instead of sharing the stop.
+_ABANDONED = object()
+
+_TOOLS: Dict[str, ToolFn] = {}
+_OBSERVERS: List[Callable[[Dict[str, Any]], None]] = []
+
+
+class RateLimited(RuntimeError):
+    """A call would have waited longer than the tool's `rate_limits.max_wait_s` for a token."""
+
+
+def register_tool(name: str, fn: ToolFn) -> None:
+    """Install the implementation of a contract tool for every executor in this process."""
+    _TOOLS[name] = fn
+
+
+def add_tool_observer(observer: Callable[[Dict[str, Any]], None]) -> None:
+    """Receive the timing event of every tool call made in this process (e.g. to export metrics)."""
+    _OBSERVERS.append(observer)
+
+
+def contract_tools(contract: Dict[str, Any]) -> Set[str]:
+    """Declared tool names; entries are names or objects with a `name` (or `id`)."""
+    names: Set[str] = set()
+    tools = contract.get("tools", [])
+    if isinstance(tools, list):
+        for item in tools:
+            if isinstance(item, str):
+                names.add(item)
+            elif isinstance(item, dict):
+                tool_name = item.get("name") or item.get("id")
+                if isinstance(tool_name, str):
+                    names.add(tool_name)
+    return names
+
+
+def tool_policy(contract: Dict[str, Any], tool: str) -> Dict[str, Dict[str, Any]]:
+    """Effective caching, retries, idempotency and rate_limits settings of one tool."""
+    policy: Dict[str, Dict[str, Any]] = {}
+    for section, defaults in DEFAULT_POLICIES.items():
+        raw = contract.get(section) if isinstance(contract.get(section), dict) else {}
+        shared = {key: value for key, value in raw.items() if key in defaults}
+        override = raw.get(tool) if isinstance(raw.get(tool), dict) else {}
+        policy[section] = {**defaults, **shared, **override}
+    return policy
+
+
+class TokenBucket:
+    """`rate_per_s` tokens per second up to `burst`; `reserve` hands out tokens in order and says how long to wait."""
+
+    def __init__(self, rate_per_s: float, burst: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = float(rate_per_s)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait_s: float) -> Optional[float]:
+        """Take a token, possibly on credit; returns the wait before using it, or None if that exceeds `max_wait_s`."""
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+            if wait > max_wait_s:
+                return None
+            self.tokens -= 1.0
+            return wait
+
+
+class TTLCache:
+    """Thread-safe LRU of results that expire `ttl_s` after they were stored."""
+
+    def __init__(self, ttl_s: float, max_entries: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_s = float(ttl_s)
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if self._clock() >= entry[0]:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _Waiter:
+    """Future facade for a dedup follower: cancelling the wait must not cancel the leader's call."""
+
+    def __init__(self, future: Future) -> None:
+        self._future = future
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self._future.result(timeout)
+
+    def cancel(self) -> bool:
+        return False
+
+
+class ToolExecutor:
+    """Runs tool calls under a ToolContract's per-tool policies.
+
+    A call is keyed by its tool and arguments (only `idempotency.key_fields` when set), or by an explicit
+    `idempotency_key`. With `caching.ttl_s` a successful result is reused until it expires. With
+    `idempotency.dedupe` a call identical to one still running waits for that call instead of executing (and
+    executes after all if that call's own run is cancelled).
+    Executions take a `rate_limits` token first (waiting up to `max_wait_s`, else `RateLimited`). Failures
+    are retried up to `retries.max_attempts` with full-jitter exponential backoff, only for exception types
+    named in `retry_on` when it is set. Each call emits a timing event to `observer` and the process
+    observers; `stats()` aggregates them per tool. Results are shared between callers: treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        contract: Optional[Dict[str, Any]] = None,
+        tools: Optional[Dict[str, ToolFn]] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.tools: Dict[str, ToolFn] = dict(tools or {})
+        self.observer: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self.load_contract(contract or {})
+
+    def load_contract(self, contract: Dict[str, Any]) -> None:
+        """Switch to another contract version; caches and rate-limit state restart under the new policies."""
+        with self._lock:
+            self.contract = contract
+            self.version = int(contract.get("version", 0) or 0)
+            self.declared = contract_tools(contract)
+            self._policies: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            self._caches: Dict[str, TTLCache] = {}
+            self._buckets: Dict[str, TokenBucket] = {}
+            self._in_flight: Dict[str, Future] = {}
+
+    def register(self, name: str, fn: ToolFn) -> None:
+        self.tools[name] = fn
+
+    def policy(self, tool: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            policy = self._policies.get(tool)
+            if policy is None:
+                policy = self._policies[tool] = tool_policy(self.contract, tool)
+            return policy
+
+    def _cache(self, tool: str, caching: Dict[str, Any]) -> Optional[TTLCache]:
+        if float(caching["ttl_s"] or 0) <= 0:
+            return None
+        with self._lock:
+            cache = self._caches.get(tool)
+            if cache is None:
+                cache = self._caches[tool] = TTLCache(caching["ttl_s"], caching["max_entries"], self._clock)
+            return cache
+
+    def _bucket(self, tool: str, limits: Dict[str, Any]) -> Optional[TokenBucket]:
+        if float(limits["rate_per_s"] or 0) <= 0:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(tool)
+            if bucket is None:
+                bucket = self._buckets[tool] = TokenBucket(limits["rate_per_s"], limits["burst"], self._clock)
+            return bucket
+
+    def call_key(self, tool: str, args: Dict[str, Any], idempotency_key: Optional[str] = None) -> str:
+        if idempotency_key:
+            return f"{tool}:key:{idempotency_key}"
+        fields = self.policy(tool)["idempotency"]["key_fields"]
+        keyed = {name: args.get(name) for name in fields} if fields else args
+        return f"{tool}:{content_hash(keyed)}"
+
+    def _resolve(self, tool: str) -> ToolFn:
+        if self.declared and tool not in self.declared:
+            raise ValueError(f"tool {tool!r} is not declared in ToolContract v{self.version}")
+        fn = self.tools.get(tool) or _TOOLS.get(tool)
+        if fn is None:
+            raise ValueError(f"no implementation registered for tool {tool!r}")
+        return fn
+
+    def call(
+        self,
+        tool: str,
+        args: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+        cancel: Any = None,
+    ) -> Any:
+        """Execute `tool(**args)` under its policies and return the result (raising its last error).
+
+        `cancel` (a run's `CancelToken`) stops the call between attempts and during rate-limit or backoff waits.
+        """
+        args = dict(args or {})
+        fn = self._resolve(tool)
+        policy = self.policy(tool)
+        key = self.call_key(tool, args, idempotency_key)
+        started = time.perf_counter()
+        event: Dict[str, Any] = {"tool": tool, "key": key, "attempts": 0, "wait_ms": 0.0}
+        try:
+            cache = self._cache(tool, policy["caching"])
+            while True:
+                if cache is not None:
+                    hit, value = cache.get(key)
+                    if hit:
+                        event["outcome"] = "cached"
+                        return value
+                leader: Optional[Future] = None
+                running: Optional[Future] = None
+                if bool(policy["idempotency"]["dedupe"]):
+                    with self._lock:
+                        running = self._in_flight.get(key)
+                        if running is None:
+                            leader = self._in_flight[key] = Future()
+                if running is None:
+                    break
+                value = self._await(tool, running, cancel)
+                if value is not _ABANDONED:
+                    event["outcome"] = "deduped"
+                    return value
+                # The leader's own run was cancelled; that says nothing about this call, so take it over.
+            try:
+                value = self._execute(tool, fn, args, policy, event, cancel)
+            except BaseException as exc:
+                self._release(key, leader, _ABANDONED if isinstance(exc, RunCancelled) else exc)
+                raise
+            if cache is not None:
+                cache.put(key, value)
+            self._release(key, leader, value)
+            event["outcome"] = "executed"
+            return value
+        except RateLimited:
+            event["outcome"] = "rate_limited"
+            raise
+        except BaseException as exc:
+            event.setdefault("outcome", "error")
+            event["error"] = type(exc).__name__
+            raise
+        finally:
+            event["elapsed_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+            event["wait_ms"] = round(event["wait_ms"], 3)
+            self._emit(event)
+
+    def _release(self, key: str, leader: Optional[Future], outcome: Any) -> None:
+        # Free the slot before waking followers, so one abandoned by the leader starts a fresh call.
+        if leader is None:
+            return
+        with self._lock:
+            if self._in_flight.get(key) is leader:
+                del self._in_flight[key]
+        if isinstance(outcome, BaseException):
+            leader.set_exception(outcome)
+        else:
+            leader.set_result(outcome)
+
+    @staticmethod
+    def _await(tool: str, future: Future, cancel: Any) -> Any:
+        if cancel is not None:
+            # Waiters don't own the shared call: on cancel they leave it running for the others.
+            return cancel.wait(f"tool:{tool}", _Waiter(future))
+        return future.result()
+
+    def _pause(self, tool: str, seconds: float, token: Any) -> None:
+        if seconds <= 0:
+            return
+        if token is None:
+            self._sleep(seconds)
+            return
+        # Sleep in slices so a deadline or a probed cancel request ends the wait early. Time is measured on the
+        # injected clock; with the default sleep a slice waits on the token's event so a cancel wakes it at once.
+        until = self._clock() + seconds
+        while True:
+            token.check(f"tool:{tool}")
+            left = until - self._clock()
+            if left <= 0:
+                return
+            remaining = token.remaining()
+            step = min(left, _CANCEL_POLL_S, remaining if remaining is not None else left)
+            if self._sleep is time.sleep:
+                token.event.wait(step)
+            else:
+                self._sleep(step)
+
+    def _execute(
+        self,
+        tool: str,
+        fn: ToolFn,
+        args: Dict[str, Any],
+        policy: Dict[str, Dict[str, Any]],
+        event: Dict[str, Any],
+        cancel: Any,
+    ) -> Any:
+        retries = policy["retries"]
+        limits = policy["rate_limits"]
+        attempts = max(1, int(retries["max_attempts"] or 1))
+        retry_on = set(retries["retry_on"] or [])
+        bucket = self._bucket(tool, limits)
+        for attempt in range(1, attempts + 1):
+            if cancel is not None:
+                cancel.check(f"tool:{tool}")
+            if bucket is not None:
+                wait = bucket.reserve(float(limits["max_wait_s"]))
+                if wait is None:
+                    raise RateLimited(f"{tool}: rate limit of {limits['rate_per_s']}/s exceeded")
+                event["wait_ms"] += wait * 1000.0
+                self._pause(tool, wait, cancel)
+            event["attempts"] = attempt
+            try:
+                return fn(**copy.deepcopy(args))
+            except Exception as exc:
+                if attempt >= attempts or (retry_on and type(exc).__name__ not in retry_on):
+                    raise
+            # Full jitter: a uniform delay up to the exponential backoff spreads retries of concurrent callers.
+            backoff = min(float(retries["max_delay_s"]), float(retries["base_delay_s"]) * 2 ** (attempt - 1))
+            delay = self._rng.uniform(0.0, backoff)
+            event["wait_ms"] += delay * 1000.0
+            self._pause(tool, delay, cancel)
+        raise AssertionError("unreachable")
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                event["tool"],
+                {"calls": 0, "executed": 0, "cached": 0, "deduped": 0, "errors": 0, "attempts": 0, "total_ms": 0.0},
+            )
+            stats["calls"] += 1
+            outcome = event["outcome"]
+            if outcome in ("executed", "cached", "deduped"):
+                stats[outcome] += 1
+            else:
+                stats["errors"] += 1
+            stats["attempts"] += event["attempts"]
+            stats["total_ms"] = round(stats["total_ms"] + event["elapsed_ms"], 3)
+        for observer in ([self.observer] if self.observer else []) + _OBSERVERS:
+            try:
+                observer(dict(event))
+            except Exception:
+                pass  # observers are instrumentation; a failing one must not fail the call
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {tool: dict(values) for tool, values in self._stats.items()}
+
+
+_EXECUTORS: Dict[Tuple[str, Optional[str]], Tuple[int, ToolExecutor]] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def tool_executor(broker: Any) -> ToolExecutor:
+    """The process's executor for `broker`'s storage and namespace, following its latest ToolContract.
+
+    Runs sharing a broker share its caches, rate limits and in-flight calls; pass the run's
+    `broker.cancel_token` as `cancel` to each call.
+    """
+    key = (str(broker.storage_dir), broker.namespace)
+    version = broker.latest_version("ToolContract")
+    with _EXECUTORS_LOCK:
+        loaded, executor = _EXECUTORS.get(key) or (-1, ToolExecutor())
+        if loaded != version:
+            executor.load_contract(broker.read_full("ToolContract", version) if version else {})
+            _EXECUTORS[key] = (version, executor)
+    return executor
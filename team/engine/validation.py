@@ -0,0 +1,516 @@
+"""In-process repository validation engine with shared inputs and content-hash caching."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:
+    raise RuntimeError("PyYAML is required to run validation checks.") from exc
+
+from .md_skills import load_markdown_skills, markdown_target_roles, validate_markdown_skills
+from .schema_validation import SchemaRegistry
+from .skills import _validate_skill_doc, hook_target_roles, load_skills
+from .system_profile import load_system_profile, resolve_skills_dir
+
+# 2: entries written without jsonschema (required-key checks only) must not count as passes.
+CACHE_FORMAT_VERSION = 2
+
+TEMPLATE_SCHEMAS: Dict[str, str] = {
+    "constraint_pack.schema.json": "constraint_pack.yaml",
+    "system_spec.schema.json": "system_spec.yaml",
+    "tool_contract.schema.json": "tool_contract.yaml",
+    "eval_spec.schema.json": "eval_spec.yaml",
+    "experiment_report.schema.json": "experiment_report.yaml",
+    "experiment_spec.schema.json": "experiment_spec.yaml",
+    "promotion_decision.schema.json": "promotion_decision.yaml",
+    "telemetry_spec.schema.json": "telemetry_spec.yaml",
+    "slo_report.schema.json": "slo_report.yaml",
+    "compilation_report.schema.json": "compilation_report.yaml",
+    "compiled_spec.schema.json": "compiled_spec.yaml",
+    "prompt_pack.schema.json": "prompt_pack.yaml",
+}
+
+# Engine sources whose logic is baked into cached results; editing them invalidates the cache.
+_CODE_FILES = ("validation.py", "skills.py", "md_skills.py", "schema_validation.py")
+
+
+@dataclass
+class CheckResult:
+    name: str
+    lines: List[str] = field(default_factory=list)
+    failures: int = 0
+    checked: int = 0
+    cached: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return self.failures == 0
+
+
+class ContentCache:
+    """Remembers fingerprints of inputs that last validated cleanly."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path and os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    doc = json.load(handle)
+            except (OSError, ValueError):
+                doc = {}
+            if isinstance(doc, dict) and doc.get("version") == CACHE_FORMAT_VERSION:
+                entries = doc.get("entries", {})
+                if isinstance(entries, dict):
+                    self._entries = {str(key): str(value) for key, value in entries.items()}
+
+    def hit(self, key: str, fingerprint: str) -> bool:
+        with self._lock:
+            return self._entries.get(key) == fingerprint
+
+    def remember(self, key: str, fingerprint: str) -> None:
+        with self._lock:
+            if self._entries.get(key) != fingerprint:
+                self._entries[key] = fingerprint
+                self._dirty = True
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            payload = {"version": CACHE_FORMAT_VERSION, "entries": dict(sorted(self._entries.items()))}
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class ValidationContext:
+    """Shared inputs for one validation pass: profile, schemas and memoized file reads."""
+
+    def __init__(self, repo_root: str, cache: Optional[ContentCache] = None) -> None:
+        self.repo_root = os.path.abspath(repo_root)
+        self.team_dir = os.path.join(self.repo_root, "team")
+        self.schema_dir = os.path.join(self.team_dir, "schemas")
+        self.playbook_dir = os.path.join(self.team_dir, "playbooks")
+        self.template_dir = os.path.join(self.team_dir, "templates")
+        self.profile = load_system_profile(self.repo_root)
+        self.skills_dir = resolve_skills_dir(self.repo_root, self.profile)
+        self.cache = cache if cache is not None else ContentCache()
+        schema_files = {}
+        if os.path.isdir(self.schema_dir):
+            schema_files = {name: name for name in os.listdir(self.schema_dir) if name.endswith(".schema.json")}
+        self.schemas = SchemaRegistry(self.schema_dir, schema_files=schema_files)
+        if not self.schemas.full_validation:
+            # The registry's required-key fallback suits artifact writes, not checks whose passes are cached.
+            raise RuntimeError("jsonschema is required to run validation checks (pip install jsonschema).")
+        self._digests: Dict[str, str] = {}
+        self._docs: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        engine_dir = os.path.dirname(os.path.abspath(__file__))
+        self.code_digest = self.fingerprint(*(os.path.join(engine_dir, name) for name in _CODE_FILES))
+
+    def digest(self, path: str) -> str:
+        cached = self._digests.get(path)
+        if cached is not None:
+            return cached
+        try:
+            with open(path, "rb") as handle:
+                value = hashlib.sha256(handle.read()).hexdigest()
+        except OSError:
+            value = "missing"
+        with self._lock:
+            self._digests[path] = value
+        return value
+
+    def fingerprint(self, *paths: str) -> str:
+        hasher = hashlib.sha256()
+        hasher.update(getattr(self, "code_digest", "").encode("utf-8"))
+        for path in paths:
+            hasher.update(path.encode("utf-8"))
+            hasher.update(self.digest(path).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def load_yaml(self, path: str) -> Any:
+        if path in self._docs:
+            return self._docs[path]
+        with open(path, "r", encoding="utf-8") as handle:
+            doc = yaml.safe_load(handle)
+        with self._lock:
+            self._docs[path] = doc
+        return doc
+
+    def skill_files(self) -> List[str]:
+        if not os.path.isdir(self.skills_dir):
+            return []
+        paths: List[str] = []
+        for root, _, files in os.walk(self.skills_dir):
+            for name in sorted(files):
+                if name.endswith(".yaml") or name.lower().endswith(".md"):
+                    paths.append(os.path.join(root, name))
+        return sorted(paths)
+
+    def profile_paths(self) -> List[str]:
+        primary = os.path.join(self.team_dir, "config", "system_profile.yaml")
+        docker = os.path.join(self.team_dir, "config", "system_profile.docker.yaml")
+        paths = [primary]
+        if os.path.isfile(docker):
+            paths.append(docker)
+        return paths
+
+    def watched_paths(self) -> List[str]:
+        paths = list(self.profile_paths())
+        for directory in (self.schema_dir, self.playbook_dir, self.template_dir):
+            if os.path.isdir(directory):
+                paths.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory)))
+        paths.extend(self.skill_files())
+        return paths
+
+
+def _schema_errors(ctx: ValidationContext, schema_file: str, payload: Any) -> List[str]:
+    return ctx.schemas.validate(schema_file, payload)["errors"]
+
+
+def _is_list_of_strings(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def validate_playbook_references(data: Dict[str, Any]) -> List[str]:
+    errors: List[str] = []
+    phases = data.get("phases", [])
+    allowed_external = {"classify_failure", "gate_rerun", "apply_promotion"}
+    for item in data.get("gate_requirements", []):
+        phase = item.get("phase")
+        if phase not in phases:
+            errors.append(f"gate_requirements phase not in phases: {phase}")
+        gates = item.get("gates")
+        if not _is_list_of_strings(gates):
+            errors.append(f"gate_requirements gates must be list of strings for phase {phase}")
+    for item in data.get("allowed_loops", []):
+        from_phase = item.get("from_phase")
+        to_phase = item.get("to_phase")
+        if from_phase not in phases and from_phase not in allowed_external:
+            errors.append(f"allowed_loops from_phase not in phases: {from_phase}")
+        if to_phase not in phases and to_phase not in allowed_external:
+            errors.append(f"allowed_loops to_phase not in phases: {to_phase}")
+        if not isinstance(item.get("max_iterations"), int):
+            errors.append(f"allowed_loops max_iterations must be int for {from_phase}")
+        if not isinstance(item.get("trigger_condition"), str):
+            errors.append(f"allowed_loops trigger_condition must be string for {from_phase}")
+    return errors
+
+
+def check_system_profile(ctx: ValidationContext) -> CheckResult:
+    result = CheckResult(name="system_profile")
+    schema_path = os.path.join(ctx.schema_dir, "system_profile.schema.json")
+    for profile_path in ctx.profile_paths():
+        if not os.path.isfile(profile_path):
+            result.failures += 1
+            result.lines.append(f"FAIL missing profile file: {profile_path}")
+            continue
+        result.checked += 1
+        key = f"system_profile:{os.path.relpath(profile_path, ctx.repo_root)}"
+        fingerprint = ctx.fingerprint(profile_path, schema_path)
+        profile = ctx.load_yaml(profile_path)
+        if not isinstance(profile, dict):
+            result.failures += 1
+            result.lines.append(f"FAIL profile must be a top-level mapping/object: {profile_path}")
+            continue
+        if ctx.cache.hit(key, fingerprint):
+            result.cached += 1
+        else:
+            errors = _schema_errors(ctx, "system_profile.schema.json", profile)
+            if errors:
+                result.failures += 1
+                for err in errors[:5]:
+                    result.lines.append(f"FAIL {err} in {profile_path}")
+                result.lines.append(f"\n{len(errors)} profile validation error(s) found.")
+                ctx.cache.forget(key)
+                continue
+            ctx.cache.remember(key, fingerprint)
+        skills_dir = profile.get("skills", {}).get("directory")
+        if isinstance(skills_dir, str):
+            resolved = skills_dir if os.path.isabs(skills_dir) else os.path.join(ctx.repo_root, skills_dir)
+            if not os.path.isdir(resolved):
+                result.failures += 1
+                result.lines.append(f"FAIL skills.directory does not exist in {profile_path}: {resolved}")
+    if not result.failures:
+        result.lines.append("System profiles passed validation.")
+    return result
+
+
+def check_playbooks(ctx: ValidationContext) -> CheckResult:
+    result = CheckResult(name="playbooks")
+    schema_path = os.path.join(ctx.schema_dir, "playbook.schema.json")
+    for name in sorted(os.listdir(ctx.playbook_dir)):
+        if not name.endswith(".yaml"):
+            continue
+        result.checked += 1
+        path = os.path.join(ctx.playbook_dir, name)
+        key = f"playbooks:{name}"
+        fingerprint = ctx.fingerprint(path, schema_path)
+        if ctx.cache.hit(key, fingerprint):
+            result.cached += 1
+            result.lines.append(f"OK   {name} (cached)")
+            continue
+        data = ctx.load_yaml(path)
+        if not isinstance(data, dict):
+            result.failures += 1
+            result.lines.append(f"FAIL {name}: playbook must be a mapping/object at the top level")
+            ctx.cache.forget(key)
+            continue
+        schema_errors = _schema_errors(ctx, "playbook.schema.json", data)
+        ref_errors = validate_playbook_references(data)
+        if schema_errors or ref_errors:
+            result.failures += 1
+            details = schema_errors[:3] + ref_errors
+            result.lines.append(f"FAIL {name}: " + "; ".join(details))
+            ctx.cache.forget(key)
+        else:
+            result.lines.append(f"OK   {name}")
+            ctx.cache.remember(key, fingerprint)
+    if result.failures:
+        result.lines.append(f"\n{result.failures} playbook(s) failed validation.")
+    else:
+        result.lines.append("\nAll playbooks passed validation.")
+    return result
+
+
+def check_templates(ctx: ValidationContext) -> CheckResult:
+    result = CheckResult(name="templates")
+    for schema_file, template_file in TEMPLATE_SCHEMAS.items():
+        result.checked += 1
+        schema_path = os.path.join(ctx.schema_dir, schema_file)
+        template_path = os.path.join(ctx.template_dir, template_file)
+        key = f"templates:{template_file}"
+        fingerprint = ctx.fingerprint(template_path, schema_path)
+        if ctx.cache.hit(key, fingerprint):
+            result.cached += 1
+            result.lines.append(f"OK   {template_file} (cached)")
+            continue
+        data = ctx.load_yaml(template_path)
+        if not isinstance(data, dict):
+            result.failures += 1
+            result.lines.append(f"FAIL {template_file}: must contain a top-level mapping/object")
+            ctx.cache.forget(key)
+            continue
+        errors = _schema_errors(ctx, schema_file, data)
+        if errors:
+            result.failures += 1
+            result.lines.append(f"FAIL {template_file}: " + "; ".join(errors[:3]))
+            ctx.cache.forget(key)
+        else:
+            result.lines.append(f"OK   {template_file}")
+            ctx.cache.remember(key, fingerprint)
+    if result.failures:
+        result.lines.append(f"\n{result.failures} template(s) failed schema validation.")
+    else:
+        result.lines.append("\nAll templates passed schema validation.")
+    return result
+
+
+def check_skills(ctx: ValidationContext) -> CheckResult:
+    result = CheckResult(name="skills")
+    if not os.path.isdir(ctx.skills_dir):
+        result.failures += 1
+        result.lines.append(f"FAIL skills directory does not exist: {ctx.skills_dir}")
+        return result
+    schema_path = os.path.join(ctx.schema_dir, "skill.schema.json")
+    invariant_errors: List[str] = []
+    for name in sorted(os.listdir(ctx.skills_dir)):
+        if not name.endswith(".yaml"):
+            continue
+        result.checked += 1
+        path = os.path.join(ctx.skills_dir, name)
+        key = f"skills:{name}"
+        fingerprint = ctx.fingerprint(path, schema_path)
+        if ctx.cache.hit(key, fingerprint):
+            result.cached += 1
+            result.lines.append(f"OK   {name} (cached)")
+            continue
+        doc = ctx.load_yaml(path)
+        local_errors = _validate_skill_doc(doc, path)
+        invariant_errors.extend(local_errors)
+        if not isinstance(doc, dict):
+            result.failures += 1
+            result.lines.append(f"FAIL {name}: skill must be a mapping/object")
+            ctx.cache.forget(key)
+            continue
+        errors = _schema_errors(ctx, "skill.schema.json", doc)
+        if errors:
+            result.failures += 1
+            result.lines.append(f"FAIL {name}: " + "; ".join(errors[:3]))
+        else:
+            result.lines.append(f"OK   {name}")
+        if errors or local_errors:
+            ctx.cache.forget(key)
+        else:
+            ctx.cache.remember(key, fingerprint)
+    for error in invariant_errors:
+        result.failures += 1
+        result.lines.append(f"FAIL invariant: {error}")
+    if result.failures:
+        result.lines.append(f"\n{result.failures} skill validation error(s) found.")
+    else:
+        result.lines.append("\nAll skills passed validation.")
+    return result
+
+
+def check_markdown_skills(ctx: ValidationContext) -> CheckResult:
+    result = CheckResult(name="markdown_skills")
+    if not os.path.isdir(ctx.skills_dir):
+        result.failures += 1
+        result.lines.append(f"FAIL skills directory does not exist: {ctx.skills_dir}")
+        return result
+    md_paths = [path for path in ctx.skill_files() if path.lower().endswith(".md")]
+    result.checked = len(md_paths)
+    key = "markdown_skills"
+    fingerprint = ctx.fingerprint(*md_paths)
+    if ctx.cache.hit(key, fingerprint):
+        result.cached = len(md_paths)
+        result.lines.append("All markdown skills passed validation. (cached)")
+        return result
+    errors = validate_markdown_skills(ctx.skills_dir)
+    if errors:
+        result.failures = len(errors)
+        result.lines.extend(f"FAIL {err}" for err in errors)
+        result.lines.append(f"\n{len(errors)} markdown skill validation error(s) found.")
+        ctx.cache.forget(key)
+        return result
+    ctx.cache.remember(key, fingerprint)
+    result.lines.append("All markdown skills passed validation.")
+    return result
+
+
+def skill_exclusivity_failures(
+    profile: Dict[str, Any], yaml_skills: List[Dict[str, Any]], md_skills: List[Dict[str, Any]]
+) -> List[str]:
+    skills_cfg: Dict[str, Any] = profile.get("skills", {}) if isinstance(profile.get("skills"), dict) else {}
+    declared_modes: Dict[str, Any] = (
+        skills_cfg.get("role_mode", {}) if isinstance(skills_cfg.get("role_mode"), dict) else {}
+    )
+    declared_roles: List[str] = sorted(str(role) for role in declared_modes.keys())
+    hook_roles = set(hook_target_roles(yaml_skills))
+    md_roles = set(markdown_target_roles(md_skills, all_roles=declared_roles))
+
+    require_declared = bool(skills_cfg.get("require_declared_roles", True))
+    if require_declared:
+        undeclared = sorted((hook_roles.union(md_roles)).difference(set(declared_roles)))
+        if undeclared:
+            return ["FAIL undeclared role targets detected:"] + [f"- {role}" for role in undeclared]
+
+    enforce_exclusive = bool(skills_cfg.get("enforce_exclusive", True))
+    if enforce_exclusive:
+        overlap = sorted(hook_roles.intersection(md_roles))
+        if overlap:
+            lines = ["FAIL role exclusivity violation:", "Roles configured with both hook and markdown skills:"]
+            return lines + [f"- {role}" for role in overlap]
+
+    mode_failures: List[str] = []
+    for role, mode_raw in declared_modes.items():
+        role_name = str(role)
+        mode = str(mode_raw).strip().lower()
+        has_hook = role_name in hook_roles
+        has_md = role_name in md_roles
+        if mode == "hook" and not has_hook:
+            mode_failures.append(f"{role_name}: mode=hook but no hook skill targets this role")
+        if mode == "hook" and has_md:
+            mode_failures.append(f"{role_name}: mode=hook but markdown skills target this role")
+        if mode == "markdown" and not has_md:
+            mode_failures.append(f"{role_name}: mode=markdown but no markdown skill targets this role")
+        if mode == "markdown" and has_hook:
+            mode_failures.append(f"{role_name}: mode=markdown but hook skills target this role")
+        if mode == "none" and (has_hook or has_md):
+            mode_failures.append(f"{role_name}: mode=none but skills still target this role")
+        if mode not in {"hook", "markdown", "none"}:
+            mode_failures.append(f"{role_name}: invalid mode '{mode_raw}'")
+    if mode_failures:
+        return ["FAIL role mode policy violations:"] + [f"- {item}" for item in mode_failures]
+    return []
+
+
+def check_skill_exclusivity(ctx: ValidationContext) -> CheckResult:
+    result = CheckResult(name="skill_exclusivity")
+    profile_source = os.getenv("SYSTEM_PROFILE_PATH", "").strip() or os.path.join(
+        "team", "config", "system_profile.yaml"
+    )
+    profile_path = profile_source if os.path.isabs(profile_source) else os.path.join(ctx.repo_root, profile_source)
+    skill_paths = ctx.skill_files()
+    result.checked = len(skill_paths) + 1
+    key = "skill_exclusivity"
+    fingerprint = ctx.fingerprint(profile_path, *skill_paths)
+    if ctx.cache.hit(key, fingerprint):
+        result.cached = result.checked
+        result.lines.append("Skill exclusivity and role mode policy checks passed. (cached)")
+        return result
+    failures = skill_exclusivity_failures(
+        ctx.profile, load_skills(ctx.skills_dir), load_markdown_skills(ctx.skills_dir)
+    )
+    if failures:
+        result.failures = 1
+        result.lines.extend(failures)
+        ctx.cache.forget(key)
+        return result
+    ctx.cache.remember(key, fingerprint)
+    result.lines.append("Skill exclusivity and role mode policy checks passed.")
+    return result
+
+
+CHECKS: Dict[str, Callable[[ValidationContext], CheckResult]] = {
+    "system_profile": check_system_profile,
+    "playbooks": check_playbooks,
+    "templates": check_templates,
+    "skills": check_skills,
+    "markdown_skills": check_markdown_skills,
+    "skill_exclusivity": check_skill_exclusivity,
+}
+
+
+def _timed(check: Callable[[ValidationContext], CheckResult], ctx: ValidationContext) -> CheckResult:
+    started = time.perf_counter()
+    try:
+        result = check(ctx)
+    except Exception as exc:
+        result = CheckResult(name=check.__name__.replace("check_", ""), failures=1)
+        result.lines.append(f"FAIL {type(exc).__name__}: {exc}")
+    result.elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return result
+
+
+def run_validation(
+    ctx: ValidationContext, names: Optional[List[str]] = None, max_workers: Optional[int] = None
+) -> List[CheckResult]:
+    """Run the selected checks concurrently against one shared context and persist the cache."""
+    selected = [CHECKS[name] for name in (names or list(CHECKS.keys()))]
+    workers = max_workers or len(selected)
+    if workers <= 1:
+        results = [_timed(check, ctx) for check in selected]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda check: _timed(check, ctx), selected))
+    ctx.cache.save()
+    return results
+
+
+def report(result: CheckResult) -> int:
+    for line in result.lines:
+        print(line)
+    return 0 if result.passed else 1
@@ -0,0 +1,219 @@
+"""Role worker fan-out: bounded concurrent sub-tasks, spawn budgets, straggler cancellation, deterministic merge."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .budget import estimate_payload_tokens
+
+DEFAULT_REGISTRY_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "workers", "workers.yaml")
+)
+
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "enabled": False,
+    "max_concurrency": 4,
+    "quorum": 0,
+    "timeout_s": 30.0,
+    "per_worker": {"max_tokens": 4000, "max_tool_calls": 5},
+}
+
+_REGISTRIES: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class WorkerTask:
+    worker_id: str
+    role: str
+    task: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    budget: Dict[str, Any] = field(default_factory=dict)
+
+
+WorkerHandler = Callable[[WorkerTask, threading.Event], Dict[str, Any]]
+
+_HANDLERS: Dict[str, WorkerHandler] = {}
+
+
+def register_worker(worker_id: str, handler: WorkerHandler) -> None:
+    """Install the handler for a worker id; unregistered workers use the scaffold stub."""
+    _HANDLERS[worker_id] = handler
+
+
+def _stub_worker(task: WorkerTask, cancel: threading.Event) -> Dict[str, Any]:
+    subject = task.payload.get("artifact", task.role)
+    runtime = task.payload.get("runtime_target", "langgraph")
+    return {
+        "worker_id": task.worker_id,
+        "task": task.task,
+        "findings": [f"{task.worker_id} reviewed {subject} for {runtime}"],
+        "proposed_changes": [],
+        "risks": [],
+        "confidence": 0.5,
+    }
+
+
+def load_worker_registry(path: Optional[str] = None) -> Dict[str, Tuple[str, ...]]:
+    """Declared workers per role from `team/workers/workers.yaml`, loaded once per process."""
+    key = os.path.abspath(path or DEFAULT_REGISTRY_PATH)
+    registry = _REGISTRIES.get(key)
+    if registry is not None:
+        return registry
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(key)
+        if registry is None:
+            registry = {}
+            if os.path.isfile(key):
+                try:
+                    import yaml  # type: ignore
+                except Exception as exc:
+                    raise RuntimeError("PyYAML is required to load the worker registry.") from exc
+                with open(key, "r", encoding="utf-8") as handle:
+                    doc = yaml.safe_load(handle) or {}
+                workers = doc.get("workers", {}) if isinstance(doc, dict) else {}
+                if not isinstance(workers, dict):
+                    raise ValueError(f"{key}: `workers` must map roles to worker lists")
+                for role, names in workers.items():
+                    if not isinstance(names, list):
+                        raise ValueError(f"{key}: workers for {role} must be a list")
+                    registry[str(role)] = tuple(str(name) for name in names)
+            _REGISTRIES[key] = registry
+    return registry
+
+
+def _as_strings(value: Any) -> List[str]:
+    if not isinstance(value, list):
+        return []
+    return [str(item) for item in value if str(item).strip()]
+
+
+def _normalize(task: WorkerTask, output: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(output, dict):
+        return None
+    try:
+        confidence = min(1.0, max(0.0, float(output.get("confidence", 0.0))))
+    except (TypeError, ValueError):
+        return None
+    return {
+        "worker_id": task.worker_id,
+        "task": str(output.get("task", task.task)),
+        "findings": _as_strings(output.get("findings")),
+        "proposed_changes": _as_strings(output.get("proposed_changes")),
+        "risks": _as_strings(output.get("risks")),
+        "confidence": confidence,
+    }
+
+
+def _unique(items: List[str]) -> List[str]:
+    seen = set()
+    ordered = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            ordered.append(item)
+    return ordered
+
+
+def merge_outputs(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge accepted worker outputs in task order, so the artifact does not depend on completion order."""
+    accepted = [record["output"] for record in records if record["status"] == "ok"]
+    return {
+        "workers": [
+            {key: record[key] for key in ("worker_id", "task", "status") if key in record} for record in records
+        ],
+        "findings": _unique([item for output in accepted for item in output["findings"]]),
+        "proposed_changes": _unique([item for output in accepted for item in output["proposed_changes"]]),
+        "risks": _unique([item for output in accepted for item in output["risks"]]),
+        "confidence": round(sum(output["confidence"] for output in accepted) / len(accepted), 3) if accepted else 0.0,
+    }
+
+
+def fan_out(
+    tasks: List[WorkerTask], max_spawns: Optional[int] = None, options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Run `tasks` on a bounded thread pool and return per-task records, the merged output and spawn usage.
+
+    At most `max_spawns` tasks start (None is unbounded); the rest are recorded as `skipped`. Once `quorum`
+    tasks succeed (0 waits for all) or `timeout_s` passes, queued tasks are cancelled and running ones are
+    signalled through their cancel event and ignored. A result over its per-worker token or tool-call budget
+    is rejected. Spawns count started tasks only.
+    """
+    opts = {**DEFAULT_OPTIONS, **(options or {})}
+    per_worker = opts.get("per_worker") if isinstance(opts.get("per_worker"), dict) else {}
+    limit = len(tasks) if max_spawns is None else max(0, min(len(tasks), int(max_spawns)))
+    records: List[Dict[str, Any]] = [
+        {"worker_id": task.worker_id, "task": task.task, "status": "skipped"} for task in tasks
+    ]
+    usage = {"spawns": 0, "tokens": 0, "tool_calls": 0}
+    if not limit:
+        return {"records": records, "merged": merge_outputs(records), "usage": usage}
+    cancel = threading.Event()
+    lock = threading.Lock()
+
+    def execute(index: int) -> Dict[str, Any]:
+        task = tasks[index]
+        with lock:
+            usage["spawns"] += 1
+            records[index]["status"] = "running"
+        started = time.perf_counter()
+        output = _HANDLERS.get(task.worker_id, _stub_worker)(task, cancel)
+        record: Dict[str, Any] = {"elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3)}
+        reported = output.pop("usage", {}) if isinstance(output, dict) else {}
+        reported = reported if isinstance(reported, dict) else {}
+        tokens = int(reported.get("tokens", 0) or 0) or estimate_payload_tokens(output)
+        tool_calls = int(reported.get("tool_calls", 0) or 0)
+        record.update(tokens=tokens, tool_calls=tool_calls)
+        normalized = _normalize(task, output)
+        max_tokens = int(per_worker.get("max_tokens", 0) or 0)
+        max_tool_calls = int(per_worker.get("max_tool_calls", 0) or 0)
+        if normalized is None:
+            record["status"] = "invalid"
+        elif (max_tokens and tokens > max_tokens) or (max_tool_calls and tool_calls > max_tool_calls):
+            record["status"] = "over_budget"
+        else:
+            record.update(status="ok", output=normalized)
+        return record
+
+    quorum = int(opts.get("quorum", 0) or 0)
+    timeout_s = float(opts.get("timeout_s", 0) or 0)
+    deadline = time.monotonic() + timeout_s if timeout_s else None
+    pool = ThreadPoolExecutor(max_workers=max(1, min(int(opts.get("max_concurrency", 1) or 1), limit)))
+    futures: Dict[Future, int] = {pool.submit(execute, index): index for index in range(limit)}
+    pending = set(futures)
+    succeeded = 0
+    stopped = "cancelled"
+    try:
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                stopped = "timed_out"
+                break
+            for future in done:
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:  # a failing worker must not fail the role
+                    result = {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+                with lock:
+                    records[index].update(result)
+                    usage["tokens"] += int(result.get("tokens", 0))
+                    usage["tool_calls"] += int(result.get("tool_calls", 0))
+                succeeded += result["status"] == "ok"
+            if quorum and succeeded >= quorum:
+                break
+    finally:
+        cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+    with lock:
+        # Stragglers may still finish in the background; their results are discarded.
+        for future in pending:
+            records[futures[future]]["status"] = stopped
+        snapshot = [dict(record) for record in records]
+        spent = dict(usage)
+    return {"records": snapshot, "merged": merge_outputs(snapshot), "usage": spent}
@@ -0,0 +1,249 @@
+"""Batch runner: streams JSONL requests through a process pool with one isolated broker namespace per run."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, IO, Iterator, List, Optional, Set
+
+from team.engine.deadline import build_cancel_token
+from team.orchestrator.orchestrator import Orchestrator
+
+_WORKER: Optional[Orchestrator] = None
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+_ENVELOPE = ("id", "playbook", "runtime", "deadline_s", "phase_deadline_s")
+
+
+def _init_worker(repo_root: str) -> None:
+    """Create the worker's orchestrator; its profile, skills and memory adapter are then reused across runs."""
+    global _WORKER
+    _WORKER = Orchestrator(repo_root)
+
+
+def _segment(value: str) -> str:
+    """One path segment for `value`; ids that had to be rewritten (or are only dots) get a hash suffix."""
+    safe = _UNSAFE.sub("_", value)
+    if safe == value and safe.strip("."):
+        return safe
+    return f"{safe.strip('.') or '_'}-{hashlib.sha256(value.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _namespace(batch_id: str, run_id: str) -> str:
+    return f"batch/{_segment(batch_id)}/{_segment(run_id)}"
+
+
+def run_one(task: Dict[str, Any]) -> Dict[str, Any]:
+    if _WORKER is None:
+        _init_worker(task["repo_root"])
+    orchestrator: Orchestrator = _WORKER  # type: ignore[assignment]
+    record: Dict[str, Any] = {
+        "id": task["id"],
+        "playbook": task["playbook"],
+        "runtime_target": task["request"].get("runtime_target", ""),
+        "namespace": task["namespace"],
+        "pid": os.getpid(),
+    }
+    started = time.perf_counter()
+    try:
+        orchestrator.reset(broker_namespace=task["namespace"])
+        cancel = build_cancel_token(orchestrator.deadline_cfg, task.get("deadline_s"), task.get("phase_deadline_s"))
+        result = orchestrator.run(task["playbook"], dict(task["request"]), cancel=cancel)
+        record.update(
+            status=result.get("status", "unknown"),
+            steps_used=orchestrator.state.steps_used,
+            artifacts={name: entry.get("version") for name, entry in result.get("artifacts", {}).items()},
+        )
+        for key in ("budget_stop", "stopped_at"):
+            if result.get(key):
+                record[key] = result[key]
+        if task.get("full"):
+            record["result"] = result
+    except Exception as exc:  # one bad request must not take down the batch
+        record.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    finally:
+        # Pool workers exit without running atexit hooks, so flush the buffered meta-eval entry per run.
+        orchestrator.broker.meta_eval.flush()
+        if task.get("drop_namespace"):
+            orchestrator.broker.drop_namespace()
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+    return record
+
+
+def read_tasks(
+    stream: IO[str],
+    repo_root: str,
+    batch_id: str,
+    playbook: str,
+    runtime: str,
+    full: bool = False,
+    drop_namespaces: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one task per non-empty line.
+
+    A line is either an envelope (`id`, `playbook`, `runtime`, `deadline_s`, `phase_deadline_s`, `request`)
+    or a bare request object; the id defaults to the line number.
+    """
+    for lineno, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        doc = json.loads(line)
+        if not isinstance(doc, dict):
+            raise ValueError(f"line {lineno}: expected a JSON object")
+        if isinstance(doc.get("request"), dict):
+            request = dict(doc["request"])
+        else:
+            request = {key: value for key, value in doc.items() if key not in _ENVELOPE}
+        request["runtime_target"] = str(doc.get("runtime") or request.get("runtime_target") or runtime)
+        run_id = str(doc.get("id", lineno))
+        yield {
+            "id": run_id,
+            "repo_root": repo_root,
+            "playbook": str(doc.get("playbook") or playbook),
+            "request": request,
+            "namespace": _namespace(batch_id, run_id),
+            "deadline_s": doc.get("deadline_s"),
+            "phase_deadline_s": doc.get("phase_deadline_s"),
+            "full": full,
+            "drop_namespace": drop_namespaces,
+        }
+
+
+def recorded_runs(output_path: str) -> Dict[str, Dict[str, Any]]:
+    """The last record per id in a previous (possibly interrupted) output file."""
+    records: Dict[str, Dict[str, Any]] = {}
+    if not output_path or output_path == "-" or not os.path.isfile(output_path):
+        return records
+    with open(output_path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from an interrupted run
+            if isinstance(record, dict):
+                records[str(record.get("id"))] = record
+    return records
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """Ids already recorded in a previous output file; ids whose last record is an error are retried."""
+    return {run_id for run_id, record in recorded_runs(output_path).items() if record.get("status") != "error"}
+
+
+def _rewrite(output_path: str, records: List[Dict[str, Any]]) -> None:
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record, default=str) + "\n")
+    os.replace(tmp_path, output_path)
+
+
+def _stats(records: List[Dict[str, Any]], skipped: int, wall_s: float) -> Dict[str, Any]:
+    latencies = sorted(float(record["elapsed_ms"]) for record in records)
+    statuses: Dict[str, int] = {}
+    for record in records:
+        statuses[str(record["status"])] = statuses.get(str(record["status"]), 0) + 1
+
+    def pick(pct: float) -> float:
+        return latencies[min(len(latencies) - 1, int(pct / 100.0 * len(latencies)))] if latencies else 0.0
+
+    return {
+        "runs": len(records),
+        "skipped": skipped,
+        "status": statuses,
+        "wall_s": round(wall_s, 3),
+        "runs_per_s": round(len(records) / wall_s, 3) if wall_s > 0 else 0.0,
+        "latency_ms": {
+            "p50": pick(50),
+            "p90": pick(90),
+            "p99": pick(99),
+            "max": latencies[-1] if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        },
+    }
+
+
+def run_batch(
+    repo_root: str,
+    stream: IO[str],
+    output_path: str = "-",
+    workers: Optional[int] = None,
+    playbook: str = "build",
+    runtime: str = "langgraph",
+    resume: bool = False,
+    full: bool = False,
+    batch_id: Optional[str] = None,
+    drop_namespaces: bool = False,
+) -> Dict[str, Any]:
+    """Run every request in `stream`, appending one JSON record per finished run to `output_path`.
+
+    `workers=0` runs in-process. With `resume`, ids already recorded in `output_path` are skipped; the file is
+    first rewritten to one record per id, and an id whose last record is an error loses that record once it is
+    retried. With `drop_namespaces`, each run's broker namespace is deleted after its record is taken.
+    """
+    if batch_id is None:
+        batch_id = os.path.splitext(os.path.basename(output_path))[0] if output_path not in ("", "-") else "stdout"
+    done: Set[str] = set()
+    failed: Dict[str, Dict[str, Any]] = {}
+    if resume and output_path not in ("", "-"):
+        kept: List[Dict[str, Any]] = []
+        for run_id, record in recorded_runs(output_path).items():
+            if record.get("status") == "error":
+                failed[run_id] = record
+            else:
+                done.add(run_id)
+                kept.append(record)
+        if os.path.isfile(output_path):
+            _rewrite(output_path, kept)
+    tasks = read_tasks(stream, repo_root, batch_id, playbook, runtime, full=full, drop_namespaces=drop_namespaces)
+    out = sys.stdout if output_path in ("", "-") else open(output_path, "a" if resume else "w", encoding="utf-8")
+    records: List[Dict[str, Any]] = []
+    skipped = 0
+    started = time.perf_counter()
+
+    def emit(record: Dict[str, Any]) -> None:
+        records.append(record)
+        out.write(json.dumps(record, default=str) + "\n")
+        out.flush()
+
+    try:
+        if workers == 0:
+            _init_worker(repo_root)
+            for task in tasks:
+                if task["id"] in done:
+                    skipped += 1
+                    continue
+                failed.pop(task["id"], None)
+                emit(run_one(task))
+        else:
+            max_workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker, initargs=(repo_root,)
+            ) as pool:
+                pending: Set[Future] = set()
+                for task in tasks:
+                    if task["id"] in done:
+                        skipped += 1
+                        continue
+                    failed.pop(task["id"], None)
+                    # Bound in-flight work so huge inputs stream instead of being queued all at once.
+                    if len(pending) >= max_workers * 2:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            emit(future.result())
+                    pending.add(pool.submit(run_one, task))
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        emit(future.result())
+    finally:
+        if out is not sys.stdout:
+            # Errors that were not retried (absent from this input, or not reached) keep their record.
+            for record in failed.values():
+                out.write(json.dumps(record, default=str) + "\n")
+            out.close()
+    return _stats(records, skipped, time.perf_counter() - started)
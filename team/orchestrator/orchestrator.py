@@ -2,36 +2,70 @@
 from __future__ import annotations
 
 import argparse
+import collections
+import copy
+import importlib
 import json
 import os
 import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-if REPO_ROOT not in sys.path:
+if not __package__ and REPO_ROOT not in sys.path:
+    # Only when run as a script; importing the package leaves sys.path alone.
     sys.path.insert(0, REPO_ROOT)
 
+from team.engine.budget import BudgetLedger, PhaseCostModel, estimate_payload_tokens  # noqa: E402
 from team.engine.classify_failure import classify_failure  # noqa: E402
-from team.engine.config import STANDARD_BUILD_BUDGETS  # noqa: E402
+from team.engine.config import ROLE_INPUT_ARTIFACTS, STANDARD_BUILD_BUDGETS  # noqa: E402
+from team.engine.deadline import CancelToken, RunCancelled, build_cancel_token  # noqa: E402
+from team.engine.event_log import EventLog, EventView  # noqa: E402
 from team.engine.gather_constraints import gather_constraints  # noqa: E402
 from team.engine.gates import human_gate, production_gate, quality_gate  # noqa: E402
-from team.engine.memory import build_memory_adapter  # noqa: E402
+from team.engine.instrumentation import PhaseTimer, RunProfiler  # noqa: E402
+from team.engine.memory import MemoryAdapter, build_memory_adapter, submit_memory_call  # noqa: E402
 from team.engine.md_skills import load_markdown_skills, resolve_markdown_skill_context  # noqa: E402
 from team.engine.skills import apply_skill_hooks, load_skills  # noqa: E402
-from team.engine.schema_validation import load_schema, validate_required  # noqa: E402
-from team.engine.state_broker import StateBroker  # noqa: E402
+from team.engine.schema_validation import get_schema_registry, load_schema, validate_required  # noqa: E402
+from team.engine.state_broker import StateBroker, build_state_broker, content_hash  # noqa: E402
 from team.engine.system_profile import load_system_profile, resolve_skills_dir, role_skill_mode  # noqa: E402
-from team.engine.promotion import apply_promotion  # noqa: E402
-from team.subgraphs.role_subgraphs import (  # noqa: E402
-    run_architect,
-    run_compiler,
-    run_eval,
-    run_optimizer,
-    run_ops,
-    run_prompt_policy,
-    run_tooling,
+from team.engine.plan import (  # noqa: E402
+    ExecutionPlan,
+    check_plan_budgets,
+    compile_playbook,
+    gate_trigger,
+    phase_role,
+    route_to_phase,
 )
+from team.engine.promotion import apply_promotions  # noqa: E402
+from team.engine.simulate import DEFAULT_HISTORY_RUNS, DEFAULT_SAMPLES, RunHistory, simulate_plan  # noqa: E402
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from team.engine.memo import PhaseMemo
+
+# Role subgraphs are imported on first dispatch so validation calls and health probes never load them.
+ROLE_RUNNERS: Dict[str, str] = {
+    "architect": "run_architect",
+    "prompt_policy": "run_prompt_policy",
+    "tooling": "run_tooling",
+    "eval": "run_eval",
+    "optimizer": "run_optimizer",
+    "ops": "run_ops",
+    "compiler": "run_compiler",
+}
+_RUNNERS: Dict[str, Callable[[Dict[str, Any], StateBroker], Dict[str, Any]]] = {}
+
+
+def role_runner(role: str) -> Callable[[Dict[str, Any], StateBroker], Dict[str, Any]]:
+    runner = _RUNNERS.get(role)
+    if runner is None:
+        module = importlib.import_module("team.subgraphs.role_subgraphs")
+        runner = getattr(module, ROLE_RUNNERS[role])
+        _RUNNERS[role] = runner
+    return runner
 
 
 def _load_yaml(text: str) -> Dict[str, Any]:
@@ -45,31 +79,126 @@ def _load_yaml(text: str) -> Dict[str, Any]:
 @dataclass
 class OrchestratorState:
     status: str = "running"
-    routing_trace: List[Dict[str, str]] = field(default_factory=list)
-    history: List[Dict[str, str]] = field(default_factory=list)
+    events: EventLog = field(default_factory=EventLog)
     budgets: Dict[str, Any] = field(default_factory=lambda: STANDARD_BUILD_BUDGETS.copy())
     artifacts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     steps_used: int = 0
     budget_exhausted: bool = False
+    budget_stop: str = ""
     role_steps: Dict[str, int] = field(default_factory=dict)
     loop_counts: Dict[str, int] = field(default_factory=dict)
+    loop_cap_hits: Dict[str, int] = field(default_factory=dict)
+    loop_fingerprints: Dict[str, List[str]] = field(default_factory=dict)
+    loop_stalls: Dict[str, int] = field(default_factory=dict)
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+    gate_results: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    pending_promotions: List[int] = field(default_factory=list)
+    memo_hits: int = 0
+    stopped_at: str = ""
+    timings: Dict[str, Any] = field(default_factory=dict)
+
+    # Both render from the same events on access; `routing_trace` adds the time offset.
+    @property
+    def routing_trace(self) -> EventView:
+        return self.events.routing_trace
+
+    @property
+    def history(self) -> EventView:
+        return self.events.history
 
 
 class Orchestrator:
-    def __init__(self, repo_root: str) -> None:
+    def __init__(self, repo_root: str, profile_run: bool = False, broker_namespace: Optional[str] = None) -> None:
         self.repo_root = repo_root
+        self.profile_run = profile_run
         self.playbook_dir = os.path.join(repo_root, "team", "playbooks")
         self.profile = load_system_profile(repo_root)
         self.skills_dir = resolve_skills_dir(repo_root, self.profile)
         self.schema_dir = os.path.join(repo_root, "team", "schemas")
-        self.state = OrchestratorState()
+        self.event_cfg = self.profile.get("event_log", {}) if isinstance(self.profile.get("event_log"), dict) else {}
+        self.state = OrchestratorState(events=self._event_log())
         storage_dir = os.path.join(repo_root, "team", "state_broker")
-        self.broker = StateBroker(storage_dir)
-        self.skills = load_skills(self.skills_dir)
-        self.md_skills = load_markdown_skills(self.skills_dir)
-        self.memory = build_memory_adapter(self.profile)
+        self.broker_cfg = (
+            self.profile.get("state_broker", {}) if isinstance(self.profile.get("state_broker"), dict) else {}
+        )
+        schema_registry = None
+        if bool(self.broker_cfg.get("strict_validation", False)):
+            schema_registry = get_schema_registry(self.schema_dir)
+        self.broker = build_state_broker(
+            storage_dir, self.broker_cfg, schema_registry=schema_registry, namespace=broker_namespace
+        )
+        self.profile_dir = os.path.join(storage_dir, "profiles")
+        ledger_cfg = self.profile.get("budget_ledger", {}) if isinstance(self.profile.get("budget_ledger"), dict) else {}
+        self.predictive_stop = bool(ledger_cfg.get("predictive_stop", True))
+        self.cost_model = PhaseCostModel(
+            os.path.join(storage_dir, "phase_costs.json"), min_samples=int(ledger_cfg.get("min_history", 3))
+        )
+        self.ledger = BudgetLedger(self.state.budgets)
+        self.memo_cfg = self.profile.get("memoization", {}) if isinstance(self.profile.get("memoization"), dict) else {}
+        self.memo_path = os.path.join(storage_dir, "phase_memo.json")
+        self.memo: Optional[PhaseMemo] = None
+        loops_cfg = self.profile.get("gate_loops", {}) if isinstance(self.profile.get("gate_loops"), dict) else {}
+        self.stall_detection = bool(loops_cfg.get("stall_detection", True))
+        self.plan_cfg = self.profile.get("plan_compiler", {}) if isinstance(self.profile.get("plan_compiler"), dict) else {}
+        self.worker_cfg = self.profile.get("workers", {}) if isinstance(self.profile.get("workers"), dict) else {}
+        self.deadline_cfg = self.profile.get("deadlines", {}) if isinstance(self.profile.get("deadlines"), dict) else {}
+        self.cancel_token = CancelToken()
+        self.timer = PhaseTimer()
+        self._skills: Optional[List[Dict[str, Any]]] = None
+        self._md_skills: Optional[List[Dict[str, Any]]] = None
+        self._memory: Optional[MemoryAdapter] = None
+        self._memory_records: List[Future[Any]] = []
         self.memory_cfg = self.profile.get("memory", {}) if isinstance(self.profile.get("memory"), dict) else {}
 
+    # Skills and the memory adapter are loaded on first use; runs that stop early or only simulate skip them.
+    @property
+    def skills(self) -> List[Dict[str, Any]]:
+        if self._skills is None:
+            self._skills = load_skills(self.skills_dir)
+        return self._skills
+
+    @skills.setter
+    def skills(self, value: List[Dict[str, Any]]) -> None:
+        self._skills = value
+
+    @property
+    def md_skills(self) -> List[Dict[str, Any]]:
+        if self._md_skills is None:
+            self._md_skills = load_markdown_skills(self.skills_dir)
+        return self._md_skills
+
+    @md_skills.setter
+    def md_skills(self, value: List[Dict[str, Any]]) -> None:
+        self._md_skills = value
+
+    @property
+    def memory(self) -> MemoryAdapter:
+        if self._memory is None:
+            self._memory = build_memory_adapter(self.profile)
+        return self._memory
+
+    @memory.setter
+    def memory(self, value: MemoryAdapter) -> None:
+        self._memory = value
+
+    def reset(self, broker_namespace: Optional[str] = None) -> None:
+        """Start a fresh run state, optionally in another broker namespace, keeping the preloaded context."""
+        self.state.events.close()
+        self.state = OrchestratorState(budgets=copy.deepcopy(STANDARD_BUILD_BUDGETS), events=self._event_log())
+        if broker_namespace != self.broker.namespace:
+            self.broker = build_state_broker(
+                self.broker.storage_dir,
+                self.broker_cfg,
+                schema_registry=self.broker.schema_registry,
+                namespace=broker_namespace,
+            )
+
+    def _event_log(self) -> EventLog:
+        spill_dir = str(self.event_cfg.get("spill_dir", "") or "")
+        if spill_dir and not os.path.isabs(spill_dir):
+            spill_dir = os.path.join(self.repo_root, spill_dir)
+        return EventLog(int(self.event_cfg.get("spill_after", 10000)), spill_dir)
+
     def load_playbook(self, name: str) -> Dict[str, Any]:
         path = os.path.join(self.playbook_dir, f"{name}.yaml")
         with open(path, "r", encoding="utf-8") as handle:
@@ -83,69 +212,47 @@ class Orchestrator:
             raise ValueError(f"Playbook {name} missing required keys: {missing}")
         return data
 
-    @staticmethod
-    def _allowed_loop(allowed_loops: List[Dict[str, Any]], from_phase: str, trigger: str) -> Optional[Dict[str, Any]]:
-        for entry in allowed_loops:
-            if entry.get("from_phase") == from_phase and entry.get("trigger_condition") == trigger:
-                return entry
-        return None
+    def load_plan(self, name: str) -> ExecutionPlan:
+        return compile_playbook(
+            self.playbook_dir, name, self.schema_dir, use_cache=bool(self.plan_cfg.get("cache", True))
+        )
+
+    def _loop_fingerprint(self, phase: str, gate_name: str, route: str, failure_signals: Any) -> str:
+        """Identify a loop iteration by its failure and the content (not version numbers) of current artifacts."""
+        artifacts = {}
+        for artifact_type, entry in sorted(self.state.artifacts.items()):
+            try:
+                artifacts[artifact_type] = self.broker.content_hash(artifact_type, entry.get("version"))
+            except (OSError, ValueError):
+                artifacts[artifact_type] = f"v{entry.get('version')}"
+        return content_hash(
+            {"phase": phase, "gate": gate_name, "route": route, "signals": failure_signals, "artifacts": artifacts}
+        )
 
     @staticmethod
     def _gate_trigger(gate_name: str) -> str:
-        if gate_name == "quality_gate":
-            return "quality_gate_fail"
-        if gate_name == "production_gate":
-            return "production_gate_fail"
-        if gate_name == "compilation_gate":
-            return "compilation_fail"
-        return "gate_fail"
+        return gate_trigger(gate_name)
 
     @staticmethod
     def _route_to_phase(route: str) -> str:
-        mapping = {
-            "architect": "architect",
-            "prompt_policy": "prompt_policy",
-            "tooling": "tooling",
-            "eval": "eval_smoke",
-            "optimizer": "optimizer",
-            "ops": "ops_instrument",
-            "compiler": "compile",
-        }
-        return mapping.get(route, "architect")
+        return route_to_phase(route)
 
     @staticmethod
     def _phase_role(phase: str) -> str:
-        if phase.startswith("eval"):
-            return "eval"
-        if phase.startswith("ops"):
-            return "ops"
-        if phase.startswith("optimizer"):
-            return "optimizer"
-        if phase.startswith("compile"):
-            return "compiler"
-        if phase.startswith("human_gate"):
-            return "orchestrator"
-        if phase == "gather_constraints":
-            return "orchestrator"
-        if phase == "prompt_policy":
-            return "prompt_policy"
-        if phase == "tooling":
-            return "tooling"
-        if phase == "architect":
-            return "architect"
-        if phase == "apply_promotion":
-            return "orchestrator"
-        return "orchestrator"
+        return phase_role(phase)
 
     def _record(self, phase: str, decision: str, outcome: str) -> None:
-        self.state.routing_trace.append(
-            {"phase": phase, "decision": decision, "reason": outcome}
-        )
-        self.state.history.append({"phase": phase, "decision": decision, "outcome": outcome})
+        self.state.events.append(phase, decision, outcome, self.timer.offset_ms())
+
+    def _trace_window(self, offset: int, limit: Optional[int]) -> Dict[str, Any]:
+        if limit is None:
+            limit = int(self.event_cfg.get("max_response_events", 0) or 0)
+        return self.state.events.window(offset, limit or None)
 
     def _apply_skills(
         self, event: str, playbook_name: str, request: Dict[str, Any], phase: str = "", role: str = "orchestrator"
     ) -> None:
+        self.cancel_token.check(f"skills_{event}")
         if role_skill_mode(self.profile, role) != "hook":
             return
         context = {
@@ -159,25 +266,44 @@ class Orchestrator:
             location = phase or event
             self._record(location, "skill_hook", note)
 
-    def _consume_budget(self, role: str) -> None:
-        self.state.steps_used += 1
-        max_steps = self.state.budgets.get("global", {}).get("max_steps", 0)
-        if max_steps and self.state.steps_used > max_steps:
-            self.state.budget_exhausted = True
-            self.state.status = "blocked"
-        role_steps = self.state.role_steps.get(role, 0) + 1
-        self.state.role_steps[role] = role_steps
-        role_budget = self.state.budgets.get("per_role", {}).get(role, {})
-        role_max_steps = role_budget.get("max_steps", 0)
-        if role_max_steps and role_steps > role_max_steps:
-            self.state.budget_exhausted = True
-            self.state.status = "blocked"
-
-    def _fetch_adaptive_memory(
+    def _exhaust_budget(self, limit: str) -> None:
+        self.state.budget_exhausted = True
+        self.state.status = "blocked"
+        if not self.state.budget_stop:
+            self.state.budget_stop = limit
+
+    def _consume_budget(self, role: str, tokens: int = 0) -> None:
+        exceeded = self.ledger.charge(role, steps=1, tokens=tokens)
+        self.state.steps_used = self.ledger.total["steps"]
+        self.state.role_steps[role] = self.ledger.per_role[role]["steps"]
+        if exceeded:
+            self._exhaust_budget(exceeded)
+
+    def _report_usage(self, phase: str, result: Dict[str, Any]) -> None:
+        usage = result.get("usage")
+        if not isinstance(usage, dict):
+            return
+        exceeded = self.ledger.charge(
+            self._phase_role(phase),
+            tokens=int(usage.get("tokens", 0) or 0),
+            tool_calls=int(usage.get("tool_calls", 0) or 0),
+            spawns=int(usage.get("spawns", 0) or 0),
+        )
+        if usage.get("spawns"):
+            self._record(phase, "workers", f"spawns={int(usage['spawns'])}")
+        if exceeded:
+            self._exhaust_budget(exceeded)
+
+    def _start_memory_fetch(
         self, *, role: str, phase: str, playbook: str, runtime_target: str, request: Dict[str, Any]
-    ) -> List[str]:
+    ) -> Optional[Future[Any]]:
+        """Start the phase's memory fetch on the memory loop; the caller resolves skills meanwhile."""
         if not bool(self.memory_cfg.get("enabled", False)):
-            return []
+            return None
+        # The previous phase's record lands first, so a fetch sees the same entries as a sequential run would.
+        with self.timer.step("memory_record"):
+            self._drain_memory_records()
+        self.cancel_token.check("memory_fetch")
         top_k = int(self.memory_cfg.get("top_k", 3))
         user_constraints = request.get("user_constraints", {})
         query = ""
@@ -185,7 +311,9 @@ class Orchestrator:
             query = json.dumps(user_constraints, sort_keys=True)
         else:
             query = str(request.get("user_constraints", ""))
-        return self.memory.fetch(
+        return submit_memory_call(
+            self.memory,
+            "fetch",
             role=role,
             phase=phase,
             playbook=playbook,
@@ -223,14 +351,25 @@ class Orchestrator:
         if score < min_score:
             return
         summary = f"phase={phase} gates={','.join(gate_names) if gate_names else 'none'} pass={passed} score={score:.2f}"
-        self.memory.record(
-            role=role,
-            phase=phase,
-            playbook=playbook,
-            runtime_target=runtime_target,
-            outcome={"summary": summary, "pass": passed, "score": score},
+        self.cancel_token.check("memory_record")
+        # Not awaited here: the record overlaps post-phase hooks, gates and the next phase's pre-phase hooks.
+        self._memory_records.append(
+            submit_memory_call(
+                self.memory,
+                "record",
+                role=role,
+                phase=phase,
+                playbook=playbook,
+                runtime_target=runtime_target,
+                outcome={"summary": summary, "pass": passed, "score": score},
+            )
         )
 
+    def _drain_memory_records(self) -> None:
+        pending, self._memory_records = self._memory_records, []
+        for future in pending:
+            self.cancel_token.wait("memory_record", future)
+
     def _dispatch(self, phase: str, request: Dict[str, Any]) -> Dict[str, Any]:
         if self.state.budget_exhausted:
             self._record(phase, "budget", "exhausted")
@@ -238,18 +377,23 @@ class Orchestrator:
         role = self._phase_role(phase)
         runtime_target = str(request.get("runtime_target", "langgraph"))
         playbook = str(request.get("__playbook_name", "build"))
-        md_context = {"names": [], "instructions": ""}
-        if role_skill_mode(self.profile, role) == "markdown":
-            md_context = resolve_markdown_skill_context(
-                self.md_skills,
-                role=role,
-                phase=phase,
-                playbook=playbook,
-                runtime_target=runtime_target,
-            )
-        adaptive_memories = self._fetch_adaptive_memory(
+        memory_fetch = self._start_memory_fetch(
             role=role, phase=phase, playbook=playbook, runtime_target=runtime_target, request=request
         )
+        md_context = {"names": [], "instructions": ""}
+        if role_skill_mode(self.profile, role) == "markdown":
+            with self.timer.step("skill_context"):
+                md_context = resolve_markdown_skill_context(
+                    self.md_skills,
+                    role=role,
+                    phase=phase,
+                    playbook=playbook,
+                    runtime_target=runtime_target,
+                )
+        adaptive_memories: List[str] = []
+        if memory_fetch is not None:
+            with self.timer.step("memory_fetch"):
+                adaptive_memories = self.cancel_token.wait("memory_fetch", memory_fetch)
         phase_request = dict(request)
         phase_request["skill_context"] = {
             "role": role,
@@ -262,10 +406,86 @@ class Orchestrator:
             self._record(phase, "skill_context", ",".join(md_context["names"]))
         if adaptive_memories:
             self._record(phase, "memory_context", str(len(adaptive_memories)))
+        if self.predictive_stop:
+            predicted = self.cost_model.predict(phase)
+            overrun = self.ledger.would_overrun(role, predicted) if predicted is not None else None
+            if overrun:
+                # Stop before a phase that history says would overrun rather than after it has spent the budget.
+                self._exhaust_budget(overrun)
+                self._record(phase, "budget", f"predicted_overrun:{overrun}")
+                return {"gate_outputs": {}}
+        memo_key = None
+        if self.memo is not None and role in ROLE_INPUT_ARTIFACTS:
+            with self.timer.step("memo_lookup"):
+                memo_key = self.memo.phase_key(phase, role, phase_request, self.broker)
+                cached = self.memo.lookup(memo_key, self.broker)
+            if cached is not None:
+                return self._replay_memo(phase, role, cached)
+        self.ledger.open_phase(phase, role)
+        prompt_tokens = estimate_payload_tokens(phase_request["skill_context"]) + estimate_payload_tokens(
+            request.get("user_constraints")
+        )
+        self._consume_budget(role, tokens=prompt_tokens)
+        if self.state.budget_exhausted:
+            self._record(phase, "budget", "exhausted")
+            return {"gate_outputs": {}}
+        if bool(self.worker_cfg.get("enabled", False)):
+            phase_request["worker_context"] = self._worker_context(role)
+        io_before = self.broker.io_ms()
+        artifacts_before = dict(self.state.artifacts)
+        with self.timer.step("role_subgraph"):
+            result = self._run_phase(phase, phase_request)
+        broker_ms = self.broker.io_ms() - io_before
+        self.timer.add("broker_io", broker_ms)
+        self.timer.add("role_subgraph", -broker_ms)
+        if memo_key is not None and self.memo is not None:
+            written = {
+                artifact_type: entry["version"]
+                for artifact_type, entry in self.state.artifacts.items()
+                if artifacts_before.get(artifact_type) != entry
+            }
+            self.memo.store(memo_key, copy.deepcopy(result.get("gate_outputs", {})), written, self.broker)
+        return result
+
+    def _worker_context(self, role: str) -> Dict[str, Any]:
+        """Declared workers for `role` and the spawns its budget still allows (None when unbounded)."""
+        from team.engine.workers import load_worker_registry
+
+        registry = str(self.worker_cfg.get("registry", "") or "")
+        if registry and not os.path.isabs(registry):
+            registry = os.path.join(self.repo_root, registry)
+        options = {
+            key: self.worker_cfg[key]
+            for key in ("max_concurrency", "quorum", "timeout_s", "per_worker")
+            if key in self.worker_cfg
+        }
+        remaining = self.cancel_token.remaining()
+        if remaining is not None:
+            # Workers must not outlive the phase or run deadline.
+            configured = float(options.get("timeout_s", 0) or 0)
+            options["timeout_s"] = min(configured, remaining) if configured else remaining
+        return {
+            "workers": list(load_worker_registry(registry or None).get(role, ())),
+            "max_spawns": self.ledger.remaining(role)["spawns"],
+            "options": options,
+        }
+
+    def _replay_memo(self, phase: str, role: str, cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Reuse a memoized phase: same artifact versions and gate outputs, no role subgraph or writes."""
+        self.ledger.open_phase(phase, role)
         self._consume_budget(role)
         if self.state.budget_exhausted:
             self._record(phase, "budget", "exhausted")
             return {"gate_outputs": {}}
+        reused = []
+        for artifact_type, produced in cached["artifacts"].items():
+            self.state.artifacts[artifact_type] = {"version": produced["version"]}
+            reused.append(f"{artifact_type}:v{produced['version']}")
+        self.state.memo_hits += 1
+        self._record(phase, "memo_hit", ",".join(reused) or "no_writes")
+        return {"gate_outputs": copy.deepcopy(cached["gate_outputs"])}
+
+    def _run_phase(self, phase: str, phase_request: Dict[str, Any]) -> Dict[str, Any]:
         if phase == "gather_constraints":
             constraints = gather_constraints(phase_request)
             version = self.broker.write("ConstraintPack", constraints, author="orchestrator")
@@ -273,42 +493,50 @@ class Orchestrator:
             self._record(phase, "write", "ConstraintPack")
             return {"gate_outputs": {}}
         if phase == "architect":
-            result = run_architect(phase_request, self.broker)
+            result = role_runner("architect")(phase_request, self.broker)
+            self._report_usage(phase, result)
             self.state.artifacts[result["artifact"]] = {"version": result["version"]}
             self._record(phase, "write", result["artifact"])
             return {"gate_outputs": {}}
         if phase == "prompt_policy":
-            result = run_prompt_policy(phase_request, self.broker)
+            result = role_runner("prompt_policy")(phase_request, self.broker)
+            self._report_usage(phase, result)
             self.state.artifacts[result["artifact"]] = {"version": result["version"]}
             self._record(phase, "write", result["artifact"])
             return {"gate_outputs": {}}
         if phase == "tooling":
-            result = run_tooling(phase_request, self.broker)
+            result = role_runner("tooling")(phase_request, self.broker)
+            self._report_usage(phase, result)
             self.state.artifacts[result["artifact"]] = {"version": result["version"]}
             self._record(phase, "write", result["artifact"])
             return {"gate_outputs": {}}
         if phase.startswith("eval"):
-            result = run_eval(phase_request, self.broker)
+            result = role_runner("eval")(phase_request, self.broker)
+            self._report_usage(phase, result)
             self.state.artifacts["EvalSpec"] = {"version": result["eval_spec_version"]}
             self.state.artifacts["ExperimentReport"] = {"version": result["version"]}
             self._record(phase, "write", "ExperimentReport")
             gate_output = result.get("quality_gate_output", {"pass": True, "score": 1.0})
             return {"gate_outputs": {"quality_gate": quality_gate(gate_output)}}
         if phase == "optimizer":
-            result = run_optimizer(phase_request, self.broker)
+            result = role_runner("optimizer")(phase_request, self.broker)
+            self._report_usage(phase, result)
             self.state.artifacts["ExperimentSpec"] = {"version": result["experiment_spec_version"]}
             self.state.artifacts["PromotionDecision"] = {"version": result["version"]}
+            self.state.pending_promotions.append(result["version"])
             self._record(phase, "write", "PromotionDecision")
             return {"gate_outputs": {}}
         if phase.startswith("ops"):
-            result = run_ops(phase_request, self.broker)
+            result = role_runner("ops")(phase_request, self.broker)
+            self._report_usage(phase, result)
             self.state.artifacts["TelemetrySpec"] = {"version": result["telemetry_version"]}
             self.state.artifacts["SLOReport"] = {"version": result["version"]}
             self._record(phase, "write", "SLOReport")
             gate_output = result.get("production_gate_output", {"pass": True})
             return {"gate_outputs": {"production_gate": production_gate(gate_output)}}
         if phase == "compile" or phase.startswith("compile"):
-            result = run_compiler(phase_request, self.broker)
+            result = role_runner("compiler")(phase_request, self.broker)
+            self._report_usage(phase, result)
             self.state.artifacts["CompiledSpec"] = {"version": result["version"]}
             self.state.artifacts["CompilationReport"] = {"version": result["report_version"]}
             self._record(phase, "write", "CompiledSpec")
@@ -322,17 +550,20 @@ class Orchestrator:
                 }
             }
         if phase == "apply_promotion":
-            latest = self.broker.latest_version("PromotionDecision")
-            if latest == 0:
+            versions = list(self.state.pending_promotions)
+            if not versions:
+                latest = self.broker.latest_version("PromotionDecision")
+                versions = [latest] if latest else []
+            if not versions:
                 self._record(phase, "apply_promotion", "none")
                 return {"gate_outputs": {}}
-            decision = self.broker.read_full("PromotionDecision", latest)
-            routed = apply_promotion(decision, self.broker)
-            target = routed.get("target_artifact")
-            new_version = routed.get("new_version")
-            if isinstance(target, str) and isinstance(new_version, int):
+            decisions = [self.broker.read_full("PromotionDecision", version) for version in versions]
+            batch = apply_promotions(decisions, self.broker)
+            self.state.pending_promotions = []
+            for target, new_version in batch["writes"].items():
                 self.state.artifacts[target] = {"version": new_version}
-            self._record(phase, "apply_promotion", routed.get("decision", "unknown"))
+            for routed in batch["results"]:
+                self._record(phase, "apply_promotion", routed.get("decision", "unknown"))
             return {"gate_outputs": {}}
         if phase.startswith("human_gate"):
             decision = human_gate({})
@@ -344,77 +575,255 @@ class Orchestrator:
         self._record(phase, "dispatch", "stub")
         return {"gate_outputs": {}}
 
-    def run(self, playbook_name: str, request: Dict[str, Any]) -> Dict[str, Any]:
-        request["__playbook_name"] = playbook_name
-        request["system_profile"] = {
-            "domain": self.profile.get("domain", "generic"),
-            "framework": self.profile.get("framework", "runtime_agnostic_multi_agent"),
-        }
-        playbook = self.load_playbook(playbook_name)
-        self._apply_skills("pre_run", playbook_name, request, role="orchestrator")
-        phases = list(playbook.get("phases", []))
-        allowed_loops = playbook.get("allowed_loops", [])
-        gate_requirements = playbook.get("gate_requirements", [])
+    def _run_phases(
+        self, plan: ExecutionPlan, playbook_name: str, request: Dict[str, Any], profiler: Optional[RunProfiler]
+    ) -> None:
+        phases = list(plan.phases)
         idx = 0
         while idx < len(phases):
             phase = phases[idx]
             role = self._phase_role(phase)
-            self._apply_skills("pre_phase", playbook_name, request, phase=phase, role=role)
+            self.timer.begin_phase(phase, role)
+            if profiler is not None:
+                profiler.begin_phase()
+            self.cancel_token.begin_phase(phase)
+            self.cancel_token.check()
+            with self.timer.step("skills_pre_phase"):
+                self._apply_skills("pre_phase", playbook_name, request, phase=phase, role=role)
             result = self._dispatch(phase, request)
-            self._record_adaptive_memory(
-                role=role,
-                phase=phase,
-                playbook=playbook_name,
-                runtime_target=str(request.get("runtime_target", "langgraph")),
-                result=result,
-            )
-            self._apply_skills("post_phase", playbook_name, request, phase=phase, role=role)
+            with self.timer.step("memory_record"):
+                self._record_adaptive_memory(
+                    role=role,
+                    phase=phase,
+                    playbook=playbook_name,
+                    runtime_target=str(request.get("runtime_target", "langgraph")),
+                    result=result,
+                )
+            with self.timer.step("skills_post_phase"):
+                self._apply_skills("post_phase", playbook_name, request, phase=phase, role=role)
+            gate_started = self.timer.offset_ms()
             gate_outputs = result.get("gate_outputs", {})
-            requirements = [req for req in gate_requirements if req.get("phase") == phase]
             rerouted = False
-            for req in requirements:
-                for gate_name in req.get("gates", []):
-                    gate_output = gate_outputs.get(gate_name, {"pass": True})
-                    if gate_output.get("pass", True):
-                        continue
-                    trigger = self._gate_trigger(gate_name)
-                    loop_entry = self._allowed_loop(allowed_loops, phase, trigger)
-                    if not loop_entry:
-                        continue
-                    count = self.state.loop_counts.get(phase, 0) + 1
-                    self.state.loop_counts[phase] = count
-                    if count > int(loop_entry.get("max_iterations", 0)):
-                        self._record(phase, "loop_cap", "exhausted")
+            for gate_name in plan.gates_for(phase):
+                gate_output = gate_outputs.get(gate_name, {"pass": True})
+                passed = bool(gate_output.get("pass", True))
+                gate_counts = self.state.gate_results.setdefault(gate_name, {"pass": 0, "fail": 0})
+                gate_counts["pass" if passed else "fail"] += 1
+                if passed:
+                    continue
+                trigger = self._gate_trigger(gate_name)
+                loop_entry = plan.loop_for(phase, trigger)
+                if not loop_entry:
+                    continue
+                count = self.state.loop_counts.get(phase, 0) + 1
+                self.state.loop_counts[phase] = count
+                if count > loop_entry.max_iterations:
+                    self.state.loop_cap_hits[phase] = self.state.loop_cap_hits.get(phase, 0) + 1
+                    self._record(phase, "loop_cap", "exhausted")
+                    continue
+                classification = classify_failure(gate_output.get("failure_signals", {}))
+                self.state.failures.append(
+                    {
+                        "phase": phase,
+                        "gate": gate_name,
+                        "route": classification["route"],
+                        "taxonomy_version": classification["taxonomy_version"],
+                        "signals": gate_output.get("failure_signals", {}),
+                    }
+                )
+                if self.stall_detection:
+                    fingerprint = self._loop_fingerprint(
+                        phase, gate_name, classification["route"], gate_output.get("failure_signals", {})
+                    )
+                    seen = self.state.loop_fingerprints.setdefault(f"{phase}:{gate_name}", [])
+                    if fingerprint in seen:
+                        # Same failure against the same artifact content: further iterations cannot converge.
+                        # Each skipped iteration would have cost three steps; copies already queued still run.
+                        if phase not in self.state.loop_stalls:
+                            self.state.loop_stalls[phase] = 3 * (loop_entry.max_iterations - count + 1)
+                        self._record(phase, "loop_stalled", classification["route"])
                         continue
-                    classification = classify_failure(gate_output.get("failure_signals", {}))
-                    self._record(phase, "classify_failure", classification["route"])
-                    reroute_phase = self._route_to_phase(classification["route"])
-                    phases.insert(idx + 1, reroute_phase)
-                    phases.insert(idx + 2, phase)
-                    rerouted = True
-                    break
-                if rerouted:
-                    break
+                    seen.append(fingerprint)
+                self._record(phase, "classify_failure", classification["route"])
+                reroute_phase = self._route_to_phase(classification["route"])
+                phases.insert(idx + 1, reroute_phase)
+                phases.insert(idx + 2, phase)
+                rerouted = True
+                break
+            self.timer.add("gates", self.timer.offset_ms() - gate_started)
+            if profiler is not None:
+                self.timer.end_phase(peak_kb=profiler.phase_peak_kb())
+            else:
+                self.timer.end_phase()
+            self.cancel_token.end_phase()
             if not rerouted:
                 idx += 1
-        if not self.state.budget_exhausted:
-            self.state.status = "done"
-        self.broker.append_meta_eval(
-            {
-                "status": self.state.status,
-                "phases_run": len(self.state.history),
-                "steps_used": self.state.steps_used,
-                "role_steps": self.state.role_steps,
-                "loop_counts": self.state.loop_counts,
-                "artifacts_written": list(self.state.artifacts.keys()),
-            }
+
+    def simulate(
+        self,
+        playbook_name: str,
+        request: Dict[str, Any],
+        samples: int = DEFAULT_SAMPLES,
+        history_runs: int = DEFAULT_HISTORY_RUNS,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Estimate wall time, steps, tokens and loop counts from history without running any phase."""
+        plan = self.load_plan(playbook_name)
+        runtime_target = str(request.get("runtime_target", ""))
+        same_runtime: Any = collections.deque(maxlen=history_runs)
+        any_runtime: Any = collections.deque(maxlen=history_runs)
+        for entry in self.broker.meta_eval.entries(playbook=playbook_name):
+            any_runtime.append(entry)
+            if entry.get("runtime_target") == runtime_target:
+                same_runtime.append(entry)
+        # Prefer history for the requested runtime; fall back to every runtime of the playbook.
+        history = RunHistory(same_runtime or any_runtime, plan)
+        result = simulate_plan(
+            plan, history, self.state.budgets, cost_model=self.cost_model, samples=samples, seed=seed
         )
-        return {
+        result["runtime_target"] = runtime_target
+        result["plan_budget_findings"] = check_plan_budgets(plan, self.state.budgets)
+        return result
+
+    def run(
+        self,
+        playbook_name: str,
+        request: Dict[str, Any],
+        simulate: bool = False,
+        cancel: Optional[CancelToken] = None,
+        trace_offset: int = 0,
+        trace_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Run a playbook; `cancel` (default: the profile's `deadlines`) stops it early at the next check point.
+
+        The output's `routing_trace` and `history` hold `trace_limit` events from `trace_offset` (default: up
+        to `event_log.max_response_events`; 0: all), with `trace` paging info when that is not every event.
+        """
+        if simulate:
+            return self.simulate(playbook_name, request)
+        profiler = RunProfiler(self.profile_dir) if self.profile_run else None
+        profile: Optional[Dict[str, Any]] = None
+        try:
+            if profiler is not None:
+                profiler.start()
+            output = self._run_playbook(playbook_name, request, cancel, trace_offset, trace_limit, profiler)
+        finally:
+            # Also on failure: cProfile stays attached to the thread and tracemalloc on process-wide otherwise.
+            if profiler is not None:
+                profile = profiler.stop(playbook_name)
+        if profile is not None:
+            output["profile"] = profile
+        return output
+
+    def _run_playbook(
+        self,
+        playbook_name: str,
+        request: Dict[str, Any],
+        cancel: Optional[CancelToken],
+        trace_offset: int,
+        trace_limit: Optional[int],
+        profiler: Optional[RunProfiler],
+    ) -> Dict[str, Any]:
+        self.cancel_token = cancel or build_cancel_token(self.deadline_cfg)
+        self.timer = PhaseTimer()
+        self.ledger = BudgetLedger(self.state.budgets)
+        self.memo = None
+        if bool(self.memo_cfg.get("enabled", False)):
+            from team.engine.memo import PhaseMemo
+
+            self.memo = PhaseMemo(
+                self.memo_path if bool(self.memo_cfg.get("persistent", False)) else None,
+                max_entries=int(self.memo_cfg.get("max_entries", 1000)),
+            )
+        request["__playbook_name"] = playbook_name
+        request["system_profile"] = {
+            "domain": self.profile.get("domain", "generic"),
+            "framework": self.profile.get("framework", "runtime_agnostic_multi_agent"),
+        }
+        with self.timer.step("load_playbook"):
+            plan = self.load_plan(playbook_name)
+        self.broker.cancel_token = self.cancel_token
+        plan_output: Dict[str, Any] = {}
+        try:
+            with self.timer.step("skills_pre_run"):
+                self._apply_skills("pre_run", playbook_name, request, role="orchestrator")
+            # Checked after pre-run hooks, which may adjust budgets, and before any phase touches the broker.
+            plan_findings = check_plan_budgets(plan, self.state.budgets)
+            for finding in plan_findings:
+                outcome = f"{finding['limit']}: worst case {finding['worst_case']} > {finding['budget']}"
+                self._record("plan", "plan_budget", outcome)
+            plan_output = {
+                "worst_case_steps": plan.worst_case_steps,
+                "worst_case_role_steps": plan.role_steps(),
+                "budget_findings": plan_findings,
+            }
+            if plan_findings and str(self.plan_cfg.get("budget_policy", "warn")) == "reject":
+                # No phase runs, but the rejection is logged and timed like any other terminal status.
+                self.state.status = "rejected"
+            else:
+                self._run_phases(plan, playbook_name, request, profiler)
+                with self.timer.step("memory_record"):
+                    self._drain_memory_records()
+        except RunCancelled as stop:
+            self.state.status = stop.reason
+            self.state.stopped_at = stop.where
+            self._record(stop.where or "run", "cancel", stop.reason)
+            self.timer.end_phase()
+            self.cancel_token.end_phase()
+        finally:
+            self.broker.cancel_token = None
+            for future in self._memory_records:
+                future.cancel()
+            self._memory_records = []
+        if self.state.status == "running":
+            self.state.status = "done"
+        with self.timer.step("meta_eval"):
+            self.state.timings = self.timer.summary()
+            self.broker.append_meta_eval(
+                {
+                    "playbook": playbook_name,
+                    "runtime_target": request.get("runtime_target", ""),
+                    "status": self.state.status,
+                    "phases_run": len(self.state.events),
+                    "steps_used": self.state.steps_used,
+                    "role_steps": self.state.role_steps,
+                    "loop_counts": self.state.loop_counts,
+                    "loop_cap_hits": self.state.loop_cap_hits,
+                    "loop_stalls": self.state.loop_stalls,
+                    "saved_steps": sum(self.state.loop_stalls.values()),
+                    "failures": self.state.failures,
+                    "budget_exhausted": self.state.budget_exhausted,
+                    "budget_stop": self.state.budget_stop,
+                    "stopped_at": self.state.stopped_at,
+                    "usage": self.ledger.summary(),
+                    "memo_hits": self.state.memo_hits,
+                    "artifacts_written": list(self.state.artifacts.keys()),
+                    "timings": self.state.timings,
+                }
+            )
+        self.cost_model.update(self.ledger.phase_costs)
+        if self.memo is not None:
+            self.memo.save()
+        self.state.timings["run_steps"] = dict(self.timer.run_steps)
+        trace = self._trace_window(trace_offset, trace_limit)
+        output = {
             "status": self.state.status,
-            "routing_trace": self.state.routing_trace,
-            "history": self.state.history,
+            "routing_trace": trace["routing_trace"],
+            "history": trace["history"],
             "artifacts": self.state.artifacts,
+            "timings": self.state.timings,
+            "usage": self.ledger.summary(),
+            "plan": plan_output,
         }
+        if self.memo is not None:
+            output["memo"] = {"hits": self.memo.hits, "misses": self.memo.misses}
+        if self.state.budget_stop:
+            output["budget_stop"] = self.state.budget_stop
+        if self.state.stopped_at:
+            output["stopped_at"] = self.state.stopped_at
+        if "trace" in trace:
+            output["trace"] = trace["trace"]
+        return output
 
 
 def main() -> int:
@@ -422,11 +831,78 @@ def main() -> int:
     parser.add_argument("--repo", default=os.getcwd(), help="Repo root path")
     parser.add_argument("--playbook", default="build", help="Playbook name")
     parser.add_argument("--runtime", default="langgraph", help="Runtime target")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Capture cProfile output and tracemalloc peak memory per phase for this run.",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Estimate wall time, steps and loop counts from run history without executing any phase.",
+    )
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Simulated runs with --simulate.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for --simulate.")
+    parser.add_argument("--deadline", type=float, default=None, help="Wall-clock limit for the run, in seconds.")
+    parser.add_argument("--phase-deadline", type=float, default=None, help="Wall-clock limit per phase, in seconds.")
+    parser.add_argument("--trace-limit", type=int, default=None, help="Print at most this many trace events (0: all).")
+    parser.add_argument("--trace-offset", type=int, default=0, help="First trace event to print.")
+    parser.add_argument("--batch", help="Run every request in a JSONL file ('-' for stdin) on a process pool.")
+    parser.add_argument("--output", default="-", help="JSONL file for --batch results (default stdout).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (0 = in-process); consumer threads for --queue-worker.",
+    )
+    parser.add_argument("--resume", action="store_true", help="Skip ids already recorded in --output.")
+    parser.add_argument("--full", action="store_true", help="Include each run's full output in --batch records.")
+    parser.add_argument(
+        "--drop-namespaces", action="store_true", help="Delete each --batch run's broker namespace after its record."
+    )
+    parser.add_argument(
+        "--queue-worker",
+        action="store_true",
+        help="Consume runs from the distributed run queue (profile `distributed`) until interrupted.",
+    )
     args = parser.parse_args()
 
-    orch = Orchestrator(args.repo)
+    if args.queue_worker:
+        from team.orchestrator.queue_worker import serve
+
+        return serve(args.repo, count=args.workers or 1)
+
+    if args.batch:
+        from team.orchestrator.batch import run_batch
+
+        stream = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")
+        try:
+            stats = run_batch(
+                args.repo,
+                stream,
+                output_path=args.output,
+                workers=args.workers,
+                playbook=args.playbook,
+                runtime=args.runtime,
+                resume=args.resume,
+                full=args.full,
+                drop_namespaces=args.drop_namespaces,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        print(json.dumps(stats, indent=2), file=sys.stderr)
+        return 1 if stats["status"].get("error") else 0
+
+    orch = Orchestrator(args.repo, profile_run=args.profile)
     request = {"runtime_target": args.runtime}
-    result = orch.run(args.playbook, request)
+    if args.simulate:
+        result = orch.simulate(args.playbook, request, samples=args.samples, seed=args.seed)
+    else:
+        cancel = build_cancel_token(orch.deadline_cfg, args.deadline, args.phase_deadline)
+        result = orch.run(
+            args.playbook, request, cancel=cancel, trace_offset=args.trace_offset, trace_limit=args.trace_limit
+        )
     print(json.dumps(result, indent=2))
     return 0
 
@@ -0,0 +1,83 @@
+"""Queue worker: consumes runs from the distributed run queue and executes them with this node's orchestrator."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from team.engine.deadline import build_cancel_token
+from team.engine.run_queue import QueueWorker, RunQueue
+from team.engine.system_profile import load_system_profile
+from team.orchestrator.orchestrator import Orchestrator
+
+
+def queue_options(repo_root: str) -> Dict[str, Any]:
+    profile = load_system_profile(repo_root)
+    return profile.get("distributed", {}) if isinstance(profile.get("distributed"), dict) else {}
+
+
+def run_executor(repo_root: str) -> Callable[[Dict[str, Any], Callable[[], bool]], Dict[str, Any]]:
+    """Execute API run payloads on one orchestrator per thread, honouring their deadlines and cancel requests."""
+    local = threading.local()
+
+    def execute(payload: Dict[str, Any], cancel_requested: Callable[[], bool]) -> Dict[str, Any]:
+        orchestrator: Optional[Orchestrator] = getattr(local, "orchestrator", None)
+        if orchestrator is None:
+            orchestrator = local.orchestrator = Orchestrator(repo_root)
+        else:
+            orchestrator.reset()
+        orchestrator.profile_run = bool(payload.get("profile", False))
+        request = dict(payload.get("request") or {})
+        request["runtime_target"] = str(payload.get("runtime") or "langgraph")
+        cancel = build_cancel_token(
+            orchestrator.deadline_cfg,
+            payload.get("deadline_s"),
+            payload.get("phase_deadline_s"),
+            probe=cancel_requested,
+        )
+        try:
+            result = orchestrator.run(
+                str(payload.get("playbook") or "build"),
+                request,
+                cancel=cancel,
+                trace_offset=int(payload.get("trace_offset") or 0),
+                trace_limit=payload.get("trace_limit"),
+            )
+            if payload.get("run_id"):
+                result["run_id"] = payload["run_id"]
+            return result
+        finally:
+            orchestrator.broker.meta_eval.flush()
+
+    return execute
+
+
+def start_workers(
+    queue: RunQueue, repo_root: str, count: int = 1, stop: Optional[threading.Event] = None
+) -> List[threading.Thread]:
+    """Start `count` consumer threads on `queue`; they exit once `stop` is set."""
+    stop = stop or threading.Event()
+    execute = run_executor(repo_root)
+    threads = []
+    for _ in range(max(1, count)):
+        worker = QueueWorker(queue, execute)
+        thread = threading.Thread(target=worker.run, args=(stop,), name=f"queue-worker-{worker.consumer}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def serve(repo_root: str, count: int = 1, stop: Optional[threading.Event] = None) -> int:
+    """Consume runs until interrupted; start as many of these, on as many nodes, as throughput needs."""
+    stop = stop or threading.Event()
+    queue = RunQueue.from_options(queue_options(repo_root))
+    queue.ensure_group()
+    threads = start_workers(queue, repo_root, count, stop)
+    try:
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1.0)
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return 0
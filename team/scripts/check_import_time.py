@@ -0,0 +1,47 @@
+"""Fail when a cold import of the orchestrator or API exceeds its time budget or loads a heavy dependency."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from team.engine.import_time import DEFAULT_BUDGETS, check_import_budgets  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check import-time budgets")
+    parser.add_argument(
+        "--module", action="append", choices=sorted(DEFAULT_BUDGETS.keys()), help="Check only this module (repeatable)."
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module; the fastest counts.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the time budgets (slow CI hosts).")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON.")
+    args = parser.parse_args()
+
+    budgets = {name: DEFAULT_BUDGETS[name] for name in (args.module or DEFAULT_BUDGETS.keys())}
+    try:
+        results = check_import_budgets(REPO_ROOT, budgets, runs=args.runs, scale=args.scale)
+    except RuntimeError as exc:
+        print(f"FAIL {exc}")
+        return 1
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            verdict = "PASS" if result["passed"] else "FAIL"
+            print(f"{verdict} {result['module']}: {result['cumulative_ms']:.1f} ms (budget {result['max_ms']:.0f} ms)")
+            if result["forbidden_loaded"]:
+                print(f"- imports {', '.join(result['forbidden_loaded'])} at module load")
+            if not result["passed"]:
+                slowest = ", ".join(f"{item['module']} {item['self_ms']:.1f} ms" for item in result["slowest"])
+                print(f"- slowest: {slowest}")
+    return 0 if all(result["passed"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+"""Drive the API with a playbook/runtime mix under an open- or closed-loop model and report throughput and latency."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from team.benchmarks.harness import DEFAULT_THRESHOLD_PCT, load_baseline  # noqa: E402
+from team.benchmarks.load import (  # noqa: E402
+    HttpTransport,
+    LoadConfig,
+    compare_load_reports,
+    in_process_transport,
+    load_mix,
+    parse_mix,
+    run_load,
+)
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    header = (
+        f"{'mix':<28} {'ok':>6} {'errors':>7} {'req/s':>9} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, case in report["cases"].items():
+        print(
+            f"{name:<28} {case['iterations']:>6} {case['errors']:>7} {case['ops_per_sec']:>9.2f} "
+            f"{case['p50_ms']:>10.1f} {case['p90_ms']:>10.1f} {case['p99_ms']:>10.1f} {case['max_ms']:>10.1f}"
+        )
+    load = report["load"]
+    print(
+        f"\nwindow {load['window_s']}s, {load['requests']} requests, error rate {load['error_rate']:.2%}, "
+        f"dropped {load['dropped']}, replayed {load['replayed']}"
+    )
+    print(f"http status: {json.dumps(load['http_status'], sort_keys=True)}")
+    print(f"run status: {json.dumps(load['run_status'], sort_keys=True)}")
+    if load["error_types"]:
+        print(f"errors: {json.dumps(load['error_types'], sort_keys=True)}")
+    disk = load.get("broker_disk")
+    if disk:
+        print(
+            f"broker disk: {disk['bytes_before']} -> {disk['bytes_after']} bytes "
+            f"(+{disk['growth_bytes']}, {disk['growth_bytes_per_request']}/request), "
+            f"{disk['files_before']} -> {disk['files_after']} files"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the API service in-process or at a URL")
+    parser.add_argument("--url", default="", help="Base URL of a running API (default: the app in-process).")
+    parser.add_argument("--repo-root", default=REPO_ROOT, help="Repo root the in-process app serves.")
+    parser.add_argument("--model", choices=("closed", "open"), default="closed", help="Closed or open loop.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Closed loop: concurrent clients.")
+    parser.add_argument("--think", type=float, default=0.0, help="Closed loop: mean think time between requests.")
+    parser.add_argument("--rps", type=float, default=5.0, help="Open loop: target arrival rate.")
+    parser.add_argument("--arrivals", choices=("poisson", "constant"), default="poisson", help="Open loop arrivals.")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="Open loop: arrivals past this are dropped.")
+    parser.add_argument("--duration", type=float, default=None, help="Measured seconds (default 30 unless --requests).")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests.")
+    parser.add_argument("--warmup", type=float, default=0.0, help="Unmeasured seconds before the measured window.")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the mix and arrival draws.")
+    parser.add_argument(
+        "--mix", action="append", help="playbook[/runtime][=weight] (repeatable). Default: build/langgraph."
+    )
+    parser.add_argument("--mix-file", default="", help="JSON list of {playbook, runtime, weight, request} entries.")
+    parser.add_argument(
+        "--broker-dir", default="", help="State broker directory to measure (default: the repo's in-process)."
+    )
+    parser.add_argument("--json", dest="json_out", default="", help="Write the report to this path.")
+    parser.add_argument("--baseline", default="", help="Compare against this report; exit 1 on regression.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD_PCT,
+        help="Default regression threshold percent stored in the report.",
+    )
+    args = parser.parse_args()
+
+    try:
+        mix = load_mix(args.mix_file) if args.mix_file else parse_mix(args.mix or ["build/langgraph"])
+        duration = args.duration if args.duration is not None else (0.0 if args.requests else 30.0)
+        config = LoadConfig(
+            model=args.model,
+            concurrency=args.concurrency,
+            rps=args.rps,
+            arrivals=args.arrivals,
+            duration_s=duration,
+            requests=args.requests,
+            warmup_s=args.warmup,
+            think_s=args.think,
+            max_in_flight=args.max_in_flight,
+            timeout_s=args.timeout,
+            seed=args.seed,
+        )
+        config.validate()
+    except ValueError as exc:
+        print(f"error: {exc}")
+        return 2
+
+    repo_root = os.path.abspath(args.repo_root)
+    if args.url:
+        transport: Any = HttpTransport(args.url, args.timeout)
+        broker_dir = args.broker_dir
+    else:
+        transport = in_process_transport(repo_root, args.timeout)
+        broker_dir = args.broker_dir or os.path.join(repo_root, "team", "state_broker")
+    try:
+        report = run_load(transport, mix, config, broker_dir=broker_dir or None, threshold_pct=args.threshold)
+    finally:
+        transport.close()
+
+    _print_report(report)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nWrote {args.json_out}")
+
+    if args.baseline:
+        regressions = compare_load_reports(report, load_baseline(args.baseline))
+        if regressions:
+            print(f"\nRegressions against {args.baseline}:")
+            for item in regressions:
+                print(
+                    f"- {item['case']} {item['metric']}: {item['baseline']} -> {item['current']} "
+                    f"({item['change_pct']:+.1f}%, threshold {item['threshold_pct']:.0f}%)"
+                )
+            return 1
+        print(f"\nNo regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+"""Query and aggregate the meta-eval log by time range, playbook and status."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from team.engine.meta_eval_log import get_meta_eval_log, parse_time  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Aggregate meta-eval history without reading every segment")
+    parser.add_argument(
+        "--log",
+        default=os.path.join(REPO_ROOT, "team", "state_broker", "meta_eval_log.jsonl"),
+        help="Path to the active meta-eval log.",
+    )
+    parser.add_argument("--since", help="Epoch seconds, ISO timestamp, or relative age (e.g. 24h, 7d).")
+    parser.add_argument("--until", help="Epoch seconds, ISO timestamp, or relative age.")
+    parser.add_argument("--playbook", help="Only runs of this playbook.")
+    parser.add_argument("--status", help="Only runs that ended with this status.")
+    parser.add_argument("--raw", action="store_true", help="Print matching entries as JSONL instead of aggregates.")
+    parser.add_argument("--rotate", action="store_true", help="Rotate the active log into a gzip segment first.")
+    args = parser.parse_args()
+
+    try:
+        filters = {
+            "since": parse_time(args.since),
+            "until": parse_time(args.until),
+            "playbook": args.playbook,
+            "status": args.status,
+        }
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    log = get_meta_eval_log(args.log)
+    if args.rotate:
+        rotated = log.rotate()
+        print(f"Rotated to {rotated}" if rotated else "Nothing to rotate.", file=sys.stderr)
+    if args.raw:
+        for entry in log.entries(**filters):
+            print(json.dumps(entry))
+        return 0
+    print(json.dumps(log.aggregate(**filters), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
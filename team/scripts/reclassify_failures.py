@@ -0,0 +1,47 @@
+"""Re-run a failure taxonomy over historical gate failures in the meta-eval log and report route changes."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from team.engine.classify_failure import DEFAULT_TAXONOMY_PATH, FailureTaxonomy, reclassify  # noqa: E402
+from team.engine.meta_eval_log import get_meta_eval_log, parse_time  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Test a failure taxonomy against recorded gate failures")
+    parser.add_argument("--taxonomy", default=DEFAULT_TAXONOMY_PATH, help="Taxonomy YAML to evaluate.")
+    parser.add_argument(
+        "--log",
+        default=os.path.join(REPO_ROOT, "team", "state_broker", "meta_eval_log.jsonl"),
+        help="Path to the active meta-eval log.",
+    )
+    parser.add_argument("--since", help="Epoch seconds, ISO timestamp, or relative age (e.g. 24h, 7d).")
+    parser.add_argument("--until", help="Epoch seconds, ISO timestamp, or relative age.")
+    parser.add_argument("--playbook", help="Only runs of this playbook.")
+    args = parser.parse_args()
+
+    try:
+        taxonomy = FailureTaxonomy.load(args.taxonomy)
+        filters = {"since": parse_time(args.since), "until": parse_time(args.until), "playbook": args.playbook}
+    except (OSError, ValueError) as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    report = reclassify(get_meta_eval_log(args.log).entries(**filters), taxonomy)
+    elapsed = time.perf_counter() - started
+    report["elapsed_s"] = round(elapsed, 3)
+    report["records_per_s"] = round(report["records"] / elapsed, 1) if elapsed > 0 else 0.0
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+"""Compact meta-eval history into columnar form and report budget and loop statistics."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from team.engine.meta_eval_log import get_meta_eval_log, parse_time  # noqa: E402
+from team.engine.run_analytics import GROUP_FIELDS, ColumnarRunStore  # noqa: E402
+from team.engine.state_broker import open_meta_eval_log  # noqa: E402
+from team.engine.system_profile import load_system_profile  # noqa: E402
+
+
+def main() -> int:
+    state_dir = os.path.join(REPO_ROOT, "team", "state_broker")
+    parser = argparse.ArgumentParser(description="Per-role step percentiles, loop-cap and budget-exhaustion rates")
+    parser.add_argument("--log", help="Active meta-eval log file (default: the profile's state_broker backend).")
+    parser.add_argument("--store", default=os.path.join(state_dir, "analytics"), help="Columnar store directory.")
+    parser.add_argument("--no-compact", action="store_true", help="Query the store without compacting new runs first.")
+    parser.add_argument("--rebuild", action="store_true", help="Discard the store and recompact all history.")
+    parser.add_argument("--group-by", default=",".join(GROUP_FIELDS), help="Comma-separated: playbook,runtime_target.")
+    parser.add_argument("--playbook", help="Only this playbook.")
+    parser.add_argument("--runtime", help="Only this runtime target.")
+    parser.add_argument("--since", help="Epoch seconds, ISO timestamp, or relative age (e.g. 7d).")
+    parser.add_argument("--until", help="Epoch seconds, ISO timestamp, or relative age.")
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.isdir(args.store):
+        shutil.rmtree(args.store)
+    store = ColumnarRunStore(args.store)
+    try:
+        if not args.no_compact:
+            if args.log:
+                log = get_meta_eval_log(args.log)
+            else:
+                profile = load_system_profile(REPO_ROOT)
+                broker_cfg = profile.get("state_broker") if isinstance(profile.get("state_broker"), dict) else {}
+                log = open_meta_eval_log(state_dir, broker_cfg)
+            compaction = store.compact(log)
+            print(
+                f"Compacted {compaction['rows_added']} new runs ({compaction['total_rows']} total) "
+                f"in {compaction['elapsed_ms']:.1f} ms",
+                file=sys.stderr,
+            )
+        report = store.aggregate(
+            playbook=args.playbook,
+            runtime_target=args.runtime,
+            group_by=[name.strip() for name in args.group_by.split(",") if name.strip()],
+            since=parse_time(args.since),
+            until=parse_time(args.until),
+        )
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+"""Run the hot-path benchmark suite and optionally compare against a saved baseline."""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import tempfile
+from typing import List
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from team.benchmarks.cases import CASES, SLOW_CASES, BenchConfig  # noqa: E402
+from team.benchmarks.harness import (  # noqa: E402
+    DEFAULT_THRESHOLD_PCT,
+    BenchResult,
+    build_baseline,
+    compare_to_baseline,
+    load_baseline,
+    measure,
+)
+
+
+def _print_table(results: List[BenchResult]) -> None:
+    header = f"{'case':<28} {'iters':>6} {'ops/sec':>12} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result.name:<28} {result.iterations:>6} {result.ops_per_sec:>12.1f} {result.p50_ms:>10.3f} "
+            f"{result.p90_ms:>10.3f} {result.p99_ms:>10.3f} {result.max_ms:>10.3f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark orchestrator, broker, memory and compiler hot paths")
+    parser.add_argument("--case", action="append", help="Case name or glob (repeatable). Default: all cases.")
+    parser.add_argument("--list", action="store_true", help="List available cases and exit.")
+    parser.add_argument("--quick", action="store_true", help="Small inputs and few iterations (smoke check).")
+    parser.add_argument("--versions", type=int, default=None, help="Stored artifact versions for broker cases.")
+    parser.add_argument("--components", type=int, default=None, help="SystemSpec components for compiler case.")
+    parser.add_argument("--skills", type=int, default=None, help="Synthetic hook skills for skill case.")
+    parser.add_argument("--loop-stages", type=int, default=None, help="eval/ops/compile stages in loop playbook.")
+    parser.add_argument("--history-runs", type=int, default=None, help="Meta-eval runs for the analytics case.")
+    parser.add_argument("--iterations", type=int, default=None, help="Timed iterations per micro case.")
+    parser.add_argument("--run-iterations", type=int, default=None, help="Timed iterations per orchestrator case.")
+    parser.add_argument("--json", dest="json_out", default="", help="Write results (baseline format) to this path.")
+    parser.add_argument("--save-baseline", default="", help="Write results as a new baseline to this path.")
+    parser.add_argument("--baseline", default="", help="Compare against this baseline; exit 1 on regression.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD_PCT,
+        help="Default regression threshold percent stored in saved baselines.",
+    )
+    args = parser.parse_args()
+
+    if args.list:
+        for name in CASES:
+            print(name)
+        return 0
+
+    config = BenchConfig(repo_root=REPO_ROOT)
+    if args.quick:
+        config = BenchConfig(
+            repo_root=REPO_ROOT,
+            versions=200,
+            components=50,
+            skills=30,
+            loop_stages=2,
+            memory_entries=500,
+            history_runs=5000,
+            iterations=30,
+            run_iterations=2,
+        )
+    for field_name in (
+        "versions",
+        "components",
+        "skills",
+        "loop_stages",
+        "history_runs",
+        "iterations",
+        "run_iterations",
+    ):
+        value = getattr(args, field_name)
+        if value is not None:
+            setattr(config, field_name, value)
+
+    patterns = args.case or ["*"]
+    selected = [name for name in CASES if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+    if not selected:
+        print(f"No benchmark cases match: {', '.join(patterns)}")
+        return 1
+
+    # Synthetic repos carry their own profile; an inherited override would point elsewhere.
+    os.environ.pop("SYSTEM_PROFILE_PATH", None)
+    results: List[BenchResult] = []
+    for name in selected:
+        with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+            op = CASES[name](config, workdir)
+            iterations = config.run_iterations if name in SLOW_CASES else config.iterations
+            results.append(measure(name, op, iterations=iterations, max_seconds=config.max_seconds))
+
+    _print_table(results)
+    report = build_baseline(results, config.as_dict(), threshold_pct=args.threshold)
+    for path in (args.json_out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+            print(f"\nWrote {path}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_baseline(args.baseline))
+        if regressions:
+            print(f"\nRegressions against {args.baseline}:")
+            for item in regressions:
+                print(
+                    f"- {item['case']} {item['metric']}: {item['baseline']} -> {item['current']} "
+                    f"({item['change_pct']:+.1f}%, threshold {item['threshold_pct']:.0f}%)"
+                )
+            return 1
+        print(f"\nNo regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,7 +5,16 @@ import argparse
 import os
 import subprocess
 import sys
-from typing import List
+import time
+from typing import Dict, List
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from team.engine.validation import CHECKS, ContentCache, ValidationContext, run_validation  # noqa: E402
+
+DEFAULT_CACHE_PATH = os.path.join(REPO_ROOT, ".cache", "run_checks.json")
 
 
 def _run(cmd: List[str], repo_root: str) -> int:
@@ -14,6 +23,52 @@ def _run(cmd: List[str], repo_root: str) -> int:
     return completed.returncode
 
 
+def _run_checks(cache: ContentCache, names: List[str], jobs: int) -> int:
+    started = time.perf_counter()
+    ctx = ValidationContext(REPO_ROOT, cache=cache)
+    results = run_validation(ctx, names=names, max_workers=jobs)
+    failures = 0
+    for result in results:
+        print(f"==> {result.name} ({result.elapsed_ms:.1f} ms, {result.cached}/{result.checked} cached)")
+        for line in result.lines:
+            print(line)
+        if not result.passed:
+            failures += 1
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    if failures:
+        print(f"\nChecks failed: {failures} check(s) reported errors. ({elapsed_ms:.1f} ms)")
+        return 1
+    print(f"\nAll checks passed. ({elapsed_ms:.1f} ms)")
+    return 0
+
+
+def _snapshot(paths: List[str]) -> Dict[str, float]:
+    state: Dict[str, float] = {}
+    for path in paths:
+        try:
+            state[path] = os.stat(path).st_mtime
+        except OSError:
+            state[path] = -1.0
+    return state
+
+
+def _watch(cache: ContentCache, names: List[str], jobs: int, interval: float) -> int:
+    print(f"\nWatching for changes every {interval:.1f}s (Ctrl+C to stop)...")
+    previous = _snapshot(ValidationContext(REPO_ROOT, cache=cache).watched_paths())
+    try:
+        while True:
+            time.sleep(interval)
+            current = _snapshot(ValidationContext(REPO_ROOT, cache=cache).watched_paths())
+            if current == previous:
+                continue
+            changed = sorted(path for path in set(current) | set(previous) if current.get(path) != previous.get(path))
+            previous = current
+            print("\nChanged: " + ", ".join(os.path.relpath(path, REPO_ROOT) for path in changed))
+            _run_checks(cache, names, jobs)
+    except KeyboardInterrupt:
+        return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run repository checks")
     parser.add_argument(
@@ -21,41 +76,65 @@ def main() -> int:
         action="store_true",
         help="Also run a smoke orchestrator execution after validation checks.",
     )
+    parser.add_argument(
+        "--with-import-time",
+        action="store_true",
+        help="Also check cold-import time budgets (team/scripts/check_import_time.py).",
+    )
+    parser.add_argument(
+        "--with-tests",
+        action="store_true",
+        help="Also run the unit tests in team/tests (stdlib unittest).",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=sorted(CHECKS.keys()),
+        help="Run only the named check (repeatable).",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Concurrent checks (default: one per check).")
+    parser.add_argument("--no-cache", action="store_true", help="Revalidate every file, ignoring the content cache.")
+    parser.add_argument("--cache-file", default=DEFAULT_CACHE_PATH, help="Content-hash cache location.")
+    parser.add_argument("--watch", action="store_true", help="Keep running and revalidate changed files.")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds for --watch.")
     args = parser.parse_args()
 
-    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    commands: List[List[str]] = [
-        [sys.executable, os.path.join("team", "scripts", "validate_system_profile.py")],
-        [sys.executable, os.path.join("team", "scripts", "validate_playbooks.py")],
-        [sys.executable, os.path.join("team", "scripts", "validate_templates.py")],
-        [sys.executable, os.path.join("team", "scripts", "validate_skills.py")],
-        [sys.executable, os.path.join("team", "scripts", "validate_markdown_skills.py")],
-        [sys.executable, os.path.join("team", "scripts", "validate_skill_exclusivity.py")],
-    ]
+    cache = ContentCache(None if args.no_cache else args.cache_file)
+    names = args.only or list(CHECKS.keys())
+    try:
+        exit_code = _run_checks(cache, names, args.jobs)
+    except RuntimeError as exc:
+        print(f"error: {exc}")
+        return 2
+
     if args.with_smoke:
-        commands.append(
-            [
-                sys.executable,
-                os.path.join("team", "orchestrator", "orchestrator.py"),
-                "--repo",
-                repo_root,
-                "--playbook",
-                "build",
-            ]
-        )
+        smoke_cmd = [
+            sys.executable,
+            os.path.join("team", "orchestrator", "orchestrator.py"),
+            "--repo",
+            REPO_ROOT,
+            "--playbook",
+            "build",
+        ]
+        if _run(smoke_cmd, REPO_ROOT) != 0:
+            print("\nSmoke run failed.")
+            exit_code = 1
 
-    failures = 0
-    for cmd in commands:
-        exit_code = _run(cmd, repo_root)
-        if exit_code != 0:
-            failures += 1
+    if args.with_tests:
+        test_cmd = [sys.executable, "-m", "unittest", "discover", "-s", os.path.join("team", "tests"), "-t", "."]
+        if _run(test_cmd, REPO_ROOT) != 0:
+            print("\nUnit tests failed.")
+            exit_code = 1
 
-    if failures:
-        print(f"\nChecks failed: {failures} command(s) reported errors.")
-        return 1
+    if args.with_import_time:
+        import_cmd = [sys.executable, os.path.join("team", "scripts", "check_import_time.py")]
+        if _run(import_cmd, REPO_ROOT) != 0:
+            print("\nImport-time budget exceeded.")
+            exit_code = 1
 
-    print("\nAll checks passed.")
-    return 0
+    if args.watch:
+        return _watch(cache, names, args.jobs, args.interval)
+    return exit_code
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 """Role subgraph stubs that write artifacts via the StateBroker."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from team.engine.budget import estimate_payload_tokens
 from team.engine.state_broker import StateBroker
+from team.engine.workers import WorkerTask, fan_out
 
 
 def _skill_info(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -33,6 +35,43 @@ def _with_skill_metadata(payload: Dict[str, Any], state: Dict[str, Any]) -> Dict
     return payload
 
 
+def _usage(*payloads: Dict[str, Any], tool_calls: int, workers: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Usage reported to the orchestrator's budget ledger: output tokens, broker calls and worker spawns."""
+    workers = workers or {}
+    return {
+        "tokens": sum(estimate_payload_tokens(payload) for payload in payloads) + int(workers.get("tokens", 0)),
+        "tool_calls": tool_calls + int(workers.get("tool_calls", 0)),
+        "spawns": int(workers.get("spawns", 0)),
+    }
+
+
+def _run_workers(role: str, artifact_type: str, payload: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, int]:
+    """Fan out to the role's declared workers when the orchestrator granted a `worker_context`.
+
+    The merged worker output is attached to `payload` as `worker_outputs`; returns the workers' usage.
+    """
+    context = state.get("worker_context")
+    if not isinstance(context, dict) or not context.get("workers"):
+        return {}
+    options = context.get("options") if isinstance(context.get("options"), dict) else {}
+    per_worker = options.get("per_worker") if isinstance(options.get("per_worker"), dict) else {}
+    subject = {
+        "artifact": artifact_type,
+        "runtime_target": state.get("runtime_target", "langgraph"),
+        "skill_names": _skill_info(state)["names"],
+    }
+    tasks = [
+        WorkerTask(
+            worker_id=str(worker), role=role, task=f"{worker} on {artifact_type}", payload=subject, budget=per_worker
+        )
+        for worker in context["workers"]
+    ]
+    outcome = fan_out(tasks, max_spawns=context.get("max_spawns"), options=options)
+    if outcome["usage"]["spawns"]:
+        payload["worker_outputs"] = outcome["merged"]
+    return outcome["usage"]
+
+
 def _default_system_spec(runtime_target: str) -> Dict[str, Any]:
     return {
         "version": 0,
@@ -357,8 +396,9 @@ def _validate_compilation_inputs(
 def run_architect(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
     spec = _default_system_spec(state.get("runtime_target", "langgraph"))
     spec = _with_skill_metadata(spec, state)
+    workers = _run_workers("architect", "SystemSpec", spec, state)
     version = broker.write("SystemSpec", spec, author="architect")
-    return {"artifact": "SystemSpec", "version": version}
+    return {"artifact": "SystemSpec", "version": version, "usage": _usage(spec, tool_calls=1, workers=workers)}
 
 
 def run_prompt_policy(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
@@ -367,15 +407,17 @@ def run_prompt_policy(state: Dict[str, Any], broker: StateBroker) -> Dict[str, A
     if skill["instructions"]:
         pack["role_prompts"]["skill_context"] = skill["instructions"]
     pack = _with_skill_metadata(pack, state)
+    workers = _run_workers("prompt_policy", "PromptPack", pack, state)
     version = broker.write("PromptPack", pack, author="prompt_policy")
-    return {"artifact": "PromptPack", "version": version}
+    return {"artifact": "PromptPack", "version": version, "usage": _usage(pack, tool_calls=1, workers=workers)}
 
 
 def run_tooling(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
     contract = _default_tool_contract()
     contract = _with_skill_metadata(contract, state)
+    workers = _run_workers("tooling", "ToolContract", contract, state)
     version = broker.write("ToolContract", contract, author="tooling")
-    return {"artifact": "ToolContract", "version": version}
+    return {"artifact": "ToolContract", "version": version, "usage": _usage(contract, tool_calls=1, workers=workers)}
 
 
 def run_eval(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
@@ -383,6 +425,7 @@ def run_eval(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
     report = _default_experiment_report()
     eval_spec = _with_skill_metadata(eval_spec, state)
     report = _with_skill_metadata(report, state)
+    workers = _run_workers("eval", "ExperimentReport", report, state)
     eval_version = broker.write("EvalSpec", eval_spec, author="eval")
     report_version = broker.write("ExperimentReport", report, author="eval")
     return {
@@ -390,6 +433,7 @@ def run_eval(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
         "version": report_version,
         "eval_spec_version": eval_version,
         "quality_gate_output": {"pass": True, "score": 1.0, "failure_signals": {}},
+        "usage": _usage(eval_spec, report, tool_calls=2, workers=workers),
     }
 
 
@@ -398,9 +442,15 @@ def run_optimizer(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
     decision = _default_promotion_decision()
     spec = _with_skill_metadata(spec, state)
     decision = _with_skill_metadata(decision, state)
+    workers = _run_workers("optimizer", "ExperimentSpec", spec, state)
     spec_version = broker.write("ExperimentSpec", spec, author="optimizer")
     decision_version = broker.write("PromotionDecision", decision, author="optimizer")
-    return {"artifact": "PromotionDecision", "version": decision_version, "experiment_spec_version": spec_version}
+    return {
+        "artifact": "PromotionDecision",
+        "version": decision_version,
+        "experiment_spec_version": spec_version,
+        "usage": _usage(spec, decision, tool_calls=2, workers=workers),
+    }
 
 
 def run_ops(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
@@ -408,6 +458,7 @@ def run_ops(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
     slo = _default_slo_report()
     telemetry = _with_skill_metadata(telemetry, state)
     slo = _with_skill_metadata(slo, state)
+    workers = _run_workers("ops", "SLOReport", slo, state)
     telemetry_version = broker.write("TelemetrySpec", telemetry, author="ops")
     slo_version = broker.write("SLOReport", slo, author="ops")
     return {
@@ -415,6 +466,7 @@ def run_ops(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
         "version": slo_version,
         "telemetry_version": telemetry_version,
         "production_gate_output": {"pass": True, "violations": [], "failure_signals": {}},
+        "usage": _usage(telemetry, slo, tool_calls=2, workers=workers),
     }
 
 
@@ -439,6 +491,7 @@ def run_compiler(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
     report["assumptions"] = assumptions
     report["errors"] = errors
     report = _with_skill_metadata(report, state)
+    workers = _run_workers("compiler", "CompilationReport", report, state)
     compiled_version = broker.write("CompiledSpec", compiled, author="compiler")
     report_version = broker.write("CompilationReport", report, author="compiler")
     return {
@@ -446,4 +499,5 @@ def run_compiler(state: Dict[str, Any], broker: StateBroker) -> Dict[str, Any]:
         "version": compiled_version,
         "report_version": report_version,
         "compilation_errors": errors,
+        "usage": _usage(compiled, report, tool_calls=5, workers=workers),
     }
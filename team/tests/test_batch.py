@@ -0,0 +1,101 @@
+"""Batch runner resume bookkeeping, with the per-run orchestrator call replaced by a fake."""
+from __future__ import annotations
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List
+from unittest import mock
+
+from team.engine.state_broker import StateBroker
+from team.orchestrator import batch
+
+
+def _write(path: str, records: List[Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record) + "\n")
+
+
+def _read(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def _fake_run(task: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": task["id"], "status": "done", "elapsed_ms": 1.0}
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, "out.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _resume(self, ids: List[str]) -> Dict[str, Any]:
+        stream = io.StringIO("".join(json.dumps({"id": run_id}) + "\n" for run_id in ids))
+        with mock.patch.object(batch, "run_one", _fake_run), mock.patch.object(batch, "_init_worker"):
+            return batch.run_batch(".", stream, output_path=self.output, workers=0, resume=True)
+
+    def test_last_record_per_id_decides_completion(self) -> None:
+        _write(self.output, [
+            {"id": "a", "status": "error"},
+            {"id": "a", "status": "done"},
+            {"id": "b", "status": "done"},
+            {"id": "b", "status": "error"},
+        ])
+        with open(self.output, "a", encoding="utf-8") as handle:
+            handle.write('{"id": "c", "sta')  # torn line from an interrupted run
+        self.assertEqual(batch.completed_ids(self.output), {"a"})
+
+    def test_retried_error_keeps_one_record(self) -> None:
+        _write(self.output, [
+            {"id": "a", "status": "error", "error": "boom"},
+            {"id": "b", "status": "done"},
+            {"id": "b", "status": "done"},
+            {"id": "c", "status": "error", "error": "not in this input"},
+        ])
+        stats = self._resume(["a", "b"])
+
+        self.assertEqual((stats["runs"], stats["skipped"]), (1, 1))
+        records = _read(self.output)
+        self.assertEqual(sorted(record["id"] for record in records), ["a", "b", "c"])
+        by_id = {record["id"]: record for record in records}
+        self.assertEqual(by_id["a"]["status"], "done")
+        self.assertEqual(by_id["c"]["error"], "not in this input")
+
+
+class NamespaceTest(unittest.TestCase):
+    def test_dot_and_unsafe_ids_get_their_own_directory(self) -> None:
+        ids = ["..", ".", "", "../..", "a/b", "a_b", "keep1"]
+        namespaces = [batch._namespace("b2", run_id) for run_id in ids]
+        self.assertEqual(len(set(namespaces)), len(ids))
+        self.assertEqual(namespaces[-1], "batch/b2/keep1")
+        self.assertEqual(batch._namespace("..", "r1").split("/")[1][:2], "_-")
+        for namespace in namespaces:
+            self.assertFalse({"", ".", ".."} & set(namespace.split("/")), namespace)
+
+    def test_broker_rejects_namespaces_outside_its_own_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for namespace in ("batch/b2/..", "..", "../outside", "batch//x", "/abs"):
+                with self.assertRaises(ValueError, msg=namespace):
+                    StateBroker(tmp, namespace=namespace)
+            self.assertFalse(os.path.exists(os.path.join(tmp, "namespaces")))
+
+    def test_drop_namespace_leaves_sibling_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            keep = StateBroker(tmp, namespace=batch._namespace("b1", "keep1"))
+            dropped = StateBroker(tmp, namespace=batch._namespace("b2", ".."))
+            dropped.drop_namespace()
+
+            self.assertTrue(os.path.isdir(keep.artifact_dir))
+            self.assertFalse(os.path.exists(os.path.dirname(dropped.artifact_dir)))
+            self.assertTrue(os.path.isdir(os.path.join(tmp, "namespaces", "batch", "b2")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""Cold-start budgets: the orchestrator and API import within budget and without heavy dependencies."""
+from __future__ import annotations
+
+import importlib.util
+import os
+import unittest
+
+from team.engine.import_time import DEFAULT_BUDGETS, check_import_budgets
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Modules that cannot be imported at all without an optional dependency are skipped rather than failed.
+REQUIRES = {"team.api.server": "fastapi"}
+
+
+class ImportBudgetTest(unittest.TestCase):
+    def test_modules_import_within_budget(self) -> None:
+        for module, budget in DEFAULT_BUDGETS.items():
+            with self.subTest(module=module):
+                requirement = REQUIRES.get(module)
+                if requirement and importlib.util.find_spec(requirement) is None:
+                    self.skipTest(f"{requirement} is not installed")
+                (result,) = check_import_budgets(REPO_ROOT, {module: budget})
+                self.assertEqual(result["forbidden_loaded"], [], f"{module} imports heavy modules at load")
+                self.assertLessEqual(result["cumulative_ms"], result["max_ms"], f"slowest: {result['slowest']}")
+
+
+if __name__ == "__main__":
+    unittest.main()
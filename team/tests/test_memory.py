@@ -0,0 +1,63 @@
+"""Mem0Adapter's async client setup, against a fake `mem0` module whose AsyncMemory is slow to create."""
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+import unittest
+from typing import Any, Dict, List
+from unittest import mock
+
+from team.engine.memory import Mem0Adapter
+
+
+class _FakeAsyncMemory:
+    created = 0
+
+    def __init__(self) -> None:
+        self.added: List[str] = []
+
+    @classmethod
+    async def from_config(cls, config: Dict[str, Any]) -> "_FakeAsyncMemory":
+        cls.created += 1
+        await asyncio.sleep(0.05)
+        return cls()
+
+    async def search(self, query: str, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        return [{"memory": "async hit"}]
+
+    async def add(self, text: str, user_id: str, metadata: Dict[str, Any]) -> None:
+        self.added.append(text)
+
+
+class _UnusedMemory:
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "_UnusedMemory":
+        raise AssertionError("the sync client must not be created while the async one is connecting")
+
+
+class AsyncConnectTest(unittest.TestCase):
+    def test_concurrent_first_calls_share_one_async_client(self) -> None:
+        fake = types.ModuleType("mem0")
+        fake.AsyncMemory = _FakeAsyncMemory  # type: ignore[attr-defined]
+        fake.Memory = _UnusedMemory  # type: ignore[attr-defined]
+        _FakeAsyncMemory.created = 0
+        adapter = Mem0Adapter(user_id="u", agent_id="a", config={"fake": True})
+        scope = {"role": "dev", "phase": "build", "playbook": "build", "runtime_target": "langgraph"}
+
+        async def burst() -> List[Any]:
+            fetches = [adapter.afetch(query="q", top_k=3, **scope) for _ in range(3)]
+            record = adapter.arecord(outcome={"summary": "done"}, **scope)
+            return list(await asyncio.gather(*fetches, record))
+
+        with mock.patch.dict(sys.modules, {"mem0": fake}):
+            results = asyncio.run(burst())
+
+        self.assertEqual(_FakeAsyncMemory.created, 1)
+        self.assertEqual(results[:3], [["async hit"]] * 3)
+        self.assertEqual(adapter._amemory.added, ["done"])
+        self.assertIsNone(adapter._memory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,371 @@
+"""Postgres broker and meta-eval log against an in-process fake of `psycopg`/`psycopg_pool`.
+
+The fake keeps tables as dicts and answers exactly the statements the module sends. Parameters are bound in
+the order their `%s` placeholders appear in the SQL text, as psycopg does, so a misordered tuple fails here.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from unittest import mock
+
+from team.engine import postgres_state
+from team.engine.meta_eval_log import MetaEvalLog
+from team.engine.postgres_state import PostgresStateBroker, get_postgres_meta_eval_log
+
+_SELECT_PREFIX = "SELECT "
+_SELECT_FROM = " FROM broker_artifacts WHERE namespace = %s"
+
+
+class Jsonb:
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+
+def _load(value: Any) -> Any:
+    # Values come back from the database as fresh JSON, never as the caller's objects.
+    return json.loads(json.dumps(value.obj if isinstance(value, Jsonb) else value))
+
+
+def _text(value: Any) -> str:
+    """`->>` / `jsonb_*_text`: strings as-is, anything else as JSON text."""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+class FakeDatabase:
+    def __init__(self) -> None:
+        self.heads: Dict[Tuple[str, str], int] = {}
+        self.artifacts: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+        self.meta_eval: List[Dict[str, Any]] = []
+        self.notifications: List[Tuple[str, Dict[str, Any]]] = []
+        self.statements: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.batches: List[int] = []
+
+
+class FakeResult:
+    def __init__(self, rows: Sequence[Tuple[Any, ...]]) -> None:
+        self.rows = list(rows)
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        return list(self.rows)
+
+
+class FakeCursor:
+    def __init__(self, conn: "FakeConnection") -> None:
+        self.conn = conn
+        self.itersize = 0
+        self._rows: List[Tuple[Any, ...]] = []
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        self._rows = self.conn.execute(sql, params).rows
+
+    def executemany(self, sql: str, rows: Sequence[Sequence[Any]]) -> None:
+        self.conn.db.batches.append(len(rows))
+        for row in rows:
+            self.conn.execute(sql, row)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return iter(self._rows)
+
+
+class FakeConnection:
+    def __init__(self, db: FakeDatabase) -> None:
+        self.db = db
+
+    def transaction(self) -> Any:
+        return contextlib.nullcontext()
+
+    def pipeline(self) -> Any:
+        return contextlib.nullcontext()
+
+    def cursor(self, name: Optional[str] = None) -> FakeCursor:
+        return FakeCursor(self)
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> FakeResult:
+        sql = " ".join(sql.split())
+        params = tuple(params)
+        if sql.count("%s") != len(params):
+            raise AssertionError(f"{len(params)} parameters for {sql.count('%s')} placeholders: {sql}")
+        self.db.statements.append((sql, params))
+        db = self.db
+        if sql.startswith(("CREATE ", "SELECT pg_advisory_xact_lock")):
+            return FakeResult([])
+        if sql.startswith("INSERT INTO broker_heads (namespace, artifact_type, version) VALUES (%s, %s, 1)"):
+            key = (params[0], params[1])
+            if key not in db.heads:
+                db.heads[key] = 1
+            elif "ON CONFLICT (namespace, artifact_type) DO UPDATE SET version = broker_heads.version + 1" in sql:
+                db.heads[key] += 1
+            else:
+                raise AssertionError("duplicate key value violates unique constraint on broker_heads")
+            return FakeResult([(db.heads[key],)] if sql.endswith("RETURNING version") else [])
+        if sql.startswith("INSERT INTO broker_artifacts"):
+            namespace, artifact_type, version, body, summary, digest = params
+            db.artifacts[(namespace, artifact_type, version)] = {
+                "body": _load(body),
+                "summary": _load(summary),
+                "content_hash": digest,
+            }
+            return FakeResult([])
+        if sql.startswith("SELECT pg_notify"):
+            db.notifications.append((params[0], json.loads(params[1])))
+            return FakeResult([])
+        if sql.startswith("SELECT version FROM broker_heads"):
+            version = db.heads.get((params[0], params[1]))
+            return FakeResult([(version,)] if version is not None else [])
+        if sql.startswith(_SELECT_PREFIX) and _SELECT_FROM in sql:
+            return self._select(sql, params)
+        if sql.startswith("DELETE FROM broker_artifacts WHERE namespace = %s"):
+            for key in [key for key in db.artifacts if key[0] == params[0]]:
+                del db.artifacts[key]
+            return FakeResult([])
+        if sql.startswith("DELETE FROM broker_heads WHERE namespace = %s"):
+            for key in [key for key in db.heads if key[0] == params[0]]:
+                del db.heads[key]
+            return FakeResult([])
+        if sql.startswith("INSERT INTO meta_eval_entries"):
+            ts, playbook, status, entry = params
+            db.meta_eval.append(
+                {"id": len(db.meta_eval) + 1, "ts": ts, "playbook": playbook, "status": status, "entry": _load(entry)}
+            )
+            return FakeResult([])
+        if sql.startswith("SELECT id, entry FROM meta_eval_entries WHERE id > %s"):
+            return FakeResult([(row["id"], row["entry"]) for row in db.meta_eval if row["id"] > params[0]])
+        if sql.startswith("SELECT entry FROM meta_eval_entries"):
+            return FakeResult([(row["entry"],) for row in db.meta_eval])
+        return self._aggregate(sql)
+
+    def _select(self, sql: str, params: Tuple[Any, ...]) -> FakeResult:
+        column = sql[len(_SELECT_PREFIX) : sql.index(_SELECT_FROM)]
+        bound = column.count("%s")
+        column_params = params[:bound]
+        namespace, artifact_type, version, head_namespace, head_type = params[bound:]
+        if version is None:
+            version = self.db.heads.get((head_namespace, head_type))
+        row = self.db.artifacts.get((namespace, artifact_type, version))
+        if row is None:
+            return FakeResult([])
+        if column == "body #> %s":
+            (path,) = column_params
+            if not isinstance(path, list):
+                raise AssertionError(f"`body #> %s` bound to {path!r}, expected a text[] path")
+            return FakeResult([(_extract(row["body"], path),)])
+        return FakeResult([(row[column],)])
+
+    def _aggregate(self, sql: str) -> FakeResult:
+        """The GROUP BY queries of `PostgresMetaEvalLog.aggregate`, computed over every stored entry."""
+        counts: Dict[Tuple[Any, ...], int] = {}
+
+        def bump(*key: Any) -> None:
+            counts[key] = counts.get(key, 0) + 1
+
+        for row in self.db.meta_eval:
+            entry = row["entry"]
+            if "GROUP BY playbook, status" in sql:
+                bump(row["playbook"], row["status"])
+            elif "entry->>'steps_used'" in sql:
+                bump(_text(entry["steps_used"]) if entry.get("steps_used") is not None else "0")
+            elif "jsonb_each_text" in sql:
+                loops = entry.get("loop_counts")
+                for phase, value in (loops.items() if isinstance(loops, dict) else []):
+                    bump(phase, _text(value))
+            elif "jsonb_array_elements_text" in sql:
+                names = entry.get("artifacts_written")
+                for name in names if isinstance(names, list) else []:
+                    bump(_text(name))
+            else:
+                raise AssertionError(f"unexpected statement: {sql}")
+        return FakeResult([(*key, count) for key, count in counts.items()])
+
+
+def _extract(body: Any, path: List[str]) -> Any:
+    node = body
+    for segment in path:
+        if isinstance(node, dict) and segment in node:
+            node = node[segment]
+        elif isinstance(node, list) and segment.lstrip("-").isdigit() and -len(node) <= int(segment) < len(node):
+            node = node[int(segment)]
+        else:
+            return None
+    return node
+
+
+class FakePool:
+    databases: Dict[str, FakeDatabase] = {}
+
+    def __init__(self, dsn: str, **kwargs: Any) -> None:
+        self.db = self.databases.setdefault(dsn, FakeDatabase())
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[FakeConnection]:
+        yield FakeConnection(self.db)
+
+    def close(self) -> None:
+        return None
+
+
+def _fake_modules() -> Dict[str, types.ModuleType]:
+    psycopg = types.ModuleType("psycopg")
+    sql = types.ModuleType("psycopg.sql")
+    psycopg_types = types.ModuleType("psycopg.types")
+    json_module = types.ModuleType("psycopg.types.json")
+    pool = types.ModuleType("psycopg_pool")
+    json_module.Jsonb = Jsonb  # type: ignore[attr-defined]
+    pool.ConnectionPool = FakePool  # type: ignore[attr-defined]
+    psycopg.sql = sql  # type: ignore[attr-defined]
+    psycopg.types = psycopg_types  # type: ignore[attr-defined]
+    psycopg_types.json = json_module  # type: ignore[attr-defined]
+    return {
+        "psycopg": psycopg,
+        "psycopg.sql": sql,
+        "psycopg.types": psycopg_types,
+        "psycopg.types.json": json_module,
+        "psycopg_pool": pool,
+    }
+
+
+class _PostgresTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dsn = f"postgresql://fake/{uuid.uuid4().hex}"
+        self.options = {"dsn": self.dsn, "listen": False, "batch_size": 2}
+        patcher = mock.patch.dict(sys.modules, _fake_modules())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(postgres_state._LOGS.pop, self.dsn, None)
+        self.addCleanup(postgres_state._STORES.pop, self.dsn, None)
+
+    def broker(self, namespace: Optional[str] = None) -> PostgresStateBroker:
+        return PostgresStateBroker(self.tmp.name, postgres=self.options, namespace=namespace)
+
+    @property
+    def db(self) -> FakeDatabase:
+        return FakePool.databases[self.dsn]
+
+
+class ArtifactTest(_PostgresTestCase):
+    def test_versions_are_allocated_per_namespace_and_type(self) -> None:
+        main, other = self.broker(), self.broker("batch/b1/r1")
+        self.assertEqual(main.write("SLOReport", {"pass": True, "version": 9}, "ops"), 1)
+        self.assertEqual(main.write("SLOReport", {"pass": False}, "ops"), 2)
+        self.assertEqual(main.write("SystemSpec", {"name": "x"}, "architect"), 1)
+        self.assertEqual(other.write("SLOReport", {"pass": True}, "ops"), 1)
+
+        self.assertEqual(self.db.heads, {("", "SLOReport"): 2, ("", "SystemSpec"): 1, ("batch/b1/r1", "SLOReport"): 1})
+        self.assertEqual(main.latest_version("SLOReport"), 2)
+        self.assertEqual(main.read_full("SLOReport"), {"pass": False, "version": 2})
+        self.assertEqual(main.read_full("SLOReport", 1), {"pass": True, "version": 1})
+        self.assertEqual(main.read_summary("SLOReport")["version"], 2)
+        self.assertEqual(main.content_hash("SLOReport", 1), self.db.artifacts[("", "SLOReport", 1)]["content_hash"])
+        self.assertEqual(
+            self.db.notifications[-1],
+            ("deepagent_artifacts", {"namespace": "batch/b1/r1", "artifact_type": "SLOReport", "version": 1}),
+        )
+        with self.assertRaises(FileNotFoundError):
+            main.read_full("SLOReport", 3)
+        with self.assertRaises(FileNotFoundError):
+            other.read_full("SystemSpec")
+
+    def test_read_section_binds_the_path_before_the_row_key(self) -> None:
+        broker = self.broker("ns")
+        broker.write("SystemSpec", {"graph": {"nodes": [{"id": "a"}, {"id": "b"}]}}, "architect")
+        broker.write("SystemSpec", {"graph": {"nodes": [{"id": "c"}]}}, "architect")
+
+        self.assertEqual(broker.read_section("SystemSpec", "graph.nodes.1.id", version=1), "b")
+        self.assertEqual(broker.read_section("SystemSpec", "graph.nodes"), [{"id": "c"}])
+        self.assertIsNone(broker.read_section("SystemSpec", "graph.missing"))
+        sql, params = self.db.statements[-1]
+        self.assertTrue(sql.startswith("SELECT body #> %s FROM broker_artifacts"))
+        self.assertEqual(params, (["graph", "missing"], "ns", "SystemSpec", None, "ns", "SystemSpec"))
+
+    def test_drop_namespace_leaves_other_namespaces(self) -> None:
+        keep, dropped = self.broker("batch/b1/keep"), self.broker("batch/b1/drop")
+        keep.write("SLOReport", {"pass": True}, "ops")
+        dropped.write("SLOReport", {"pass": True}, "ops")
+        dropped.write("SLOReport", {"pass": False}, "ops")
+        dropped.drop_namespace()
+
+        self.assertEqual({key[0] for key in self.db.artifacts}, {"batch/b1/keep"})
+        self.assertEqual(self.db.notifications[-1][1], {"namespace": "batch/b1/drop", "dropped": True})
+        self.assertEqual(self.broker("batch/b1/drop").write("SLOReport", {"pass": True}, "ops"), 1)
+        self.assertEqual(keep.read_full("SLOReport")["version"], 1)
+
+
+ENTRIES: List[Dict[str, Any]] = [
+    {"ts": 10.0, "playbook": "build", "status": "done", "steps_used": 4, "loop_counts": {"eval": 2},
+     "artifacts_written": ["SystemSpec", "SLOReport"]},
+    {"ts": 11.0, "playbook": "build", "status": "blocked", "steps_used": 9, "loop_counts": {"eval": 3, "ops": 1},
+     "artifacts_written": ["SystemSpec"]},
+    {"ts": 12.0, "playbook": "debug", "status": "done", "steps_used": 2, "loop_counts": "n/a"},
+    {"ts": 13.0, "playbook": "build", "status": "done", "artifacts_written": "n/a"},
+    {"ts": 14.0, "playbook": "debug", "status": "done", "steps_used": 7, "loop_counts": {"eval": 2}},
+]
+
+
+class MetaEvalTest(_PostgresTestCase):
+    def log(self) -> Any:
+        return get_postgres_meta_eval_log(self.options, {"buffer_entries": 100, "flush_interval_s": 3600})
+
+    def test_buffered_appends_flush_in_batches(self) -> None:
+        log = self.log()
+        for entry in ENTRIES:
+            log.append(entry)
+        self.assertEqual(self.db.meta_eval, [])
+        self.assertEqual(log.flush(), 5)
+
+        self.assertEqual(self.db.batches, [2, 2, 1])
+        self.assertEqual([row["playbook"] for row in self.db.meta_eval], ["build", "build", "debug", "build", "debug"])
+        self.assertEqual(list(log.entries()), ENTRIES)
+        first, cursor = log.read_from(None)
+        self.assertEqual((len(first), cursor), (5, {"last_id": 5}))
+        log.append(ENTRIES[0])
+        self.assertEqual(log.read_from(cursor), ([ENTRIES[0]], {"last_id": 6}))
+
+    def test_aggregate_matches_the_file_log(self) -> None:
+        log = self.log()
+        file_log = MetaEvalLog(os.path.join(self.tmp.name, "meta_eval_log.jsonl"))
+        for entry in ENTRIES:
+            log.append(entry)
+            file_log.append(entry)
+
+        expected = file_log.aggregate()
+        result = log.aggregate()
+
+        for key in ("segments_from_index", "segments_scanned"):
+            expected.pop(key)
+            result.pop(key)
+        self.assertEqual(result, expected)
+        self.assertEqual(result["runs"], 5)
+        self.assertEqual(result["loop_counts"], {"eval": {"2": 2, "3": 1}, "ops": {"1": 1}})
+
+    def test_aggregate_filters_reach_every_query(self) -> None:
+        log = self.log()
+        log.append(ENTRIES[0])
+        log.aggregate(since=10.0, playbook="build")
+
+        queries = self.db.statements[-4:]
+        self.assertEqual(len(queries), 4)
+        for sql, params in queries:
+            self.assertIn("FROM meta_eval_entries WHERE ts >= %s AND playbook = %s", sql)
+            self.assertEqual(params, (10.0, "build"))
+
+
+if __name__ == "__main__":
+    unittest.main()
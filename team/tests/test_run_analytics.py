@@ -0,0 +1,34 @@
+"""Columnar run store: names that sanitize or join to the same string still get separate files."""
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from team.engine.meta_eval_log import MetaEvalLog
+from team.engine.run_analytics import ColumnarRunStore
+
+
+class NamingTest(unittest.TestCase):
+    def test_colliding_names_stay_separate(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log = MetaEvalLog(os.path.join(tmp, "meta_eval_log.jsonl"))
+            roles = {"x y": 1, "x_y": 4}
+            log.append({"ts": 1, "playbook": "a__b", "runtime_target": "c", "steps_used": 3, "role_steps": roles})
+            log.append({"ts": 2, "playbook": "a", "runtime_target": "b__c", "steps_used": 5})
+            log.flush()
+            store = ColumnarRunStore(os.path.join(tmp, "analytics"))
+
+            self.assertEqual(store.compact(log)["partitions_touched"], 2)
+            report = store.aggregate()
+
+        groups = {(group["playbook"], group["runtime_target"]): group for group in report["groups"]}
+        self.assertEqual(set(groups), {("a__b", "c"), ("a", "b__c")})
+        self.assertEqual(groups[("a__b", "c")]["steps_used"]["max"], 3.0)
+        self.assertEqual(groups[("a", "b__c")]["steps_used"]["max"], 5.0)
+        roles = groups[("a__b", "c")]["roles"]
+        self.assertEqual((roles["x y"]["max"], roles["x_y"]["max"]), (1.0, 4.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
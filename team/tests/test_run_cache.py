@@ -0,0 +1,64 @@
+"""Run cache expiry: expired on-disk results are deleted rather than left to accumulate."""
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from typing import Any, Dict
+
+from team.api.run_cache import RunCache
+
+
+def _done() -> Dict[str, Any]:
+    return {"status": "done"}
+
+
+class ExpiryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_expired_file_is_deleted_on_lookup(self) -> None:
+        writer = RunCache(self.directory, {"ttl_s": 60})
+        writer.run("key-a", "hash", _done)
+        path = os.path.join(self.directory, "key-a.json")
+        self.assertTrue(os.path.isfile(path))
+
+        reader = RunCache(self.directory, {"ttl_s": 60})
+        self.assertEqual(reader.run("key-a", "hash", _done), ({"status": "done"}, "cached"))
+        self.assertIsNone(RunCache(self.directory, {"ttl_s": 60})._lookup("key-a", time.time() + 61))
+        self.assertFalse(os.path.exists(path))
+
+    def test_prune_sweeps_expired_files(self) -> None:
+        cache = RunCache(self.directory, {"ttl_s": 60})
+        for key in ("key-old", "key-new"):
+            cache.run(key, "hash", _done)
+        stale = time.time() - 120
+        old_path = os.path.join(self.directory, "key-old.json")
+        os.utime(old_path, (stale, stale))
+        tmp_path = os.path.join(self.directory, "key-x.json.1.2.tmp")
+        open(tmp_path, "w", encoding="utf-8").close()
+        os.utime(tmp_path, (stale, stale))
+
+        self.assertEqual(cache.prune(), 2)
+        self.assertEqual(os.listdir(self.directory), ["key-new.json"])
+
+    def test_persist_prunes_at_most_once_per_interval(self) -> None:
+        cache = RunCache(self.directory, {"ttl_s": 60, "prune_interval_s": 300})
+        cache.run("key-a", "hash", _done)
+        stale = time.time() - 120
+        os.utime(os.path.join(self.directory, "key-a.json"), (stale, stale))
+
+        cache.run("key-b", "hash", _done)
+        self.assertEqual(sorted(os.listdir(self.directory)), ["key-a.json", "key-b.json"])
+        cache._pruned_at -= 300
+        cache.run("key-c", "hash", _done)
+        self.assertEqual(sorted(os.listdir(self.directory)), ["key-b.json", "key-c.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""Run queue and queue worker behaviour over the in-process `memory://` stream backend."""
+from __future__ import annotations
+
+import importlib.util
+import threading
+import time
+import unittest
+import uuid
+from typing import Any, Callable, Dict, List
+
+from team.engine.run_queue import QueueWorker, RunQueue
+
+
+def _queue(**options: Any) -> RunQueue:
+    # A fresh memory:// name per test keeps the process-wide fakes from sharing streams.
+    url = f"memory://test-{uuid.uuid4().hex}"
+    queue = RunQueue.from_options({"redis_url": url, **options})
+    queue.ensure_group()
+    return queue
+
+
+class _Executor:
+    """Fake run executor: records payloads and runs `behaviour(call_number)` for each call."""
+
+    def __init__(self, behaviour: Callable[[int], Dict[str, Any]]) -> None:
+        self.behaviour = behaviour
+        self.payloads: List[Dict[str, Any]] = []
+
+    def __call__(self, payload: Dict[str, Any], cancel_requested: Callable[[], bool]) -> Dict[str, Any]:
+        self.payloads.append(payload)
+        return self.behaviour(len(self.payloads))
+
+
+def _done(_: int) -> Dict[str, Any]:
+    return {"status": "done"}
+
+
+def _fail(_: int) -> Dict[str, Any]:
+    raise RuntimeError("boom")
+
+
+class RunQueueTest(unittest.TestCase):
+    def test_submit_execute_ack_result(self) -> None:
+        queue = _queue()
+        execute = _Executor(_done)
+        run_id = queue.submit({"playbook": "build"})
+        self.assertTrue(queue.submitted(run_id))
+        self.assertIsNone(queue.result(run_id))
+
+        self.assertTrue(QueueWorker(queue, execute, consumer="a").poll(block_ms=100))
+
+        self.assertEqual(execute.payloads, [{"playbook": "build"}])
+        self.assertEqual(queue.wait(run_id, timeout_s=1.0), {"status": "done"})
+        self.assertEqual(queue.client.xpending_range(queue.stream, queue.group, "-", "+", 10), [])
+        self.assertFalse(QueueWorker(queue, execute, consumer="b").poll(block_ms=50))
+
+    def test_default_consumer_names_are_distinct(self) -> None:
+        queue = _queue()
+        workers = [QueueWorker(queue, _Executor(_done)) for _ in range(3)]
+        self.assertEqual(len({worker.consumer for worker in workers}), 3)
+
+    def test_unknown_run_is_not_submitted(self) -> None:
+        queue = _queue()
+        self.assertFalse(queue.submitted("never-enqueued"))
+
+    def test_failed_run_is_reclaimed_after_visibility_timeout(self) -> None:
+        queue = _queue(visibility_timeout_s=0.2, max_attempts=3)
+
+        def flaky(call: int) -> Dict[str, Any]:
+            if call == 1:
+                raise RuntimeError("transient")
+            return {"status": "done"}
+
+        execute = _Executor(flaky)
+        run_id = queue.submit({})
+        self.assertTrue(QueueWorker(queue, execute, consumer="a").poll(block_ms=100))
+        self.assertIsNone(queue.result(run_id))
+
+        other = QueueWorker(queue, execute, consumer="b")
+        self.assertFalse(other.poll(block_ms=50), "reclaimed before the visibility timeout")
+        time.sleep(0.25)
+        self.assertTrue(other.poll(block_ms=100))
+
+        self.assertEqual(len(execute.payloads), 2)
+        self.assertEqual(queue.result(run_id), {"status": "done"})
+        self.assertEqual(queue.client.xlen(queue.dead), 0)
+
+    def test_dead_letter_at_max_attempts(self) -> None:
+        queue = _queue(visibility_timeout_s=0.05, max_attempts=2)
+        execute = _Executor(_fail)
+        run_id = queue.submit({})
+        worker = QueueWorker(queue, execute, consumer="a")
+        self.assertTrue(worker.poll(block_ms=100))
+        time.sleep(0.1)
+        self.assertTrue(worker.poll(block_ms=100))
+
+        result = queue.result(run_id)
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["attempts"], 2)
+        dead = queue.client.xrange(queue.dead)
+        self.assertEqual(len(dead), 1)
+        self.assertEqual(dead[0][1]["run_id"], run_id)
+        self.assertEqual(queue.client.xpending_range(queue.stream, queue.group, "-", "+", 10), [])
+        time.sleep(0.1)
+        self.assertFalse(worker.poll(block_ms=50))
+        self.assertEqual(len(execute.payloads), 2)
+
+    def test_heartbeat_keeps_slow_run_from_being_reclaimed(self) -> None:
+        queue = _queue(visibility_timeout_s=0.2)
+
+        def slow(_: int) -> Dict[str, Any]:
+            time.sleep(0.8)
+            return {"status": "done"}
+
+        execute = _Executor(slow)
+        run_id = queue.submit({})
+        owner = threading.Thread(target=QueueWorker(queue, execute, consumer="a").poll, kwargs={"block_ms": 100})
+        owner.start()
+        thief = QueueWorker(queue, execute, consumer="b")
+        stolen = 0
+        deadline = time.monotonic() + 0.7
+        while time.monotonic() < deadline:
+            stolen += int(thief.poll(block_ms=50))
+        owner.join()
+
+        self.assertEqual(stolen, 0)
+        self.assertEqual(len(execute.payloads), 1)
+        self.assertEqual(queue.result(run_id), {"status": "done"})
+
+    def test_cancel_before_start(self) -> None:
+        queue = _queue()
+        execute = _Executor(_done)
+        run_id = queue.submit({})
+        queue.request_cancel(run_id)
+
+        self.assertTrue(QueueWorker(queue, execute, consumer="a").poll(block_ms=100))
+
+        self.assertEqual(execute.payloads, [])
+        self.assertEqual(queue.result(run_id), {"status": "cancelled", "run_id": run_id, "stopped_at": "queued"})
+        self.assertEqual(queue.client.xpending_range(queue.stream, queue.group, "-", "+", 10), [])
+
+
+@unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi is not installed")
+class RunResultEndpointTest(unittest.TestCase):
+    def test_unknown_pending_and_finished_runs(self) -> None:
+        from fastapi.testclient import TestClient
+
+        from team.api import server
+
+        queue = _queue()
+        repo_root = server._repo_root()
+        previous = server._RUN_QUEUES.get(repo_root, None)
+        server._RUN_QUEUES[repo_root] = queue
+        try:
+            client = TestClient(server.app)
+            self.assertEqual(client.get("/runs/never-enqueued").status_code, 404)
+            run_id = queue.submit({})
+            self.assertEqual(client.get(f"/runs/{run_id}").status_code, 202)
+            QueueWorker(queue, _Executor(_done), consumer="a").poll(block_ms=100)
+            response = client.get(f"/runs/{run_id}")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {"status": "done"})
+        finally:
+            if previous is None:
+                server._RUN_QUEUES.pop(repo_root, None)
+            else:
+                server._RUN_QUEUES[repo_root] = previous
+
+
+if __name__ == "__main__":
+    unittest.main()
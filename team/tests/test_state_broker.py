@@ -0,0 +1,35 @@
+"""State broker writes: strict schema validation of the stored artifact shape."""
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from team.engine.schema_validation import SchemaRegistry
+from team.engine.state_broker import StateBroker
+
+SCHEMA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "schemas"))
+
+
+class StrictWriteTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.broker = StateBroker(self.tmp.name, schema_registry=SchemaRegistry(SCHEMA_DIR))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_version_is_assigned_not_required(self) -> None:
+        report = {"pass": True, "violations": [], "failure_signals": {}}
+        self.assertEqual(self.broker.write("SLOReport", report, "ops"), 1)
+        self.assertEqual(self.broker.write("SLOReport", {**report, "version": "stale"}, "ops"), 2)
+        self.assertEqual(self.broker.read_full("SLOReport")["version"], 2)
+
+    def test_invalid_payload_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.broker.write("SLOReport", {"pass": "yes", "violations": [], "failure_signals": {}}, "ops")
+        self.assertEqual(self.broker.latest_version("SLOReport"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
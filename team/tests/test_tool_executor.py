@@ -0,0 +1,278 @@
+"""ToolExecutor policies (cache, rate limits, retries, dedup, timing) against local fake tools and a fake clock."""
+from __future__ import annotations
+
+import random
+import threading
+import time
+import unittest
+from typing import Any, Dict, List
+
+from team.engine.deadline import CancelToken, RunCancelled
+from team.engine.tool_executor import RateLimited, ToolExecutor
+
+
+class FakeClock:
+    """Injected as both `clock` and `sleep`: sleeping advances time instantly and is recorded."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeTool:
+    """Counts calls; fails with the queued exceptions first, then echoes its arguments."""
+
+    def __init__(self, *failures: BaseException) -> None:
+        self.failures = list(failures)
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs: Any) -> Dict[str, Any]:
+        with self._lock:
+            self.calls.append(kwargs)
+            failure = self.failures.pop(0) if self.failures else None
+        if failure is not None:
+            raise failure
+        return dict(kwargs)
+
+
+def _executor(contract: Dict[str, Any], clock: FakeClock, **tools: Any) -> ToolExecutor:
+    return ToolExecutor(contract, tools, clock=clock, sleep=clock.sleep, rng=random.Random(7))
+
+
+class CachingTest(unittest.TestCase):
+    def test_ttl_expiry(self) -> None:
+        clock = FakeClock()
+        tool = FakeTool()
+        executor = _executor({"caching": {"ttl_s": 10}}, clock, search=tool)
+
+        self.assertEqual(executor.call("search", {"q": "a"}), {"q": "a"})
+        self.assertEqual(executor.call("search", {"q": "a"}), {"q": "a"})
+        self.assertEqual(len(tool.calls), 1)
+        clock.now += 10.5
+        executor.call("search", {"q": "a"})
+        self.assertEqual(len(tool.calls), 2)
+
+    def test_lru_eviction(self) -> None:
+        clock = FakeClock()
+        tool = FakeTool()
+        executor = _executor({"caching": {"search": {"ttl_s": 60, "max_entries": 2}}}, clock, search=tool)
+
+        for query in ("a", "b", "a", "c"):
+            executor.call("search", {"q": query})
+        self.assertEqual([call["q"] for call in tool.calls], ["a", "b", "c"])
+        executor.call("search", {"q": "a"})
+        executor.call("search", {"q": "b"})
+        self.assertEqual([call["q"] for call in tool.calls], ["a", "b", "c", "b"])
+
+    def test_key_fields_and_idempotency_key(self) -> None:
+        clock = FakeClock()
+        tool = FakeTool()
+        contract = {"caching": {"ttl_s": 60}, "idempotency": {"key_fields": ["q"]}}
+        executor = _executor(contract, clock, search=tool)
+
+        executor.call("search", {"q": "a", "page": 1})
+        executor.call("search", {"q": "a", "page": 2})
+        executor.call("search", {"q": "b"}, idempotency_key="k1")
+        executor.call("search", {"q": "c"}, idempotency_key="k1")
+        self.assertEqual(tool.calls, [{"q": "a", "page": 1}, {"q": "b"}])
+
+
+class RateLimitTest(unittest.TestCase):
+    def test_bucket_waits_for_tokens(self) -> None:
+        clock = FakeClock()
+        events: List[Dict[str, Any]] = []
+        executor = _executor({"rate_limits": {"rate_per_s": 2, "burst": 2}}, clock, fetch=FakeTool())
+        executor.observer = events.append
+
+        for idx in range(4):
+            executor.call("fetch", {"i": idx})
+        self.assertEqual(clock.sleeps, [0.5, 0.5])
+        self.assertEqual([event["wait_ms"] for event in events], [0.0, 0.0, 500.0, 500.0])
+
+    def test_rate_limited_past_max_wait(self) -> None:
+        clock = FakeClock()
+        tool = FakeTool()
+        events: List[Dict[str, Any]] = []
+        contract = {"rate_limits": {"rate_per_s": 1, "burst": 1, "max_wait_s": 0.5}}
+        executor = _executor(contract, clock, fetch=tool)
+        executor.observer = events.append
+
+        executor.call("fetch", {"i": 1})
+        with self.assertRaises(RateLimited):
+            executor.call("fetch", {"i": 2})
+        self.assertEqual(len(tool.calls), 1)
+        self.assertEqual(events[-1]["outcome"], "rate_limited")
+        clock.now += 1.0
+        executor.call("fetch", {"i": 3})
+        self.assertEqual(len(tool.calls), 2)
+
+
+class RetryTest(unittest.TestCase):
+    def test_retries_with_bounded_jittered_backoff(self) -> None:
+        clock = FakeClock()
+        tool = FakeTool(ConnectionError("down"), ConnectionError("down"))
+        events: List[Dict[str, Any]] = []
+        contract = {"retries": {"max_attempts": 3, "base_delay_s": 0.1, "max_delay_s": 0.15}}
+        executor = _executor(contract, clock, fetch=tool)
+        executor.observer = events.append
+
+        self.assertEqual(executor.call("fetch", {"i": 1}), {"i": 1})
+        self.assertEqual(len(tool.calls), 3)
+        self.assertEqual(len(clock.sleeps), 2)
+        self.assertTrue(0.0 <= clock.sleeps[0] <= 0.1)
+        self.assertTrue(0.0 <= clock.sleeps[1] <= 0.15)
+        self.assertEqual(events[-1]["attempts"], 3)
+        self.assertEqual(events[-1]["outcome"], "executed")
+
+    def test_waits_with_cancel_token_use_injected_clock(self) -> None:
+        clock = FakeClock()
+        tool = FakeTool(ConnectionError("down"))
+        contract = {"retries": {"max_attempts": 2, "base_delay_s": 2.0, "max_delay_s": 2.0}}
+        executor = _executor(contract, clock, fetch=tool)
+        executor._rng.uniform = lambda low, high: high  # type: ignore[method-assign]
+
+        started = time.monotonic()
+        self.assertEqual(executor.call("fetch", {"i": 1}, cancel=CancelToken()), {"i": 1})
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertAlmostEqual(sum(clock.sleeps), 2.0)
+        self.assertTrue(all(step <= 0.25 for step in clock.sleeps))
+
+    def test_gives_up_after_max_attempts(self) -> None:
+        clock = FakeClock()
+        tool = FakeTool(*(ConnectionError("down") for _ in range(5)))
+        executor = _executor({"retries": {"fetch": {"max_attempts": 2}}}, clock, fetch=tool)
+
+        with self.assertRaises(ConnectionError):
+            executor.call("fetch")
+        self.assertEqual(len(tool.calls), 2)
+        self.assertEqual(executor.stats()["fetch"]["errors"], 1)
+
+    def test_retry_on_filters_exception_types(self) -> None:
+        clock = FakeClock()
+        contract = {"retries": {"max_attempts": 3, "retry_on": ["ConnectionError"]}}
+        not_retried = FakeTool(ValueError("bad input"))
+        retried = FakeTool(ConnectionError("down"))
+        executor = _executor(contract, clock, strict=not_retried, flaky=retried)
+
+        with self.assertRaises(ValueError):
+            executor.call("strict")
+        self.assertEqual(len(not_retried.calls), 1)
+        self.assertEqual(executor.call("flaky"), {})
+        self.assertEqual(len(retried.calls), 2)
+
+
+class DedupTest(unittest.TestCase):
+    def test_concurrent_identical_calls_execute_once(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+        calls: List[int] = []
+
+        def slow(q: str) -> str:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return q.upper()
+
+        executor = ToolExecutor({}, {"slow": slow})
+        results: List[str] = []
+        threads = [threading.Thread(target=lambda: results.append(executor.call("slow", {"q": "a"}))) for _ in range(5)]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, ["A"] * 5)
+        self.assertEqual(len(calls), 1)
+        stats = executor.stats()["slow"]
+        self.assertEqual((stats["executed"], stats["deduped"]), (1, 4))
+
+    def test_follower_reexecutes_when_leader_run_is_cancelled(self) -> None:
+        failed_once = threading.Event()
+        calls: List[int] = []
+
+        def flaky() -> str:
+            calls.append(1)
+            if len(calls) == 1:
+                failed_once.set()
+                raise ConnectionError("down")
+            return "ok"
+
+        # The leader backs off for 30s after its first failure; its run is cancelled during that wait.
+        contract = {"retries": {"max_attempts": 2, "base_delay_s": 30, "max_delay_s": 30}}
+        executor = ToolExecutor(contract, {"flaky": flaky}, rng=random.Random(0))
+        executor._rng.uniform = lambda low, high: high  # type: ignore[method-assign]
+        token = CancelToken()
+        outcomes: Dict[str, Any] = {}
+
+        def leader() -> None:
+            try:
+                outcomes["leader"] = executor.call("flaky", cancel=token)
+            except RunCancelled as exc:
+                outcomes["leader"] = exc
+
+        def follower() -> None:
+            outcomes["follower"] = executor.call("flaky")
+
+        leader_thread = threading.Thread(target=leader)
+        leader_thread.start()
+        self.assertTrue(failed_once.wait(5))
+        follower_thread = threading.Thread(target=follower)
+        follower_thread.start()
+        time.sleep(0.1)
+        token.cancel()
+        leader_thread.join(5)
+        follower_thread.join(5)
+
+        self.assertIsInstance(outcomes["leader"], RunCancelled)
+        self.assertEqual(outcomes["follower"], "ok")
+        self.assertEqual(len(calls), 2)
+
+
+class ObserverTest(unittest.TestCase):
+    def test_timing_events_and_stats(self) -> None:
+        clock = FakeClock()
+        events: List[Dict[str, Any]] = []
+        contract = {"version": 3, "tools": ["search", "fail"], "caching": {"search": {"ttl_s": 60}}}
+        executor = _executor(contract, clock, search=FakeTool(), fail=FakeTool(KeyError("x")))
+        executor.observer = events.append
+
+        executor.call("search", {"q": "a"})
+        executor.call("search", {"q": "a"})
+        with self.assertRaises(KeyError):
+            executor.call("fail")
+
+        self.assertEqual([(event["tool"], event["outcome"]) for event in events], [
+            ("search", "executed"),
+            ("search", "cached"),
+            ("fail", "error"),
+        ])
+        self.assertEqual(events[2]["error"], "KeyError")
+        for event in events:
+            self.assertGreaterEqual(event["elapsed_ms"], 0.0)
+            self.assertIn("wait_ms", event)
+        stats = executor.stats()
+        self.assertEqual((stats["search"]["calls"], stats["search"]["cached"]), (2, 1))
+        self.assertEqual(stats["fail"]["errors"], 1)
+
+    def test_undeclared_or_unregistered_tools_are_rejected(self) -> None:
+        executor = ToolExecutor({"tools": ["search"]}, {"search": FakeTool(), "other": FakeTool()})
+        with self.assertRaises(ValueError):
+            executor.call("other")
+        with self.assertRaises(ValueError):
+            ToolExecutor({}).call("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()